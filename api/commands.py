@@ -4,9 +4,12 @@ import secrets
 
 import click
 from flask import current_app
+from sqlalchemy.dialects.postgresql import insert
 from werkzeug.exceptions import NotFound
 
 from core.embedding.cached_embedding import CacheEmbedding
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
+from core.index.keyword_table_index.keyword_table_store import JsonKeywordTableStore, dump_keyword_table
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from extensions.ext_database import db
@@ -14,7 +17,7 @@ from libs.helper import email as email_validate
 from libs.password import hash_password, password_pattern, valid_password
 from libs.rsa import generate_key_pair
 from models.account import Tenant
-from models.dataset import Dataset
+from models.dataset import Dataset, DatasetKeyword, DatasetKeywordTable, DocumentSegment
 from models.model import Account
 from models.provider import Provider, ProviderModel
 
@@ -120,6 +123,8 @@ def reset_encrypt_key_pair():
     db.session.query(ProviderModel).delete()
     db.session.commit()
 
+    ProviderConfigurationsCache(tenant_id=tenant.id).delete()
+
     click.echo(click.style('Congratulations! '
                            'the asymmetric key pair of workspace {} has been reset.'.format(tenant.id), fg='green'))
 
@@ -192,8 +197,79 @@ def create_qdrant_indexes():
     click.echo(click.style('Congratulations! Create {} dataset indexes.'.format(create_count), fg='green'))
 
 
+@click.command('convert-keyword-tables', help='Convert the keyword tables of economy datasets to inverted index.')
+def convert_keyword_tables():
+    """
+    Convert the JSON keyword table of datasets to one dataset_keywords row per keyword and index node.
+    """
+    click.echo(click.style('Start convert keyword tables.', fg='green'))
+    convert_count = 0
+    failed_ids = []
+
+    while True:
+        dataset_keyword_tables = db.session.query(DatasetKeywordTable) \
+            .filter(DatasetKeywordTable.storage_type == 'json', DatasetKeywordTable.id.notin_(failed_ids)) \
+            .limit(50).all()
+        if not dataset_keyword_tables:
+            break
+
+        for dataset_keyword_table in dataset_keyword_tables:
+            try:
+                click.echo('Convert dataset keyword table: {}'.format(dataset_keyword_table.dataset_id))
+                keyword_table = JsonKeywordTableStore(dataset_keyword_table).get_all()
+                node_keywords = {}
+                for keyword, node_ids in keyword_table.items():
+                    for node_id in node_ids:
+                        node_keywords.setdefault(node_id, []).append(keyword)
+
+                # term frequencies and node lengths for keyword scoring
+                rows = []
+                node_lengths = {}
+                segments = db.session.query(DocumentSegment.index_node_id, DocumentSegment.content) \
+                    .filter(DocumentSegment.dataset_id == dataset_keyword_table.dataset_id) \
+                    .yield_per(1000)
+                for node_id, content in segments:
+                    if node_id not in node_keywords:
+                        continue
+                    node_lengths[node_id] = len(content)
+                    lower_content = content.lower()
+                    for keyword in node_keywords[node_id]:
+                        rows.append({
+                            'dataset_id': dataset_keyword_table.dataset_id,
+                            'keyword': keyword,
+                            'index_node_id': node_id,
+                            'term_frequency': max(lower_content.count(keyword.lower()), 1),
+                            'node_length': len(content)
+                        })
+
+                # insert postings and switch the storage type in one transaction
+                for i in range(0, len(rows), 1000):
+                    db.session.execute(
+                        insert(DatasetKeyword).values(rows[i:i + 1000]).on_conflict_do_nothing(
+                            constraint='dataset_keyword_unique_idx'
+                        )
+                    )
+
+                dataset_keyword_table.keyword_table = dump_keyword_table(dataset_keyword_table.dataset_id, {})
+                dataset_keyword_table.storage_type = 'inverted_index'
+                dataset_keyword_table.node_count = len(node_lengths)
+                dataset_keyword_table.total_node_length = sum(node_lengths.values())
+                db.session.commit()
+                convert_count += 1
+            except Exception as e:
+                db.session.rollback()
+                failed_ids.append(dataset_keyword_table.id)
+                click.echo(
+                    click.style('Convert dataset keyword table error: {} {}'.format(e.__class__.__name__, str(e)),
+                                fg='red'))
+                continue
+
+    click.echo(click.style('Congratulations! Convert {} dataset keyword tables.'.format(convert_count), fg='green'))
+
+
 def register_commands(app):
     app.cli.add_command(reset_password)
     app.cli.add_command(reset_email)
     app.cli.add_command(reset_encrypt_key_pair)
     app.cli.add_command(create_qdrant_indexes)
+    app.cli.add_command(convert_keyword_tables)
@@ -56,6 +56,16 @@ DEFAULTS = {
     'BILLING_ENABLED': 'False',
     'CAN_REPLACE_LOGO': 'False',
     'ETL_TYPE': 'dify',
+    'KEYWORD_STORE': 'inverted_index',
+    'INDEXING_EMBEDDING_WORKERS': 2,
+    'DATASET_RETRIEVAL_CACHE_TTL': 600,
+    'DATASET_QUERY_FLUSH_INTERVAL': 10,
+    'DATASET_QUERY_FLUSH_THRESHOLD': 1000,
+    'TOOL_CALL_MAX_WORKERS': 5,
+    'TOOL_CALL_TIMEOUT': 120,
+    'DIRECT_OUTPUT_CHUNK_MODE': 'word',
+    'DIRECT_OUTPUT_PACING_BUDGET': 0,
+    'PROVIDER_CONFIGURATIONS_CACHE_TTL': 60,
 }
 
 
@@ -237,6 +247,33 @@ class Config:
         # Dataset Configurations.
         self.CLEAN_DAY_SETTING = get_env('CLEAN_DAY_SETTING')
 
+        # keyword table storage of economy datasets, support json, inverted_index, default is inverted_index
+        self.KEYWORD_STORE = get_env('KEYWORD_STORE')
+
+        # number of chunks embedded ahead in parallel while indexing documents, 0 to embed sequentially
+        self.INDEXING_EMBEDDING_WORKERS = int(get_env('INDEXING_EMBEDDING_WORKERS'))
+
+        # seconds the results of a dataset retrieval query are cached, 0 to disable
+        self.DATASET_RETRIEVAL_CACHE_TTL = int(get_env('DATASET_RETRIEVAL_CACHE_TTL'))
+
+        # seconds dataset query logs and segment hit counts are buffered before they are written in bulk
+        self.DATASET_QUERY_FLUSH_INTERVAL = int(get_env('DATASET_QUERY_FLUSH_INTERVAL'))
+        # buffered query logs or hit segments at which the writer flushes the buffer itself,
+        # the flush task may wait behind long indexing tasks in the dataset queue
+        self.DATASET_QUERY_FLUSH_THRESHOLD = int(get_env('DATASET_QUERY_FLUSH_THRESHOLD'))
+
+        # number of tool calls of one agent turn invoked concurrently, 1 to invoke them sequentially
+        self.TOOL_CALL_MAX_WORKERS = int(get_env('TOOL_CALL_MAX_WORKERS'))
+
+        # seconds an agent waits for the tool calls of a turn, concurrent or sequential
+        self.TOOL_CALL_TIMEOUT = int(get_env('TOOL_CALL_TIMEOUT'))
+
+        # chunks annotation replies and moderation responses are streamed in: word, sentence or character
+        self.DIRECT_OUTPUT_CHUNK_MODE = get_env('DIRECT_OUTPUT_CHUNK_MODE')
+
+        # seconds a streamed annotation reply or moderation response is spread over, 0 to stream it at once
+        self.DIRECT_OUTPUT_PACING_BUDGET = float(get_env('DIRECT_OUTPUT_PACING_BUDGET'))
+
         # File upload Configurations.
         self.UPLOAD_FILE_SIZE_LIMIT = int(get_env('UPLOAD_FILE_SIZE_LIMIT'))
         self.UPLOAD_FILE_BATCH_LIMIT = int(get_env('UPLOAD_FILE_BATCH_LIMIT'))
@@ -280,6 +317,9 @@ class Config:
         self.HOSTED_MODERATION_ENABLED = get_bool_env('HOSTED_MODERATION_ENABLED')
         self.HOSTED_MODERATION_PROVIDERS = get_env('HOSTED_MODERATION_PROVIDERS')
 
+        # seconds the assembled provider configurations of a workspace are cached in process, 0 to disable
+        self.PROVIDER_CONFIGURATIONS_CACHE_TTL = int(get_env('PROVIDER_CONFIGURATIONS_CACHE_TTL'))
+
         self.ETL_TYPE = get_env('ETL_TYPE')
         self.UNSTRUCTURED_API_URL = get_env('UNSTRUCTURED_API_URL')
         self.BILLING_ENABLED = get_bool_env('BILLING_ENABLED')
@@ -2,6 +2,8 @@ import time
 from collections.abc import Generator
 from typing import Optional, Union, cast
 
+from flask import current_app
+
 from core.application_queue_manager import ApplicationQueueManager, PublishFrom
 from core.entities.application_entities import (
     ApplicationGenerateEntity,
@@ -22,6 +24,7 @@ from core.model_runtime.entities.message_entities import AssistantPromptMessage,
 from core.model_runtime.entities.model_entities import ModelPropertyKey
 from core.model_runtime.errors.invoke import InvokeBadRequestError
 from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+from core.model_runtime.utils.helper import split_text_into_chunks
 from core.prompt.prompt_transform import PromptTransform
 from models.model import App, Message, MessageAnnotation
 
@@ -186,18 +189,22 @@ class AppRunner:
         :return:
         """
         if stream:
-            index = 0
-            for token in text:
+            # the text is complete, it is replayed in chunks and only paced when a budget is configured
+            chunks = split_text_into_chunks(text, mode=current_app.config['DIRECT_OUTPUT_CHUNK_MODE'])
+            pacing_budget = current_app.config['DIRECT_OUTPUT_PACING_BUDGET']
+            chunk_delay = pacing_budget / len(chunks) if chunks and pacing_budget > 0 else 0
+            for index, chunk in enumerate(chunks):
                 queue_manager.publish_chunk_message(LLMResultChunk(
                     model=app_orchestration_config.model_config.model,
-                    prompt_messages=prompt_messages,
+                    # only the first chunk carries the prompt messages to the task pipeline
+                    prompt_messages=prompt_messages if index == 0 else [],
                     delta=LLMResultChunkDelta(
                         index=index,
-                        message=AssistantPromptMessage(content=token)
+                        message=AssistantPromptMessage(content=chunk)
                     )
                 ), PublishFrom.APPLICATION_MANAGER)
-                index += 1
-                time.sleep(0.01)
+                if chunk_delay:
+                    time.sleep(chunk_delay)
 
         queue_manager.publish_message_end(
             llm_result=LLMResult(
@@ -258,7 +265,7 @@ class AppRunner:
         """
         model = None
         prompt_messages = []
-        text = ''
+        text_chunks = []
         usage = None
         for result in invoke_result:
             if not agent:
@@ -266,7 +273,7 @@ class AppRunner:
             else:
                 queue_manager.publish_agent_chunk_message(result, PublishFrom.APPLICATION_MANAGER)
 
-            text += result.delta.message.content
+            text_chunks.append(result.delta.message.content)
 
             if not model:
                 model = result.model
@@ -283,7 +290,7 @@ class AppRunner:
         llm_result = LLMResult(
             model=model,
             prompt_messages=prompt_messages,
-            message=AssistantPromptMessage(content=text),
+            message=AssistantPromptMessage(content=''.join(text_chunks)),
             usage=usage
         )
 
@@ -2,8 +2,12 @@ import logging
 from typing import Optional
 
 from core.app_runner.app_runner import AppRunner
+from core.app_runner.stage_scheduler import StageScheduler
 from core.application_queue_manager import ApplicationQueueManager, PublishFrom
-from core.callback_handler.index_tool_callback_handler import DatasetIndexToolCallbackHandler
+from core.callback_handler.index_tool_callback_handler import (
+    DatasetIndexToolCallbackHandler,
+    DeferredDatasetIndexToolCallbackHandler,
+)
 from core.entities.application_entities import ApplicationGenerateEntity, DatasetEntity, InvokeFrom, ModelConfigEntity
 from core.features.dataset_retrieval import DatasetRetrievalFeature
 from core.memory.token_buffer_memory import TokenBufferMemory
@@ -83,10 +87,15 @@ class BasicApplicationRunner(AppRunner):
             memory=memory
         )
 
+        # stages before the model invoke, with their timings
+        scheduler = StageScheduler(max_workers=2)
+
         # moderation
         try:
             # process sensitive_word_avoidance
-            _, inputs, query = self.moderation_for_inputs(
+            _, inputs, query = scheduler.run(
+                'input_moderation',
+                self.moderation_for_inputs,
                 app_id=app_record.id,
                 tenant_id=application_generate_entity.tenant_id,
                 app_orchestration_config_entity=app_orchestration_config,
@@ -94,6 +103,7 @@ class BasicApplicationRunner(AppRunner):
                 query=query,
             )
         except ModerationException as e:
+            scheduler.shutdown()
             self.direct_output(
                 queue_manager=queue_manager,
                 app_orchestration_config=app_orchestration_config,
@@ -103,58 +113,111 @@ class BasicApplicationRunner(AppRunner):
             )
             return
 
-        if query:
-            # annotation reply
-            annotation_reply = self.query_app_annotations_to_reply(
-                app_record=app_record,
-                message=message,
-                query=query,
-                user_id=application_generate_entity.user_id,
-                invoke_from=application_generate_entity.invoke_from
-            )
+        # annotation reply, external data tools and dataset retrieval are independent, the external data
+        # and the dataset context are fetched while the annotations are queried
+        external_data_tools = app_orchestration_config.external_data_variables
+        dataset_config = app_orchestration_config.dataset
+        dataset_hit_callback = None
+        retrieve_after_external_data = False
+        try:
+            # fill in variable inputs from external data tools if exists
+            if external_data_tools:
+                scheduler.submit(
+                    'external_data',
+                    self.fill_in_inputs_from_external_data_tools,
+                    tenant_id=app_record.tenant_id,
+                    app_id=app_record.id,
+                    external_data_tools=external_data_tools,
+                    inputs=dict(inputs),
+                    query=query
+                )
 
-            if annotation_reply:
-                queue_manager.publish_annotation_reply(
-                    message_annotation_id=annotation_reply.id,
-                    pub_from=PublishFrom.APPLICATION_MANAGER
+            # get context from datasets
+            if dataset_config and dataset_config.dataset_ids:
+                # the retrieval results are discarded on an annotation reply, so are their callbacks
+                dataset_hit_callback = DeferredDatasetIndexToolCallbackHandler(
+                    queue_manager,
+                    app_record.id,
+                    message.id,
+                    application_generate_entity.user_id,
+                    application_generate_entity.invoke_from
                 )
-                self.direct_output(
-                    queue_manager=queue_manager,
-                    app_orchestration_config=app_orchestration_config,
-                    prompt_messages=prompt_messages,
-                    text=annotation_reply.content,
-                    stream=application_generate_entity.stream
+
+                # the dataset query may be a variable filled in by an external data tool
+                retrieve_after_external_data = (
+                    app_record.mode == AppMode.COMPLETION.value
+                    and dataset_config.retrieve_config.query_variable in [
+                        external_data_tool.variable for external_data_tool in external_data_tools
+                    ]
                 )
-                return
 
-        # fill in variable inputs from external data tools if exists
-        external_data_tools = app_orchestration_config.external_data_variables
-        if external_data_tools:
-            inputs = self.fill_in_inputs_from_external_data_tools(
-                tenant_id=app_record.tenant_id,
-                app_id=app_record.id,
-                external_data_tools=external_data_tools,
-                inputs=inputs,
-                query=query
-            )
+                if not retrieve_after_external_data:
+                    scheduler.submit(
+                        'dataset_retrieval',
+                        self.retrieve_dataset_context,
+                        **self._get_retrieve_dataset_context_args(
+                            application_generate_entity=application_generate_entity,
+                            app_mode=app_record.mode,
+                            inputs=inputs,
+                            query=query,
+                            hit_callback=dataset_hit_callback
+                        )
+                    )
 
-        # get context from datasets
-        context = None
-        if app_orchestration_config.dataset and app_orchestration_config.dataset.dataset_ids:
-            context = self.retrieve_dataset_context(
-                tenant_id=app_record.tenant_id,
-                app_record=app_record,
-                queue_manager=queue_manager,
-                model_config=app_orchestration_config.model_config,
-                show_retrieve_source=app_orchestration_config.show_retrieve_source,
-                dataset_config=app_orchestration_config.dataset,
-                message=message,
-                inputs=inputs,
-                query=query,
-                user_id=application_generate_entity.user_id,
-                invoke_from=application_generate_entity.invoke_from,
-                memory=memory
-            )
+            if query:
+                # annotation reply
+                annotation_reply = scheduler.run(
+                    'annotation_reply',
+                    self.query_app_annotations_to_reply,
+                    app_record=app_record,
+                    message=message,
+                    query=query,
+                    user_id=application_generate_entity.user_id,
+                    invoke_from=application_generate_entity.invoke_from
+                )
+
+                if annotation_reply:
+                    # the dataset context is not used, stop the retrieval before it searches
+                    if dataset_hit_callback:
+                        dataset_hit_callback.cancel()
+                        scheduler.cancel('dataset_retrieval')
+
+                    queue_manager.publish_annotation_reply(
+                        message_annotation_id=annotation_reply.id,
+                        pub_from=PublishFrom.APPLICATION_MANAGER
+                    )
+                    self.direct_output(
+                        queue_manager=queue_manager,
+                        app_orchestration_config=app_orchestration_config,
+                        prompt_messages=prompt_messages,
+                        text=annotation_reply.content,
+                        stream=application_generate_entity.stream
+                    )
+                    return
+
+            if external_data_tools:
+                inputs = scheduler.result('external_data')
+
+            context = None
+            if dataset_hit_callback:
+                if retrieve_after_external_data:
+                    context = scheduler.run(
+                        'dataset_retrieval',
+                        self.retrieve_dataset_context,
+                        **self._get_retrieve_dataset_context_args(
+                            application_generate_entity=application_generate_entity,
+                            app_mode=app_record.mode,
+                            inputs=inputs,
+                            query=query,
+                            hit_callback=dataset_hit_callback
+                        )
+                    )
+                else:
+                    context = scheduler.result('dataset_retrieval')
+
+                dataset_hit_callback.commit()
+        finally:
+            scheduler.shutdown()
 
         # reorganize all inputs and template to prompt messages
         # Include: prompt template, inputs, query(optional), files(optional)
@@ -208,42 +271,46 @@ class BasicApplicationRunner(AppRunner):
         )
 
     def retrieve_dataset_context(self, tenant_id: str,
-                                 app_record: App,
-                                 queue_manager: ApplicationQueueManager,
+                                 app_mode: str,
                                  model_config: ModelConfigEntity,
                                  dataset_config: DatasetEntity,
                                  show_retrieve_source: bool,
-                                 message: Message,
                                  inputs: dict,
                                  query: str,
-                                 user_id: str,
                                  invoke_from: InvokeFrom,
-                                 memory: Optional[TokenBufferMemory] = None) -> Optional[str]:
+                                 hit_callback: DatasetIndexToolCallbackHandler,
+                                 conversation_id: Optional[str] = None) -> Optional[str]:
         """
         Retrieve dataset context
         :param tenant_id: tenant id
-        :param app_record: app record
-        :param queue_manager: queue manager
+        :param app_mode: app mode
         :param model_config: model config
         :param dataset_config: dataset config
         :param show_retrieve_source: show retrieve source
-        :param message: message
         :param inputs: inputs
         :param query: query
-        :param user_id: user id
         :param invoke_from: invoke from
-        :param memory: memory
+        :param hit_callback: hit callback
+        :param conversation_id: conversation id, the history is read by the router agent
         :return:
         """
-        hit_callback = DatasetIndexToolCallbackHandler(
-            queue_manager,
-            app_record.id,
-            message.id,
-            user_id,
-            invoke_from
-        )
+        if hit_callback.cancelled:
+            return None
 
-        if (app_record.mode == AppMode.COMPLETION.value and dataset_config
+        # the conversation is read in the session of the thread running the stage, not passed from the caller
+        memory = None
+        if conversation_id:
+            conversation = db.session.query(Conversation).filter(Conversation.id == conversation_id).first()
+            if conversation:
+                memory = TokenBufferMemory(
+                    conversation=conversation,
+                    model_instance=ModelInstance(
+                        provider_model_bundle=model_config.provider_model_bundle,
+                        model=model_config.model
+                    )
+                )
+
+        if (app_mode == AppMode.COMPLETION.value and dataset_config
                 and dataset_config.retrieve_config.query_variable):
             query = inputs.get(dataset_config.retrieve_config.query_variable, "")
 
@@ -258,4 +325,25 @@ class BasicApplicationRunner(AppRunner):
             hit_callback=hit_callback,
             memory=memory
         )
-    
\ No newline at end of file
+
+    def _get_retrieve_dataset_context_args(self, application_generate_entity: ApplicationGenerateEntity,
+                                           app_mode: str,
+                                           inputs: dict,
+                                           query: str,
+                                           hit_callback: DatasetIndexToolCallbackHandler) -> dict:
+        """
+        Get the arguments of retrieve_dataset_context, they are safe to pass to a stage thread.
+        """
+        app_orchestration_config = application_generate_entity.app_orchestration_config_entity
+        return {
+            'tenant_id': application_generate_entity.tenant_id,
+            'app_mode': app_mode,
+            'model_config': app_orchestration_config.model_config,
+            'dataset_config': app_orchestration_config.dataset,
+            'show_retrieve_source': app_orchestration_config.show_retrieve_source,
+            'inputs': inputs,
+            'query': query,
+            'invoke_from': application_generate_entity.invoke_from,
+            'hit_callback': hit_callback,
+            'conversation_id': application_generate_entity.conversation_id
+        }
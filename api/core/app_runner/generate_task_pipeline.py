@@ -81,6 +81,8 @@ class GenerateTaskPipeline:
                 usage=LLMUsage.empty_usage()
             )
         )
+        # streamed answer texts not yet joined into the llm result
+        self._answer_chunks = []
         self._start_at = time.perf_counter()
         self._output_moderation_handler = self._init_output_moderation()
 
@@ -198,6 +200,9 @@ class GenerateTaskPipeline:
         for message in self._queue_manager.listen():
             event = message.event
 
+            if not isinstance(event, QueueMessageEvent | QueueAgentMessageEvent):
+                self._join_answer_chunks()
+
             if isinstance(event, QueueErrorEvent):
                 data = self._error_to_stream_response_data(self._handle_error(event))
                 yield self._yield_response(data)
@@ -355,17 +360,17 @@ class GenerateTaskPipeline:
                     yield self._yield_response(response)
 
             elif isinstance(event, QueueMessageEvent | QueueAgentMessageEvent):
-                chunk = event.chunk
-                delta_text = chunk.delta.message.content
+                delta_text = event.text
                 if delta_text is None:
                     continue
 
-                if not self._task_state.llm_result.prompt_messages:
-                    self._task_state.llm_result.prompt_messages = chunk.prompt_messages
+                if event.prompt_messages and not self._task_state.llm_result.prompt_messages:
+                    self._task_state.llm_result.prompt_messages = event.prompt_messages
 
                 if self._output_moderation_handler:
                     if self._output_moderation_handler.should_direct_output():
                         # stop subscribe new token when output moderation should direct output
+                        self._answer_chunks = []
                         self._task_state.llm_result.message.content = self._output_moderation_handler.get_final_output()
                         self._queue_manager.publish_chunk_message(LLMResultChunk(
                             model=self._task_state.llm_result.model,
@@ -383,7 +388,7 @@ class GenerateTaskPipeline:
                     else:
                         self._output_moderation_handler.append_new_token(delta_text)
 
-                self._task_state.llm_result.message.content += delta_text
+                self._answer_chunks.append(delta_text)
                 response = self._handle_chunk(delta_text, agent=isinstance(event, QueueAgentMessageEvent))
                 yield self._yield_response(response)
             elif isinstance(event, QueueMessageReplaceEvent):
@@ -404,6 +409,15 @@ class GenerateTaskPipeline:
             else:
                 continue
 
+    def _join_answer_chunks(self) -> None:
+        """
+        Append the streamed answer texts to the llm result, they are joined once instead of on every chunk.
+        :return:
+        """
+        if self._answer_chunks:
+            self._task_state.llm_result.message.content += ''.join(self._answer_chunks)
+            self._answer_chunks = []
+
     def _save_message(self, llm_result: LLMResult) -> None:
         """
         Save message.
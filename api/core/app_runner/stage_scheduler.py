@@ -0,0 +1,89 @@
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from flask import Flask, current_app
+
+logger = logging.getLogger(__name__)
+
+
+class StageScheduler:
+    """
+    Run independent stages before the model invoke concurrently.
+
+    Stages run in pool threads with their own app context, results are collected in the
+    calling thread with `result`, which also raises the exception of a failed stage.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._flask_app = current_app._get_current_object()
+        self._executor = ThreadPoolExecutor(max_workers=max(max_workers, 1))
+        self._futures: dict[str, Future] = {}
+        self.timings: dict[str, float] = {}
+
+    def submit(self, name: str, func: Callable[..., Any], **kwargs: Any) -> None:
+        """
+        Start a stage.
+
+        :param name: stage name
+        :param func: stage function
+        :param kwargs: stage function arguments, they must not be ORM objects of the calling thread's session
+        :return:
+        """
+        self._futures[name] = self._executor.submit(self._run_stage, self._flask_app, name, func, kwargs)
+
+    def result(self, name: str) -> Any:
+        """
+        Wait for the result of a stage.
+
+        :param name: stage name
+        :return:
+        """
+        return self._futures[name].result()
+
+    def cancel(self, name: str) -> None:
+        """
+        Cancel a stage whose result is not needed, it is dropped if it did not start yet.
+        A running stage is not interrupted, it should check a flag of its own to stop early.
+
+        :param name: stage name
+        :return:
+        """
+        future = self._futures.get(name)
+        if future:
+            future.cancel()
+
+    def run(self, name: str, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Run a stage in the calling thread, its timing is recorded with the others.
+
+        :param name: stage name
+        :param func: stage function
+        :param kwargs: stage function arguments
+        :return:
+        """
+        start_at = time.perf_counter()
+        try:
+            return func(**kwargs)
+        finally:
+            self.timings[name] = time.perf_counter() - start_at
+
+    def shutdown(self) -> None:
+        """
+        Stop the scheduler, stages which did not start are cancelled and running stages are not waited for.
+
+        :return:
+        """
+        for future in self._futures.values():
+            future.cancel()
+
+        self._executor.shutdown(wait=False)
+        if self.timings:
+            logger.debug("Pre-LLM stage timings: %s",
+                         ', '.join(f'{name} {timing:0.4f}s' for name, timing in self.timings.items()))
+
+    def _run_stage(self, flask_app: Flask, name: str, func: Callable[..., Any], kwargs: dict) -> Any:
+        with flask_app.app_context():
+            return self.run(name, func, **kwargs)
@@ -4,6 +4,7 @@ from collections.abc import Generator
 from enum import Enum
 from typing import Any
 
+from flask import current_app
 from sqlalchemy.orm import DeclarativeMeta
 
 from core.entities.application_entities import InvokeFrom
@@ -33,6 +34,9 @@ class PublishFrom(Enum):
 
 
 class ApplicationQueueManager:
+    # minimum interval in seconds between two reads of the stop flag from redis
+    STOP_CHECK_INTERVAL = 0.5
+
     def __init__(self, task_id: str,
                  user_id: str,
                  invoke_from: InvokeFrom,
@@ -49,6 +53,16 @@ class ApplicationQueueManager:
         self._app_mode = app_mode
         self._message_id = str(message_id)
 
+        # the stop flag is read from redis at most once per STOP_CHECK_INTERVAL instead of once per chunk
+        self._stopped = False
+        self._last_stop_check_time = 0.0
+
+        # walking every event for sqlalchemy models is a development safeguard only
+        self._check_events = current_app.debug
+
+        # the prompt messages are sent with the first chunk only
+        self._prompt_messages_published = False
+
         user_prefix = 'account' if self._invoke_from in [InvokeFrom.EXPLORE, InvokeFrom.DEBUGGER] else 'end-user'
         redis_client.setex(ApplicationQueueManager._generate_task_belong_cache_key(self._task_id), 1800, f"{user_prefix}-{self._user_id}")
 
@@ -106,7 +120,7 @@ class ApplicationQueueManager:
         :return:
         """
         self.publish(QueueMessageEvent(
-            chunk=chunk
+            **self._compact_chunk(chunk)
         ), pub_from)
 
     def publish_agent_chunk_message(self, chunk: LLMResultChunk, pub_from: PublishFrom) -> None:
@@ -118,9 +132,28 @@ class ApplicationQueueManager:
         :return:
         """
         self.publish(QueueAgentMessageEvent(
-            chunk=chunk
+            **self._compact_chunk(chunk)
         ), pub_from)
 
+    def _compact_chunk(self, chunk: LLMResultChunk) -> dict:
+        """
+        Get the fields of a chunk message event, the prompt messages are only included once per task
+
+        :param chunk: chunk
+        :return:
+        """
+        prompt_messages = None
+        if not self._prompt_messages_published and chunk.prompt_messages:
+            prompt_messages = chunk.prompt_messages
+            self._prompt_messages_published = True
+
+        return {
+            'text': chunk.delta.message.content,
+            'index': chunk.delta.index,
+            'usage': chunk.delta.usage,
+            'prompt_messages': prompt_messages
+        }
+
     def publish_message_replace(self, text: str, pub_from: PublishFrom) -> None:
         """
         Publish message replace
@@ -199,7 +232,8 @@ class ApplicationQueueManager:
         :param pub_from:
         :return:
         """
-        self._check_for_sqlalchemy_models(event.dict())
+        if self._check_events:
+            self._check_for_sqlalchemy_models(event.dict())
 
         message = QueueMessage(
             task_id=self._task_id,
@@ -239,9 +273,19 @@ class ApplicationQueueManager:
         Check if task is stopped
         :return:
         """
+        if self._stopped:
+            return True
+
+        now = time.monotonic()
+        if now - self._last_stop_check_time < self.STOP_CHECK_INTERVAL:
+            return False
+
+        self._last_stop_check_time = now
+
         stopped_cache_key = ApplicationQueueManager._generate_stopped_cache_key(self._task_id)
         result = redis_client.get(stopped_cache_key)
         if result is not None:
+            self._stopped = True
             return True
 
         return False
@@ -3,8 +3,8 @@ from langchain.schema import Document
 
 from core.application_queue_manager import ApplicationQueueManager, PublishFrom
 from core.entities.application_entities import InvokeFrom
+from core.helper.dataset_query_buffer import DatasetQueryBuffer
 from extensions.ext_database import db
-from models.dataset import DatasetQuery, DocumentSegment
 from models.model import DatasetRetrieverResource
 
 
@@ -22,41 +22,30 @@ class DatasetIndexToolCallbackHandler:
         self._user_id = user_id
         self._invoke_from = invoke_from
 
+    @property
+    def cancelled(self) -> bool:
+        """Whether the retrieval result is discarded, retriever tools stop before searching."""
+        return False
+
     def on_query(self, query: str, dataset_id: str) -> None:
         """
         Handle query.
         """
-        dataset_query = DatasetQuery(
-            dataset_id=dataset_id,
-            content=query,
-            source='app',
-            source_app_id=self._app_id,
-            created_by_role=('account'
-                             if self._invoke_from in [InvokeFrom.EXPLORE, InvokeFrom.DEBUGGER] else 'end_user'),
-            created_by=self._user_id
-        )
-
-        db.session.add(dataset_query)
-        db.session.commit()
+        DatasetQueryBuffer.add_queries([{
+            'dataset_id': dataset_id,
+            'content': query,
+            'source': 'app',
+            'source_app_id': self._app_id,
+            'created_by_role': ('account'
+                                if self._invoke_from in [InvokeFrom.EXPLORE, InvokeFrom.DEBUGGER] else 'end_user'),
+            'created_by': self._user_id
+        }])
 
     def on_tool_end(self, documents: list[Document]) -> None:
         """Handle tool end."""
-        for document in documents:
-            query = db.session.query(DocumentSegment).filter(
-                DocumentSegment.index_node_id == document.metadata['doc_id']
-            )
-
-            # if 'dataset_id' in document.metadata:
-            if 'dataset_id' in document.metadata:
-                query = query.filter(DocumentSegment.dataset_id == document.metadata['dataset_id'])
-
-            # add hit count to document segment
-            query.update(
-                {DocumentSegment.hit_count: DocumentSegment.hit_count + 1},
-                synchronize_session=False
-            )
-
-            db.session.commit()
+        # add hit count to document segment
+        DatasetQueryBuffer.add_hits([(document.metadata.get('dataset_id'), document.metadata['doc_id'])
+                                     for document in documents])
 
     def return_retriever_resource_info(self, resource: list):
         """Handle return_retriever_resource_info."""
@@ -81,6 +70,48 @@ class DatasetIndexToolCallbackHandler:
                     created_by=self._user_id
                 )
                 db.session.add(dataset_retriever_resource)
-                db.session.commit()
+
+            # the resources are read back with the message, write them in one commit
+            db.session.commit()
 
         self._queue_manager.publish_retriever_resources(resource, PublishFrom.APPLICATION_MANAGER)
+
+
+class DeferredDatasetIndexToolCallbackHandler(DatasetIndexToolCallbackHandler):
+    """
+    Callback handler for dataset retrievals whose result may be discarded,
+    the callbacks are recorded and only handled on `commit`.
+    """
+
+    def __init__(self, queue_manager: ApplicationQueueManager,
+                 app_id: str,
+                 message_id: str,
+                 user_id: str,
+                 invoke_from: InvokeFrom) -> None:
+        super().__init__(queue_manager, app_id, message_id, user_id, invoke_from)
+        self._deferred_callbacks = []
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def on_query(self, query: str, dataset_id: str) -> None:
+        self._deferred_callbacks.append((super().on_query, (query, dataset_id)))
+
+    def on_tool_end(self, documents: list[Document]) -> None:
+        self._deferred_callbacks.append((super().on_tool_end, (documents,)))
+
+    def return_retriever_resource_info(self, resource: list):
+        self._deferred_callbacks.append((super().return_retriever_resource_info, (resource,)))
+
+    def commit(self) -> None:
+        """Handle the recorded callbacks."""
+        deferred_callbacks, self._deferred_callbacks = self._deferred_callbacks, []
+        for callback, args in deferred_callbacks:
+            callback(*args)
+
+    def cancel(self) -> None:
+        """Discard the recorded callbacks, a running retrieval stops at its next search."""
+        self._cancelled = True
+        self._deferred_callbacks = []
@@ -2,11 +2,11 @@ import json
 import logging
 from typing import Any, Optional
 
-import requests
 from flask import current_app
 from langchain.document_loaders.base import BaseLoader
 from langchain.schema import Document
 
+from core.helper.http_client import get_requests_session
 from extensions.ext_database import db
 from models.dataset import Document as DocumentModel
 from models.source import DataSourceBinding
@@ -97,7 +97,7 @@ class NotionLoader(BaseLoader):
             self, database_id: str, query_dict: dict[str, Any] = {}
     ) -> list[Document]:
         """Get all the pages from a Notion database."""
-        res = requests.post(
+        res = get_requests_session().post(
             DATABASE_URL_TMPL.format(database_id=database_id),
             headers={
                 "Authorization": "Bearer " + self._notion_access_token,
@@ -156,7 +156,7 @@ class NotionLoader(BaseLoader):
             block_url = BLOCK_CHILD_URL_TMPL.format(block_id=cur_block_id)
             query_dict: dict[str, Any] = {}
 
-            res = requests.request(
+            res = get_requests_session().request(
                 "GET",
                 block_url,
                 headers={
@@ -218,7 +218,7 @@ class NotionLoader(BaseLoader):
             block_url = BLOCK_CHILD_URL_TMPL.format(block_id=cur_block_id)
             query_dict: dict[str, Any] = {}
 
-            res = requests.request(
+            res = get_requests_session().request(
                 "GET",
                 block_url,
                 headers={
@@ -282,7 +282,7 @@ class NotionLoader(BaseLoader):
             block_url = BLOCK_CHILD_URL_TMPL.format(block_id=cur_block_id)
             query_dict: dict[str, Any] = {}
 
-            res = requests.request(
+            res = get_requests_session().request(
                 "GET",
                 block_url,
                 headers={
@@ -348,7 +348,7 @@ class NotionLoader(BaseLoader):
 
         query_dict: dict[str, Any] = {}
 
-        res = requests.request(
+        res = get_requests_session().request(
             "GET",
             retrieve_page_url,
             headers={
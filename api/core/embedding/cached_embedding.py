@@ -4,6 +4,7 @@ from typing import Optional, cast
 
 import numpy as np
 from langchain.embeddings.base import Embeddings
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 
 from core.model_manager import ModelInstance
@@ -12,6 +13,7 @@ from core.model_runtime.model_providers.__base.text_embedding_model import TextE
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
 from libs import helper
+from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
@@ -20,38 +22,110 @@ class CacheEmbedding(Embeddings):
     def __init__(self, model_instance: ModelInstance, user: Optional[str] = None) -> None:
         self._model_instance = model_instance
         self._user = user
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embed search docs in batches of 10."""
-        text_embeddings = []
-        try:
-            model_type_instance = cast(TextEmbeddingModel, self._model_instance.model_type_instance)
-            model_schema = model_type_instance.get_model_schema(self._model_instance.model, self._model_instance.credentials)
-            max_chunks = model_schema.model_properties[ModelPropertyKey.MAX_CHUNKS] \
-                if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties else 1
-            for i in range(0, len(texts), max_chunks):
-                batch_texts = texts[i:i + max_chunks]
-
-                embedding_result = self._model_instance.invoke_text_embedding(
-                    texts=batch_texts,
-                    user=self._user
-                )
-
-                for vector in embedding_result.embeddings:
-                    try:
+        # use doc embedding cache or store if not exists
+        text_embeddings: list[Optional[list[float]]] = [None for _ in range(len(texts))]
+        text_hashes = [helper.generate_text_hash(text) for text in texts]
+
+        cached_embeddings = self._get_cached_embeddings(set(text_hashes))
+        embedding_queue_indices = []
+        for i, text_hash in enumerate(text_hashes):
+            if text_hash in cached_embeddings:
+                text_embeddings[i] = cached_embeddings[text_hash]
+            else:
+                embedding_queue_indices.append(i)
+
+        self.cache_hits += len(texts) - len(embedding_queue_indices)
+        self.cache_misses += len(embedding_queue_indices)
+
+        if embedding_queue_indices:
+            try:
+                model_type_instance = cast(TextEmbeddingModel, self._model_instance.model_type_instance)
+                model_schema = model_type_instance.get_model_schema(self._model_instance.model,
+                                                                    self._model_instance.credentials)
+                max_chunks = model_schema.model_properties[ModelPropertyKey.MAX_CHUNKS] \
+                    if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties else 1
+
+                # identical texts in one call are only embedded once
+                queue_hashes = list(dict.fromkeys(text_hashes[i] for i in embedding_queue_indices))
+                queue_texts = {text_hashes[i]: texts[i] for i in embedding_queue_indices}
+                new_embeddings = {}
+                for i in range(0, len(queue_hashes), max_chunks):
+                    batch_hashes = queue_hashes[i:i + max_chunks]
+
+                    embedding_result = self._model_instance.invoke_text_embedding(
+                        texts=[queue_texts[text_hash] for text_hash in batch_hashes],
+                        user=self._user
+                    )
+
+                    for text_hash, vector in zip(batch_hashes, embedding_result.embeddings):
                         normalized_embedding = (vector / np.linalg.norm(vector)).tolist()
-                        text_embeddings.append(normalized_embedding)
-                    except IntegrityError:
-                        db.session.rollback()
-                    except Exception as e:
-                        logging.exception('Failed to add embedding to redis')
+                        new_embeddings[text_hash] = normalized_embedding
 
-        except Exception as ex:
-            logger.error('Failed to embed documents: ', ex)
-            raise ex
+                for i in embedding_queue_indices:
+                    text_embeddings[i] = new_embeddings[text_hashes[i]]
+            except Exception as ex:
+                logger.error('Failed to embed documents: ', ex)
+                raise ex
+
+            self._save_embeddings(new_embeddings)
+
+        logger.debug(f'Embedding cache of {self._model_instance.provider}/{self._model_instance.model}: '
+                     f'{self.cache_hits} hits, {self.cache_misses} misses')
 
         return text_embeddings
 
+    def _get_cached_embeddings(self, text_hashes: set[str]) -> dict[str, list[float]]:
+        """Bulk load cached document embeddings by text hash."""
+        if not text_hashes:
+            return {}
+
+        try:
+            embeddings = db.session.query(Embedding).filter(
+                Embedding.provider_name == self._model_instance.provider,
+                Embedding.model_name == self._model_instance.model,
+                Embedding.hash.in_(text_hashes)
+            ).all()
+        except Exception:
+            db.session.rollback()
+            logging.exception('Failed to load embeddings from db')
+            return {}
+
+        return {embedding.hash: embedding.get_embedding() for embedding in embeddings}
+
+    def _save_embeddings(self, embeddings: dict[str, list[float]]) -> None:
+        """Store new document embeddings in one batched insert, skipping rows written concurrently."""
+        if not embeddings:
+            return
+
+        rows = []
+        for text_hash, vector in embeddings.items():
+            embedding_cache = Embedding(
+                provider_name=self._model_instance.provider,
+                model_name=self._model_instance.model,
+                hash=text_hash
+            )
+            embedding_cache.set_embedding(vector)
+            rows.append({
+                'provider_name': embedding_cache.provider_name,
+                'model_name': embedding_cache.model_name,
+                'hash': embedding_cache.hash,
+                'embedding': embedding_cache.embedding
+            })
+
+        try:
+            db.session.execute(
+                insert(Embedding).values(rows).on_conflict_do_nothing(constraint='embedding_hash_idx')
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logging.exception('Failed to add embeddings to db')
+
     def embed_query(self, text: str) -> list[float]:
         """Embed query text."""
         # use doc embedding cache or store if not exists
@@ -11,6 +11,7 @@ from core.entities.model_entities import ModelStatus, ModelWithProviderEntity, S
 from core.entities.provider_entities import CustomConfiguration, SystemConfiguration, SystemConfigurationStatus
 from core.helper import encrypter
 from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
 from core.model_runtime.entities.model_entities import FetchFrom, ModelType
 from core.model_runtime.entities.provider_entities import (
     ConfigurateMethod,
@@ -223,6 +224,7 @@ class ProviderConfiguration(BaseModel):
         )
 
         provider_model_credentials_cache.delete()
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
 
         self.switch_preferred_provider_type(ProviderType.CUSTOM)
 
@@ -253,6 +255,7 @@ class ProviderConfiguration(BaseModel):
             )
 
             provider_model_credentials_cache.delete()
+            ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
 
     def get_custom_model_credentials(self, model_type: ModelType, model: str, obfuscated: bool = False) \
             -> Optional[dict]:
@@ -372,6 +375,7 @@ class ProviderConfiguration(BaseModel):
         )
 
         provider_model_credentials_cache.delete()
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
 
     def delete_custom_model_credentials(self, model_type: ModelType, model: str) -> None:
         """
@@ -401,6 +405,7 @@ class ProviderConfiguration(BaseModel):
             )
 
             provider_model_credentials_cache.delete()
+            ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
 
     def get_provider_instance(self) -> ModelProvider:
         """
@@ -453,6 +458,8 @@ class ProviderConfiguration(BaseModel):
 
         db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
     def _extract_secret_variables(self, credential_form_schemas: list[CredentialFormSchema]) -> list[str]:
         """
         Extract secret input form variables.
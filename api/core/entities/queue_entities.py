@@ -1,9 +1,10 @@
 from enum import Enum
-from typing import Any
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
-from core.model_runtime.entities.llm_entities import LLMResult, LLMResultChunk
+from core.model_runtime.entities.llm_entities import LLMResult, LLMUsage
+from core.model_runtime.entities.message_entities import PromptMessage
 
 
 class QueueEvent(Enum):
@@ -32,17 +33,23 @@ class AppQueueEvent(BaseModel):
 
 class QueueMessageEvent(AppQueueEvent):
     """
-    QueueMessageEvent entity
+    QueueMessageEvent entity, the prompt messages are only sent with the first chunk of the task
     """
     event = QueueEvent.MESSAGE
-    chunk: LLMResultChunk
+    text: Optional[str] = None
+    index: int = 0
+    usage: Optional[LLMUsage] = None
+    prompt_messages: Optional[list[PromptMessage]] = None
 
 class QueueAgentMessageEvent(AppQueueEvent):
     """
-    QueueMessageEvent entity
+    QueueMessageEvent entity, the prompt messages are only sent with the first chunk of the task
     """
     event = QueueEvent.AGENT_MESSAGE
-    chunk: LLMResultChunk
+    text: Optional[str] = None
+    index: int = 0
+    usage: Optional[LLMUsage] = None
+    prompt_messages: Optional[list[PromptMessage]] = None
 
     
 class QueueMessageReplaceEvent(AppQueueEvent):
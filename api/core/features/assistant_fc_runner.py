@@ -1,8 +1,13 @@
 import json
 import logging
+import time
 from collections.abc import Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Any, Union
 
+from flask import Flask, current_app
+
 from core.application_queue_manager import PublishFrom
 from core.features.assistant_base_runner import BaseAssistantApplicationRunner
 from core.model_runtime.entities.llm_entities import LLMResult, LLMResultChunk, LLMResultChunkDelta, LLMUsage
@@ -242,9 +247,10 @@ class AssistantFunctionCallApplicationRunner(BaseAssistantApplicationRunner):
                     content=response,
                 ))
             
-            # call tools
+            # call tools, independent calls of the turn are invoked concurrently
             tool_responses = []
-            for tool_call_id, tool_call_name, tool_call_args in tool_calls:
+            tool_invoke_futures, tool_invoke_deadline = self._submit_tool_invocations(tool_instances, tool_calls)
+            for tool_call_index, (tool_call_id, tool_call_name, tool_call_args) in enumerate(tool_calls):
                 tool_instance = tool_instances.get(tool_call_name)
                 if not tool_instance:
                     tool_response = {
@@ -257,9 +263,8 @@ class AssistantFunctionCallApplicationRunner(BaseAssistantApplicationRunner):
                     # invoke tool
                     error_response = None
                     try:
-                        tool_invoke_message = tool_instance.invoke(
-                            user_id=self.user_id, 
-                            tool_parameters=tool_call_args, 
+                        tool_invoke_message = self._wait_tool_invocation(
+                            tool_invoke_futures[tool_call_index], tool_call_name, tool_invoke_deadline
                         )
                         # transform tool invoke message to get LLM friendly message
                         tool_invoke_message = self.transform_tool_invoke_messages(tool_invoke_message)
@@ -349,6 +354,65 @@ class AssistantFunctionCallApplicationRunner(BaseAssistantApplicationRunner):
             system_fingerprint=''
         ), PublishFrom.APPLICATION_MANAGER)
 
+    def _submit_tool_invocations(self, tool_instances: dict, tool_calls: list[tuple[str, str, dict[str, Any]]]) \
+            -> tuple[dict[int, Future], float]:
+        """
+        Submit the tool calls of a turn to a bounded thread pool.
+
+        Only the tool invocations run in the pool, message files and agent thoughts
+        are still created by the caller in order.
+
+        :return: future of each submitted tool call index and the deadline of the turn's tool calls
+        """
+        indexes = [index for index, tool_call in enumerate(tool_calls) if tool_call[1] in tool_instances]
+        deadline = time.monotonic() + current_app.config['TOOL_CALL_TIMEOUT']
+        if not indexes:
+            return {}, deadline
+
+        max_workers = min(max(current_app.config['TOOL_CALL_MAX_WORKERS'], 1), len(indexes))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        try:
+            for index in indexes:
+                _, tool_call_name, tool_call_args = tool_calls[index]
+                futures[index] = executor.submit(
+                    self._invoke_tool,
+                    current_app._get_current_object(),
+                    tool_instances[tool_call_name],
+                    tool_call_args
+                )
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        # submitted calls still run, the turn does not wait for timed out tools
+        executor.shutdown(wait=False)
+
+        return futures, deadline
+
+    def _invoke_tool(self, flask_app: Flask, tool_instance: Any, tool_call_args: dict[str, Any]) -> list:
+        """
+        Invoke tool in a pool thread.
+        """
+        with flask_app.app_context():
+            return tool_instance.invoke(
+                user_id=self.user_id,
+                tool_parameters=tool_call_args,
+            )
+
+    def _wait_tool_invocation(self, future: Future, tool_call_name: str, deadline: float) -> list:
+        """
+        Wait for the result of a submitted tool call until the deadline of the turn's tool calls.
+
+        :raises ToolInvokeError: if the tool does not finish before the deadline
+        """
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            raise ToolInvokeError(f"tool {tool_call_name} did not respond in "
+                                  f"{current_app.config['TOOL_CALL_TIMEOUT']} seconds")
+
     def check_tool_calls(self, llm_result_chunk: LLMResultChunk) -> bool:
         """
         Check if there is any tool call in llm result chunk
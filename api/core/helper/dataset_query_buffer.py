@@ -0,0 +1,179 @@
+import datetime
+import json
+import logging
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from flask import Flask, current_app
+
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.dataset import DatasetQuery, DocumentSegment
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetQueryBuffer:
+    """
+    Write-behind buffer of dataset query logs and segment hit counts.
+
+    Retrievals only append to Redis, the buffered writes are applied in bulk by
+    `flush_dataset_query_buffer_task` which is scheduled once per DATASET_QUERY_FLUSH_INTERVAL.
+    A buffer that reaches DATASET_QUERY_FLUSH_THRESHOLD entries is flushed by the writer.
+    """
+    _query_log_key = 'dataset_query_buffer:query_logs'
+    _hit_count_key = 'dataset_query_buffer:hit_counts'
+    _flush_scheduled_key = 'dataset_query_buffer:flush_scheduled'
+    _flush_lock_key = 'dataset_query_buffer:flush_lock'
+    _flush_batch_size = 1000
+
+    @classmethod
+    def add_queries(cls, queries: list[dict]) -> None:
+        """
+        Buffer dataset query logs.
+
+        :param queries: DatasetQuery fields of each query
+        :return:
+        """
+        if not queries:
+            return
+
+        created_at = datetime.datetime.utcnow().isoformat()
+        buffer_size = redis_client.rpush(cls._query_log_key, *[json.dumps({**query, 'created_at': created_at})
+                                                               for query in queries])
+        cls._schedule_flush(buffer_size)
+
+    @classmethod
+    def add_hits(cls, hits: list[tuple[Optional[str], str]]) -> None:
+        """
+        Buffer segment hit count increments.
+
+        :param hits: dataset id (None if unknown) and index node id of each hit segment
+        :return:
+        """
+        if not hits:
+            return
+
+        pipeline = redis_client.pipeline(transaction=False)
+        for dataset_id, index_node_id in hits:
+            pipeline.hincrby(cls._hit_count_key, f'{dataset_id or ""}:{index_node_id}', 1)
+        pipeline.hlen(cls._hit_count_key)
+        buffer_size = pipeline.execute()[-1]
+        cls._schedule_flush(buffer_size)
+
+    @classmethod
+    def flush(cls) -> None:
+        """
+        Apply the buffered query logs and hit counts to the database.
+
+        :return:
+        """
+        # writes after this point schedule the next flush
+        redis_client.delete(cls._flush_scheduled_key)
+
+        hit_counts = cls._take_hit_counts()
+        if hit_counts:
+            try:
+                cls._apply_hit_counts(hit_counts)
+            except Exception:
+                db.session.rollback()
+                logger.exception('Failed to flush segment hit counts, they are buffered again')
+                cls._restore_hit_counts(hit_counts)
+
+        while True:
+            query_logs = cls._take_query_logs()
+            if not query_logs:
+                break
+
+            try:
+                db.session.bulk_insert_mappings(
+                    DatasetQuery,
+                    [cls._load_query_log(query_log) for query_log in query_logs]
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception('Failed to flush dataset query logs, they are buffered again')
+                redis_client.lpush(cls._query_log_key, *reversed(query_logs))
+                cls._schedule_flush()
+                break
+
+    @classmethod
+    def _schedule_flush(cls, buffer_size: int = 0) -> None:
+        from tasks.flush_dataset_query_buffer_task import flush_dataset_query_buffer_task
+
+        # one writer flushes a full buffer in a thread with its own session, the others keep appending
+        if buffer_size >= current_app.config['DATASET_QUERY_FLUSH_THRESHOLD'] \
+                and redis_client.set(cls._flush_lock_key, 1, nx=True, ex=60):
+            threading.Thread(target=cls._flush_in_thread, args=(current_app._get_current_object(),)).start()
+            return
+
+        interval = current_app.config['DATASET_QUERY_FLUSH_INTERVAL']
+        # the flag expires in case the scheduled task is lost
+        if redis_client.set(cls._flush_scheduled_key, 1, nx=True, ex=max(interval * 10, 60)):
+            flush_dataset_query_buffer_task.apply_async(countdown=interval)
+
+    @classmethod
+    def _flush_in_thread(cls, flask_app: Flask) -> None:
+        with flask_app.app_context():
+            try:
+                cls.flush()
+            except Exception:
+                logger.exception('Failed to flush dataset query buffer')
+            finally:
+                redis_client.delete(cls._flush_lock_key)
+
+    @classmethod
+    def _take_hit_counts(cls) -> dict[str, int]:
+        pipeline = redis_client.pipeline()
+        pipeline.hgetall(cls._hit_count_key)
+        pipeline.delete(cls._hit_count_key)
+        hit_counts, _ = pipeline.execute()
+        return {field.decode('utf-8'): int(count) for field, count in hit_counts.items()}
+
+    @classmethod
+    def _restore_hit_counts(cls, hit_counts: dict[str, int]) -> None:
+        pipeline = redis_client.pipeline(transaction=False)
+        for field, count in hit_counts.items():
+            pipeline.hincrby(cls._hit_count_key, field, count)
+        pipeline.execute()
+        cls._schedule_flush()
+
+    @classmethod
+    def _apply_hit_counts(cls, hit_counts: dict[str, int]) -> None:
+        # one update per dataset and increment, most segments are hit the same number of times
+        grouped_index_node_ids = defaultdict(list)
+        for field, count in hit_counts.items():
+            dataset_id, index_node_id = field.split(':', 1)
+            grouped_index_node_ids[(dataset_id, count)].append(index_node_id)
+
+        for (dataset_id, count), index_node_ids in grouped_index_node_ids.items():
+            for i in range(0, len(index_node_ids), cls._flush_batch_size):
+                query = db.session.query(DocumentSegment).filter(
+                    DocumentSegment.index_node_id.in_(index_node_ids[i:i + cls._flush_batch_size])
+                )
+
+                if dataset_id:
+                    query = query.filter(DocumentSegment.dataset_id == dataset_id)
+
+                query.update(
+                    {DocumentSegment.hit_count: DocumentSegment.hit_count + count},
+                    synchronize_session=False
+                )
+
+        db.session.commit()
+
+    @classmethod
+    def _take_query_logs(cls) -> list[bytes]:
+        pipeline = redis_client.pipeline()
+        pipeline.lrange(cls._query_log_key, 0, cls._flush_batch_size - 1)
+        pipeline.ltrim(cls._query_log_key, cls._flush_batch_size, -1)
+        query_logs, _ = pipeline.execute()
+        return query_logs
+
+    @staticmethod
+    def _load_query_log(query_log: bytes) -> dict:
+        query = json.loads(query_log)
+        query['created_at'] = datetime.datetime.fromisoformat(query['created_at'])
+        return query
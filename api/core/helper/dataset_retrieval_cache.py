@@ -0,0 +1,98 @@
+import hashlib
+import json
+from json import JSONDecodeError
+from typing import NamedTuple, Optional
+
+from flask import current_app
+from langchain.schema import Document
+
+from extensions.ext_redis import redis_client
+
+
+class CachedRetrieval(NamedTuple):
+    documents: list[Document]
+    result: str
+    resources: Optional[list[dict]]
+
+
+class DatasetRetrievalCache:
+    """
+    Cache of dataset retrieval results by datasets, retrieval config and query.
+
+    Every change of the indexed content of a dataset increments its version, entries are keyed
+    by the versions of their datasets so they are never read again after a change.
+    """
+
+    def __init__(self, dataset_ids: list[str], retrieval_config: dict, query: str):
+        self.dataset_ids = sorted(dataset_ids)
+        self.retrieval_config = retrieval_config
+        self.query = ' '.join(query.split())
+        self.cache_key = None
+
+    def get(self) -> Optional[CachedRetrieval]:
+        """
+        Get cached retrieval result.
+
+        :return:
+        """
+        if current_app.config['DATASET_RETRIEVAL_CACHE_TTL'] <= 0 or not self.dataset_ids:
+            return None
+
+        # the versions are read once, a result computed after this call is stored under them
+        versions = redis_client.mget([self._get_version_cache_key(dataset_id) for dataset_id in self.dataset_ids])
+        key_data = json.dumps({
+            'datasets': [[dataset_id, version.decode('utf-8') if version else '0']
+                         for dataset_id, version in zip(self.dataset_ids, versions)],
+            'retrieval_config': self.retrieval_config,
+            'query': self.query
+        }, sort_keys=True)
+        self.cache_key = f"dataset_retrieval:{hashlib.sha256(key_data.encode('utf-8')).hexdigest()}"
+
+        cached_retrieval = redis_client.get(self.cache_key)
+        if not cached_retrieval:
+            return None
+
+        try:
+            cached_retrieval = json.loads(cached_retrieval.decode('utf-8'))
+        except JSONDecodeError:
+            return None
+
+        return CachedRetrieval(
+            documents=[Document(page_content=document['page_content'], metadata=document['metadata'])
+                       for document in cached_retrieval['documents']],
+            result=cached_retrieval['result'],
+            resources=cached_retrieval['resources']
+        )
+
+    def set(self, documents: list[Document], result: str, resources: Optional[list[dict]]) -> None:
+        """
+        Cache retrieval result, `get` must be called before the retrieval.
+
+        :param documents: retrieved documents
+        :param result: retrieval result passed to the model
+        :param resources: retriever resources
+        :return:
+        """
+        if not self.cache_key:
+            return
+
+        redis_client.setex(self.cache_key, current_app.config['DATASET_RETRIEVAL_CACHE_TTL'], json.dumps({
+            'documents': [{'page_content': document.page_content, 'metadata': document.metadata}
+                          for document in documents],
+            'result': result,
+            'resources': resources
+        }))
+
+    @classmethod
+    def invalidate(cls, dataset_id: str) -> None:
+        """
+        Invalidate cached retrieval results of dataset.
+
+        :param dataset_id: dataset id
+        :return:
+        """
+        redis_client.incr(cls._get_version_cache_key(dataset_id))
+
+    @staticmethod
+    def _get_version_cache_key(dataset_id: str) -> str:
+        return f"dataset_retrieval_version:{dataset_id}"
@@ -0,0 +1,91 @@
+"""
+Shared HTTP clients, connections and TLS sessions are kept alive and reused between requests
+"""
+
+import importlib.util
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# maximum connections of a httpx client, and connections kept alive when idle
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+# maximum connections of a requests session to one host
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '10'))
+
+# http/2 is negotiated when the optional h2 package is installed
+HTTP2_ENABLED = importlib.util.find_spec('h2') is not None
+
+_httpx_clients: dict[tuple, httpx.Client] = {}
+_requests_sessions: dict[tuple, requests.Session] = {}
+_lock = threading.Lock()
+
+
+class _NoCookiePolicy(DefaultCookiePolicy):
+    """
+    The clients are shared by all users, cookies set by responses must not be stored and
+    sent with later requests, cookies passed with a request are still sent.
+    """
+    def set_ok(self, cookie, request):
+        return False
+
+
+def get_httpx_client(proxies: Optional[dict] = None) -> httpx.Client:
+    """
+    Get the shared httpx client of the proxies.
+
+    :param proxies: httpx proxies, None for direct connections
+    :return:
+    """
+    key = tuple(sorted(proxies.items())) if proxies else ()
+    client = _httpx_clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _httpx_clients.get(key)
+        if client is None:
+            client = httpx.Client(
+                proxies=proxies,
+                http2=HTTP2_ENABLED,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+            client.cookies.jar.set_policy(_NoCookiePolicy())
+            _httpx_clients[key] = client
+
+    return client
+
+
+def get_requests_session(proxies: Optional[dict] = None) -> requests.Session:
+    """
+    Get the shared requests session of the proxies.
+
+    :param proxies: requests proxies, None for direct connections
+    :return:
+    """
+    key = tuple(sorted(proxies.items())) if proxies else ()
+    session = _requests_sessions.get(key)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _requests_sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            if proxies:
+                session.proxies.update(proxies)
+            session.cookies.set_policy(_NoCookiePolicy())
+            _requests_sessions[key] = session
+
+    return session
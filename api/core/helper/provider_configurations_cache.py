@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+from flask import current_app
+
+from extensions.ext_redis import redis_client
+
+if TYPE_CHECKING:
+    from core.entities.provider_configuration import ProviderConfigurations
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'provider_configurations_invalidation'
+
+
+class ProviderConfigurationsCache:
+    """
+    Process-local cache of the assembled provider configurations of workspaces.
+
+    Entries expire after PROVIDER_CONFIGURATIONS_CACHE_TTL seconds and are evicted in every process
+    through a Redis pub/sub channel when credentials, preferred provider types or quotas change.
+    """
+    _max_size = 1024
+    _cache: OrderedDict[str, tuple[float, ProviderConfigurations]] = OrderedDict()
+    _generations: dict[str, int] = {}
+    _lock = threading.Lock()
+    _listener: Optional[threading.Thread] = None
+    _listener_ready = threading.Event()
+    _listener_started_at = 0.0
+    _subscribe_timeout = 1
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+
+    def get(self) -> Optional[ProviderConfigurations]:
+        """
+        Get cached provider configurations.
+
+        :return:
+        """
+        ttl = current_app.config['PROVIDER_CONFIGURATIONS_CACHE_TTL']
+        if ttl <= 0:
+            return None
+
+        if not self._ensure_listener():
+            return None
+
+        with self._lock:
+            cached = self._cache.get(self.tenant_id)
+            if not cached:
+                return None
+
+            cached_at, provider_configurations = cached
+            if time.monotonic() - cached_at > ttl:
+                del self._cache[self.tenant_id]
+                return None
+
+            self._cache.move_to_end(self.tenant_id)
+
+        return self._copy(provider_configurations)
+
+    def get_generation(self) -> int:
+        """
+        Get the invalidation generation, pass it to `set` so configurations built before an invalidation are dropped.
+
+        :return:
+        """
+        with self._lock:
+            return self._generations.get(self.tenant_id, 0)
+
+    def set(self, provider_configurations: ProviderConfigurations, generation: int) -> None:
+        """
+        Cache provider configurations.
+
+        :param provider_configurations: provider configurations
+        :param generation: invalidation generation read before the configurations were built
+        :return:
+        """
+        if current_app.config['PROVIDER_CONFIGURATIONS_CACHE_TTL'] <= 0:
+            return
+
+        provider_configurations = self._copy(provider_configurations)
+        with self._lock:
+            if not self._listener_ready.is_set() or self._generations.get(self.tenant_id, 0) != generation:
+                return
+
+            self._cache[self.tenant_id] = (time.monotonic(), provider_configurations)
+            self._cache.move_to_end(self.tenant_id)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def delete(self) -> None:
+        """
+        Delete cached provider configurations in all processes.
+
+        :return:
+        """
+        self._evict(self.tenant_id)
+        try:
+            redis_client.publish(INVALIDATION_CHANNEL, self.tenant_id)
+        except Exception:
+            logger.exception('Failed to publish provider configurations invalidation')
+
+    @classmethod
+    def _evict(cls, tenant_id: str) -> None:
+        with cls._lock:
+            cls._cache.pop(tenant_id, None)
+            cls._generations[tenant_id] = cls._generations.get(tenant_id, 0) + 1
+
+    @classmethod
+    def _ensure_listener(cls) -> bool:
+        """
+        Start the invalidation listener if it is not running, the cache is bypassed until its subscription
+        is confirmed and while it can not be started.
+        """
+        if cls._listener and cls._listener.is_alive():
+            return cls._listener_ready.is_set()
+
+        with cls._lock:
+            if not (cls._listener and cls._listener.is_alive()):
+                # do not restart a failing listener on every lookup
+                if cls._listener and time.monotonic() - cls._listener_started_at < 10:
+                    return False
+
+                # entries cached while no listener was running may have missed invalidations
+                cls._cache.clear()
+                cls._listener_started_at = time.monotonic()
+                cls._listener_ready = threading.Event()
+                cls._listener = threading.Thread(target=cls._listen, args=(cls._listener_ready,), daemon=True)
+                cls._listener.start()
+
+            listener_ready = cls._listener_ready
+
+        # invalidations published before the subscription is confirmed are not received
+        return listener_ready.wait(timeout=cls._subscribe_timeout)
+
+    @classmethod
+    def _listen(cls, listener_ready: threading.Event) -> None:
+        try:
+            pubsub = redis_client.pubsub()
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                if message['type'] == 'subscribe':
+                    # entries cached before the confirmation may have missed invalidations
+                    with cls._lock:
+                        cls._cache.clear()
+
+                    listener_ready.set()
+                    continue
+
+                if message['type'] != 'message':
+                    continue
+
+                tenant_id = message['data']
+                if isinstance(tenant_id, bytes):
+                    tenant_id = tenant_id.decode('utf-8')
+
+                cls._evict(tenant_id)
+        except Exception:
+            logger.exception('Provider configurations invalidation listener stopped')
+        finally:
+            listener_ready.clear()
+
+    @staticmethod
+    def _copy(provider_configurations: ProviderConfigurations) -> ProviderConfigurations:
+        """
+        Copy the mutable parts of the configurations, callers may modify credentials in place.
+        """
+        copied_provider_configurations = type(provider_configurations)(
+            tenant_id=provider_configurations.tenant_id
+        )
+
+        for provider_name, provider_configuration in provider_configurations.configurations.items():
+            copied_provider_configurations[provider_name] = provider_configuration.copy(update={
+                'system_configuration': provider_configuration.system_configuration.copy(deep=True),
+                'custom_configuration': provider_configuration.custom_configuration.copy(deep=True)
+            })
+
+        return copied_provider_configurations
@@ -4,13 +4,7 @@ Proxy requests to avoid SSRF
 
 import os
 
-from httpx import get as _get
-from httpx import head as _head
-from httpx import options as _options
-from httpx import patch as _patch
-from httpx import post as _post
-from httpx import put as _put
-from requests import delete as _delete
+from core.helper.http_client import get_httpx_client, get_requests_session
 
 SSRF_PROXY_HTTP_URL = os.getenv('SSRF_PROXY_HTTP_URL', '')
 SSRF_PROXY_HTTPS_URL = os.getenv('SSRF_PROXY_HTTPS_URL', '')
@@ -26,22 +20,23 @@ httpx_proxies = {
 } if SSRF_PROXY_HTTP_URL and SSRF_PROXY_HTTPS_URL else None
 
 def get(url, *args, **kwargs):
-    return _get(url=url, *args, proxies=httpx_proxies, **kwargs)
+    return get_httpx_client(httpx_proxies).get(url, *args, **kwargs)
 
 def post(url, *args, **kwargs):
-    return _post(url=url, *args, proxies=httpx_proxies, **kwargs)
+    return get_httpx_client(httpx_proxies).post(url, *args, **kwargs)
 
 def put(url, *args, **kwargs):
-    return _put(url=url, *args, proxies=httpx_proxies, **kwargs)
+    return get_httpx_client(httpx_proxies).put(url, *args, **kwargs)
 
 def patch(url, *args, **kwargs):
-    return _patch(url=url, *args, proxies=httpx_proxies, **kwargs)
+    return get_httpx_client(httpx_proxies).patch(url, *args, **kwargs)
 
 def delete(url, *args, **kwargs):
-    return _delete(url=url, *args, proxies=requests_proxies, **kwargs)
+    # httpx does not send a body with delete requests
+    return get_requests_session(requests_proxies).delete(url, *args, **kwargs)
 
 def head(url, *args, **kwargs):
-    return _head(url=url, *args, proxies=httpx_proxies, **kwargs)
+    return get_httpx_client(httpx_proxies).head(url, *args, **kwargs)
 
 def options(url, *args, **kwargs):
-    return _options(url=url, *args, proxies=httpx_proxies, **kwargs)
+    return get_httpx_client(httpx_proxies).options(url, *args, **kwargs)
@@ -1,18 +1,28 @@
-import json
+import heapq
+import math
 from collections import defaultdict
 from typing import Any, Optional
 
+from flask import current_app
 from langchain.schema import BaseRetriever, Document
 from pydantic import BaseModel, Extra, Field
 
 from core.index.base import BaseIndex
 from core.index.keyword_table_index.jieba_keyword_table_handler import JiebaKeywordTableHandler
+from core.index.keyword_table_index.keyword_table_store import (
+    BaseKeywordTableStore,
+    dump_keyword_table,
+    get_keyword_table_store,
+)
 from extensions.ext_database import db
 from models.dataset import Dataset, DatasetKeywordTable, DocumentSegment
 
 
 class KeywordTableConfig(BaseModel):
     max_keywords_per_chunk: int = 10
+    # BM25 term frequency saturation and length normalization
+    bm25_k1: float = 1.5
+    bm25_b: float = 0.75
 
 
 class KeywordTableIndex(BaseIndex):
@@ -22,76 +32,41 @@ class KeywordTableIndex(BaseIndex):
 
     def create(self, texts: list[Document], **kwargs) -> BaseIndex:
         keyword_table_handler = JiebaKeywordTableHandler()
-        keyword_table = {}
+        node_keywords = {}
+        node_lengths = {}
         for text in texts:
             keywords = keyword_table_handler.extract_keywords(text.page_content, self._config.max_keywords_per_chunk)
             self._update_segment_keywords(self.dataset.id, text.metadata['doc_id'], list(keywords))
-            keyword_table = self._add_text_to_keyword_table(keyword_table, text.metadata['doc_id'], list(keywords))
-
-        dataset_keyword_table = DatasetKeywordTable(
-            dataset_id=self.dataset.id,
-            keyword_table=json.dumps({
-                '__type__': 'keyword_table',
-                '__data__': {
-                    "index_id": self.dataset.id,
-                    "summary": None,
-                    "table": {}
-                }
-            }, cls=SetEncoder)
-        )
-        db.session.add(dataset_keyword_table)
-        db.session.commit()
-
-        self._save_dataset_keyword_table(keyword_table)
+            node_keywords[text.metadata['doc_id']] = self._count_keywords(text.page_content, list(keywords))
+            node_lengths[text.metadata['doc_id']] = len(text.page_content)
+
+        keyword_table_store = self._get_keyword_table_store()
+        keyword_table_store.clear()
+        keyword_table_store.add(node_keywords, node_lengths)
 
         return self
 
     def create_with_collection_name(self, texts: list[Document], collection_name: str, **kwargs) -> BaseIndex:
-        keyword_table_handler = JiebaKeywordTableHandler()
-        keyword_table = {}
-        for text in texts:
-            keywords = keyword_table_handler.extract_keywords(text.page_content, self._config.max_keywords_per_chunk)
-            self._update_segment_keywords(self.dataset.id, text.metadata['doc_id'], list(keywords))
-            keyword_table = self._add_text_to_keyword_table(keyword_table, text.metadata['doc_id'], list(keywords))
-
-        dataset_keyword_table = DatasetKeywordTable(
-            dataset_id=self.dataset.id,
-            keyword_table=json.dumps({
-                '__type__': 'keyword_table',
-                '__data__': {
-                    "index_id": self.dataset.id,
-                    "summary": None,
-                    "table": {}
-                }
-            }, cls=SetEncoder)
-        )
-        db.session.add(dataset_keyword_table)
-        db.session.commit()
-
-        self._save_dataset_keyword_table(keyword_table)
-
-        return self
+        return self.create(texts, **kwargs)
 
     def add_texts(self, texts: list[Document], **kwargs):
         keyword_table_handler = JiebaKeywordTableHandler()
 
-        keyword_table = self._get_dataset_keyword_table()
+        node_keywords = {}
+        node_lengths = {}
         for text in texts:
             keywords = keyword_table_handler.extract_keywords(text.page_content, self._config.max_keywords_per_chunk)
             self._update_segment_keywords(self.dataset.id, text.metadata['doc_id'], list(keywords))
-            keyword_table = self._add_text_to_keyword_table(keyword_table, text.metadata['doc_id'], list(keywords))
+            node_keywords[text.metadata['doc_id']] = self._count_keywords(text.page_content, list(keywords))
+            node_lengths[text.metadata['doc_id']] = len(text.page_content)
 
-        self._save_dataset_keyword_table(keyword_table)
+        self._get_keyword_table_store().add(node_keywords, node_lengths)
 
     def text_exists(self, id: str) -> bool:
-        keyword_table = self._get_dataset_keyword_table()
-        return id in set.union(*keyword_table.values())
+        return self._get_keyword_table_store().exists(id)
 
     def delete_by_ids(self, ids: list[str]) -> None:
-        keyword_table = self._get_dataset_keyword_table()
-        keyword_table = self._delete_ids_from_keyword_table(keyword_table, ids)
-
-        self._save_dataset_keyword_table(keyword_table)
+        self._get_keyword_table_store().delete(ids)
 
     def delete_by_document_id(self, document_id: str):
         # get segment ids by document_id
@@ -102,10 +77,7 @@ class KeywordTableIndex(BaseIndex):
 
         ids = [segment.index_node_id for segment in segments]
 
-        keyword_table = self._get_dataset_keyword_table()
-        keyword_table = self._delete_ids_from_keyword_table(keyword_table, ids)
-
-        self._save_dataset_keyword_table(keyword_table)
+        self._get_keyword_table_store().delete(ids)
 
     def delete_by_metadata_field(self, key: str, value: str):
         pass
@@ -117,20 +89,22 @@ class KeywordTableIndex(BaseIndex):
             self, query: str,
             **kwargs: Any
     ) -> list[Document]:
-        keyword_table = self._get_dataset_keyword_table()
-
         search_kwargs = kwargs.get('search_kwargs') if kwargs.get('search_kwargs') else {}
         k = search_kwargs.get('k') if search_kwargs.get('k') else 4
 
-        sorted_chunk_indices = self._retrieve_ids_by_query(keyword_table, query, k)
+        sorted_chunk_indices = self._retrieve_ids_by_query(query, k)
+        if not sorted_chunk_indices:
+            return []
 
-        documents = []
-        for chunk_index in sorted_chunk_indices:
-            segment = db.session.query(DocumentSegment).filter(
-                DocumentSegment.dataset_id == self.dataset.id,
-                DocumentSegment.index_node_id == chunk_index
-            ).first()
+        segments = db.session.query(DocumentSegment).filter(
+            DocumentSegment.dataset_id == self.dataset.id,
+            DocumentSegment.index_node_id.in_([chunk_index for chunk_index, _ in sorted_chunk_indices])
+        ).all()
+        segment_map = {segment.index_node_id: segment for segment in segments}
 
+        documents = []
+        for chunk_index, _ in sorted_chunk_indices:
+            segment = segment_map.get(chunk_index)
             if segment:
                 documents.append(Document(
                     page_content=segment.content,
@@ -147,95 +121,62 @@ class KeywordTableIndex(BaseIndex):
     def delete(self) -> None:
         dataset_keyword_table = self.dataset.dataset_keyword_table
         if dataset_keyword_table:
+            get_keyword_table_store(dataset_keyword_table).clear()
             db.session.delete(dataset_keyword_table)
             db.session.commit()
 
     def delete_by_group_id(self, group_id: str) -> None:
-        dataset_keyword_table = self.dataset.dataset_keyword_table
-        if dataset_keyword_table:
-            db.session.delete(dataset_keyword_table)
-            db.session.commit()
+        self.delete()
 
-    def _save_dataset_keyword_table(self, keyword_table):
-        keyword_table_dict = {
-            '__type__': 'keyword_table',
-            '__data__': {
-                "index_id": self.dataset.id,
-                "summary": None,
-                "table": keyword_table
-            }
-        }
-        self.dataset.dataset_keyword_table.keyword_table = json.dumps(keyword_table_dict, cls=SetEncoder)
-        db.session.commit()
-
-    def _get_dataset_keyword_table(self) -> Optional[dict]:
+    def _get_keyword_table_store(self) -> BaseKeywordTableStore:
         dataset_keyword_table = self.dataset.dataset_keyword_table
-        if dataset_keyword_table:
-            if dataset_keyword_table.keyword_table_dict:
-                return dataset_keyword_table.keyword_table_dict['__data__']['table']
-        else:
+        if not dataset_keyword_table:
             dataset_keyword_table = DatasetKeywordTable(
                 dataset_id=self.dataset.id,
-                keyword_table=json.dumps({
-                    '__type__': 'keyword_table',
-                    '__data__': {
-                        "index_id": self.dataset.id,
-                        "summary": None,
-                        "table": {}
-                    }
-                }, cls=SetEncoder)
+                keyword_table=dump_keyword_table(self.dataset.id, {}),
+                storage_type=current_app.config['KEYWORD_STORE']
             )
             db.session.add(dataset_keyword_table)
             db.session.commit()
 
-        return {}
-
-    def _add_text_to_keyword_table(self, keyword_table: dict, id: str, keywords: list[str]) -> dict:
-        for keyword in keywords:
-            if keyword not in keyword_table:
-                keyword_table[keyword] = set()
-            keyword_table[keyword].add(id)
-        return keyword_table
-
-    def _delete_ids_from_keyword_table(self, keyword_table: dict, ids: list[str]) -> dict:
-        # get set of ids that correspond to node
-        node_idxs_to_delete = set(ids)
+        return get_keyword_table_store(dataset_keyword_table)
 
-        # delete node_idxs from keyword to node idxs mapping
-        keywords_to_delete = set()
-        for keyword, node_idxs in keyword_table.items():
-            if node_idxs_to_delete.intersection(node_idxs):
-                keyword_table[keyword] = node_idxs.difference(
-                    node_idxs_to_delete
-                )
-                if not keyword_table[keyword]:
-                    keywords_to_delete.add(keyword)
-
-        for keyword in keywords_to_delete:
-            del keyword_table[keyword]
-
-        return keyword_table
-
-    def _retrieve_ids_by_query(self, keyword_table: dict, query: str, k: int = 4):
+    def _retrieve_ids_by_query(self, query: str, k: int = 4) -> list[tuple[str, float]]:
         keyword_table_handler = JiebaKeywordTableHandler()
         keywords = keyword_table_handler.extract_keywords(query)
 
-        # go through text chunks in order of most matching keywords
-        chunk_indices_count: dict[str, int] = defaultdict(int)
-        keywords = [keyword for keyword in keywords if keyword in set(keyword_table.keys())]
-        for keyword in keywords:
-            for node_id in keyword_table[keyword]:
-                chunk_indices_count[node_id] += 1
-
-        sorted_chunk_indices = sorted(
-            list(chunk_indices_count.keys()),
-            key=lambda x: chunk_indices_count[x],
-            reverse=True,
-        )
-
-        return sorted_chunk_indices[: k]
-
-    def _update_segment_keywords(self, dataset_id: str, node_id: str, keywords: list[str]):
+        # only load the postings of the query keywords
+        keyword_table_store = self._get_keyword_table_store()
+        postings = keyword_table_store.get_postings(list(keywords))
+        if not postings:
+            return []
+
+        node_count, avg_node_length = keyword_table_store.get_statistics()
+
+        document_frequencies: dict[str, int] = defaultdict(int)
+        for posting in postings:
+            document_frequencies[posting.keyword] += 1
+        node_count = max(node_count, max(document_frequencies.values()))
+
+        # rank text chunks by BM25 over the query keywords
+        k1 = self._config.bm25_k1
+        b = self._config.bm25_b
+        chunk_scores: dict[str, float] = defaultdict(float)
+        for posting in postings:
+            document_frequency = document_frequencies[posting.keyword]
+            idf = math.log((node_count - document_frequency + 0.5) / (document_frequency + 0.5) + 1)
+            length_norm = 1 - b + b * posting.node_length / avg_node_length if avg_node_length else 1
+            term_frequency = posting.term_frequency
+            chunk_scores[posting.index_node_id] += idf * term_frequency * (k1 + 1) \
+                / (term_frequency + k1 * length_norm)
+
+        return heapq.nlargest(k, chunk_scores.items(), key=lambda x: x[1])
+
+    def _count_keywords(self, content: str, keywords: list[str]) -> dict[str, int]:
+        content = content.lower()
+        return {keyword: max(content.count(keyword.lower()), 1) for keyword in keywords}
+
+    def _update_segment_keywords(self, dataset_id: str, node_id: str, keywords: list[str]) -> Optional[DocumentSegment]:
         document_segment = db.session.query(DocumentSegment).filter(
             DocumentSegment.dataset_id == dataset_id,
             DocumentSegment.index_node_id == node_id
@@ -244,32 +185,38 @@ class KeywordTableIndex(BaseIndex):
             document_segment.keywords = keywords
             db.session.commit()
 
+        return document_segment
+
     def create_segment_keywords(self, node_id: str, keywords: list[str]):
-        keyword_table = self._get_dataset_keyword_table()
-        self._update_segment_keywords(self.dataset.id, node_id, keywords)
-        keyword_table = self._add_text_to_keyword_table(keyword_table, node_id, keywords)
-        self._save_dataset_keyword_table(keyword_table)
+        segment = self._update_segment_keywords(self.dataset.id, node_id, keywords)
+        content = segment.content if segment else ''
+        self._get_keyword_table_store().add({node_id: self._count_keywords(content, keywords)},
+                                            {node_id: len(content)})
 
     def multi_create_segment_keywords(self, pre_segment_data_list: list):
         keyword_table_handler = JiebaKeywordTableHandler()
-        keyword_table = self._get_dataset_keyword_table()
+        node_keywords = {}
+        node_lengths = {}
         for pre_segment_data in pre_segment_data_list:
             segment = pre_segment_data['segment']
             if pre_segment_data['keywords']:
                 segment.keywords = pre_segment_data['keywords']
-                keyword_table = self._add_text_to_keyword_table(keyword_table, segment.index_node_id,
-                                                                pre_segment_data['keywords'])
             else:
                 keywords = keyword_table_handler.extract_keywords(segment.content,
                                                                   self._config.max_keywords_per_chunk)
                 segment.keywords = list(keywords)
-                keyword_table = self._add_text_to_keyword_table(keyword_table, segment.index_node_id, list(keywords))
-        self._save_dataset_keyword_table(keyword_table)
+            node_keywords[segment.index_node_id] = self._count_keywords(segment.content, segment.keywords)
+            node_lengths[segment.index_node_id] = len(segment.content)
+        self._get_keyword_table_store().add(node_keywords, node_lengths)
 
     def update_segment_keywords_index(self, node_id: str, keywords: list[str]):
-        keyword_table = self._get_dataset_keyword_table()
-        keyword_table = self._add_text_to_keyword_table(keyword_table, node_id, keywords)
-        self._save_dataset_keyword_table(keyword_table)
+        segment = db.session.query(DocumentSegment).filter(
+            DocumentSegment.dataset_id == self.dataset.id,
+            DocumentSegment.index_node_id == node_id
+        ).first()
+        content = segment.content if segment else ''
+        self._get_keyword_table_store().add({node_id: self._count_keywords(content, keywords)},
+                                            {node_id: len(content)})
 
 
 class KeywordTableRetriever(BaseRetriever, BaseModel):
@@ -295,10 +242,3 @@ class KeywordTableRetriever(BaseRetriever, BaseModel):
 
     async def aget_relevant_documents(self, query: str) -> list[Document]:
         raise NotImplementedError("KeywordTableRetriever does not support async")
-
-
-class SetEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, set):
-            return list(obj)
-        return super().default(obj)
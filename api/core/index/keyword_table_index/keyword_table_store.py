@@ -0,0 +1,317 @@
+import json
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from extensions.ext_database import db
+from models.dataset import DatasetKeyword, DatasetKeywordTable
+
+# length of the `dataset_keywords.keyword` column, longer keywords (urls, hashes) are not indexed
+MAX_KEYWORD_LENGTH = 255
+INSERT_BATCH_SIZE = 1000
+
+
+class KeywordPosting(NamedTuple):
+    keyword: str
+    index_node_id: str
+    term_frequency: int
+    node_length: int
+
+
+class KeywordTableStatistics(NamedTuple):
+    node_count: int
+    avg_node_length: float
+
+
+class BaseKeywordTableStore(ABC):
+    """Storage of the keyword -> index node ids table of a dataset."""
+
+    def __init__(self, dataset_keyword_table: DatasetKeywordTable):
+        self.dataset_keyword_table = dataset_keyword_table
+        self.dataset_id = dataset_keyword_table.dataset_id
+
+    @abstractmethod
+    def add(self, node_keywords: dict[str, dict[str, int]], node_lengths: dict[str, int]) -> None:
+        """
+        Add keywords of index nodes, replacing the keywords the nodes had before.
+
+        :param node_keywords: index node id -> keyword -> term frequency
+        :param node_lengths: index node id -> length of the node content
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, ids: list[str]) -> None:
+        """
+        Delete index nodes from all keywords.
+
+        :param ids: index node ids
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_postings(self, keywords: list[str]) -> list[KeywordPosting]:
+        """
+        Get the postings of the given keywords.
+
+        :param keywords: keywords
+        :return: postings
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_statistics(self) -> KeywordTableStatistics:
+        """
+        Get the number of indexed nodes and their average length.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_all(self) -> dict[str, set[str]]:
+        """
+        Get the whole keyword table.
+
+        :return: keyword -> index node ids
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, id: str) -> bool:
+        """
+        Check if index node is in the keyword table.
+
+        :param id: index node id
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Delete all keywords of the dataset.
+        """
+        raise NotImplementedError
+
+
+class JsonKeywordTableStore(BaseKeywordTableStore):
+    """Legacy storage, the whole keyword table is one JSON document in `DatasetKeywordTable.keyword_table`."""
+
+    def add(self, node_keywords: dict[str, dict[str, int]], node_lengths: dict[str, int]) -> None:
+        keyword_table = self.get_all()
+        for node_id, keywords in node_keywords.items():
+            for keyword in keywords:
+                if keyword not in keyword_table:
+                    keyword_table[keyword] = set()
+                keyword_table[keyword].add(node_id)
+
+        self._save(keyword_table)
+
+    def delete(self, ids: list[str]) -> None:
+        keyword_table = self.get_all()
+
+        # get set of ids that correspond to node
+        node_idxs_to_delete = set(ids)
+
+        # delete node_idxs from keyword to node idxs mapping
+        keywords_to_delete = set()
+        for keyword, node_idxs in keyword_table.items():
+            if node_idxs_to_delete.intersection(node_idxs):
+                keyword_table[keyword] = node_idxs.difference(
+                    node_idxs_to_delete
+                )
+                if not keyword_table[keyword]:
+                    keywords_to_delete.add(keyword)
+
+        for keyword in keywords_to_delete:
+            del keyword_table[keyword]
+
+        self._save(keyword_table)
+
+    def get_postings(self, keywords: list[str]) -> list[KeywordPosting]:
+        # term frequencies and node lengths are not kept in the JSON table
+        keyword_table = self.get_all()
+        return [
+            KeywordPosting(keyword, node_id, 1, 0)
+            for keyword in keywords if keyword in keyword_table
+            for node_id in keyword_table[keyword]
+        ]
+
+    def get_statistics(self) -> KeywordTableStatistics:
+        keyword_table = self.get_all()
+        node_ids = set()
+        for node_idxs in keyword_table.values():
+            node_ids.update(node_idxs)
+
+        return KeywordTableStatistics(len(node_ids), 0)
+
+    def get_all(self) -> dict[str, set[str]]:
+        keyword_table_dict = self.dataset_keyword_table.keyword_table_dict
+        if keyword_table_dict:
+            return keyword_table_dict['__data__']['table']
+
+        return {}
+
+    def exists(self, id: str) -> bool:
+        keyword_table = self.get_all()
+        return any(id in node_idxs for node_idxs in keyword_table.values())
+
+    def clear(self) -> None:
+        self._save({})
+
+    def _save(self, keyword_table: dict[str, set[str]]) -> None:
+        self.dataset_keyword_table.keyword_table = dump_keyword_table(self.dataset_id, keyword_table)
+        db.session.commit()
+
+
+class InvertedIndexKeywordTableStore(BaseKeywordTableStore):
+    """One `DatasetKeyword` row per (keyword, index node), reads and writes only touch the affected postings."""
+
+    def add(self, node_keywords: dict[str, dict[str, int]], node_lengths: dict[str, int]) -> None:
+        # drop previous postings of the nodes so the statistics count every node once
+        self._delete_postings(list(node_keywords.keys()))
+
+        rows = [
+            {
+                'dataset_id': self.dataset_id,
+                'keyword': keyword,
+                'index_node_id': node_id,
+                'term_frequency': term_frequency,
+                'node_length': node_lengths.get(node_id, 0)
+            }
+            for node_id, keywords in node_keywords.items()
+            for keyword, term_frequency in keywords.items()
+            if len(keyword) <= MAX_KEYWORD_LENGTH
+        ]
+
+        if rows:
+            for i in range(0, len(rows), INSERT_BATCH_SIZE):
+                db.session.execute(
+                    insert(DatasetKeyword).values(rows[i:i + INSERT_BATCH_SIZE]).on_conflict_do_nothing(
+                        constraint='dataset_keyword_unique_idx'
+                    )
+                )
+
+            node_ids = {row['index_node_id'] for row in rows}
+            self._update_statistics(len(node_ids), sum(node_lengths.get(node_id, 0) for node_id in node_ids))
+        db.session.commit()
+
+    def delete(self, ids: list[str]) -> None:
+        self._delete_postings(ids)
+        db.session.commit()
+
+    def get_postings(self, keywords: list[str]) -> list[KeywordPosting]:
+        if not keywords:
+            return []
+
+        postings = db.session.query(
+            DatasetKeyword.keyword,
+            DatasetKeyword.index_node_id,
+            DatasetKeyword.term_frequency,
+            DatasetKeyword.node_length
+        ).filter(
+            DatasetKeyword.dataset_id == self.dataset_id,
+            DatasetKeyword.keyword.in_(set(keywords))
+        ).all()
+
+        return [KeywordPosting(*posting) for posting in postings]
+
+    def get_statistics(self) -> KeywordTableStatistics:
+        node_count = self.dataset_keyword_table.node_count or 0
+        total_node_length = self.dataset_keyword_table.total_node_length or 0
+
+        return KeywordTableStatistics(node_count, total_node_length / node_count if node_count else 0)
+
+    def get_all(self) -> dict[str, set[str]]:
+        postings = db.session.query(DatasetKeyword.keyword, DatasetKeyword.index_node_id).filter(
+            DatasetKeyword.dataset_id == self.dataset_id
+        ).all()
+
+        return self._to_keyword_table(postings)
+
+    def exists(self, id: str) -> bool:
+        return db.session.query(DatasetKeyword.id).filter(
+            DatasetKeyword.dataset_id == self.dataset_id,
+            DatasetKeyword.index_node_id == id
+        ).first() is not None
+
+    def clear(self) -> None:
+        db.session.query(DatasetKeyword).filter(
+            DatasetKeyword.dataset_id == self.dataset_id
+        ).delete(synchronize_session=False)
+        self.dataset_keyword_table.node_count = 0
+        self.dataset_keyword_table.total_node_length = 0
+        db.session.commit()
+
+    def _delete_postings(self, ids: list[str]) -> None:
+        if not ids:
+            return
+
+        nodes = db.session.query(
+            DatasetKeyword.index_node_id,
+            func.max(DatasetKeyword.node_length)
+        ).filter(
+            DatasetKeyword.dataset_id == self.dataset_id,
+            DatasetKeyword.index_node_id.in_(ids)
+        ).group_by(DatasetKeyword.index_node_id).all()
+
+        if not nodes:
+            return
+
+        db.session.query(DatasetKeyword).filter(
+            DatasetKeyword.dataset_id == self.dataset_id,
+            DatasetKeyword.index_node_id.in_(ids)
+        ).delete(synchronize_session=False)
+
+        self._update_statistics(-len(nodes), -sum(node_length for _, node_length in nodes))
+
+    def _update_statistics(self, node_count: int, node_length: int) -> None:
+        # increment in SQL, concurrent indexing tasks write the same row
+        db.session.query(DatasetKeywordTable).filter(
+            DatasetKeywordTable.id == self.dataset_keyword_table.id
+        ).update({
+            DatasetKeywordTable.node_count: DatasetKeywordTable.node_count + node_count,
+            DatasetKeywordTable.total_node_length: DatasetKeywordTable.total_node_length + node_length
+        }, synchronize_session='fetch')
+
+    @staticmethod
+    def _to_keyword_table(postings: list) -> dict[str, set[str]]:
+        keyword_table = {}
+        for keyword, node_id in postings:
+            if keyword not in keyword_table:
+                keyword_table[keyword] = set()
+            keyword_table[keyword].add(node_id)
+
+        return keyword_table
+
+
+KEYWORD_TABLE_STORES = {
+    'json': JsonKeywordTableStore,
+    'inverted_index': InvertedIndexKeywordTableStore,
+}
+
+
+def get_keyword_table_store(dataset_keyword_table: DatasetKeywordTable) -> BaseKeywordTableStore:
+    storage_type = dataset_keyword_table.storage_type or 'json'
+    if storage_type not in KEYWORD_TABLE_STORES:
+        raise ValueError(f"Unsupported keyword table storage type {storage_type}.")
+
+    return KEYWORD_TABLE_STORES[storage_type](dataset_keyword_table)
+
+
+def dump_keyword_table(dataset_id: str, keyword_table: dict[str, set[str]]) -> str:
+    return json.dumps({
+        '__type__': 'keyword_table',
+        '__data__': {
+            "index_id": dataset_id,
+            "summary": None,
+            "table": keyword_table
+        }
+    }, cls=SetEncoder)
+
+
+class SetEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, set):
+            return list(obj)
+        return super().default(obj)
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 from abc import abstractmethod
@@ -9,9 +10,15 @@ from langchain.vectorstores import VectorStore
 
 from core.index.base import BaseIndex
 from extensions.ext_database import db
+from extensions.ext_redis import redis_client
 from models.dataset import Dataset, DatasetCollectionBinding, DocumentSegment
 from models.dataset import Document as DatasetDocument
 
+# number of segments embedded and inserted at once when an index is rebuilt from the dataset segments
+REBUILD_BATCH_SIZE = 500
+# seconds the progress of an interrupted rebuild is kept
+REBUILD_CHECKPOINT_EXPIRE = 86400
+
 
 class BaseVectorIndex(BaseIndex):
 
@@ -105,6 +112,21 @@ class BaseVectorIndex(BaseIndex):
 
         return vector_store.text_exists(id)
 
+    def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """
+        Get the stored vectors of texts.
+
+        :param ids: doc ids of the texts
+        :return: vector of each found doc id
+        """
+        if not ids:
+            return {}
+
+        vector_store = self._get_vector_store()
+        vector_store = cast(self._get_vector_store_class(), vector_store)
+
+        return vector_store.get_vectors_by_ids(ids)
+
     def delete_by_ids(self, ids: list[str]) -> None:
         if self._is_origin():
             self.recreate_dataset(self.dataset)
@@ -136,52 +158,26 @@ class BaseVectorIndex(BaseIndex):
     def recreate_dataset(self, dataset: Dataset):
         logging.info(f"Recreating dataset {dataset.id}")
 
-        try:
-            self.delete()
-        except Exception as e:
-            raise e
+        checkpoint_key = self._get_rebuild_checkpoint_key(dataset, 'recreate')
 
-        dataset_documents = db.session.query(DatasetDocument).filter(
-            DatasetDocument.dataset_id == dataset.id,
-            DatasetDocument.indexing_status == 'completed',
-            DatasetDocument.enabled == True,
-            DatasetDocument.archived == False,
-        ).all()
-
-        documents = []
-        for dataset_document in dataset_documents:
-            segments = db.session.query(DocumentSegment).filter(
-                DocumentSegment.document_id == dataset_document.id,
-                DocumentSegment.status == 'completed',
-                DocumentSegment.enabled == True
-            ).all()
-
-            for segment in segments:
-                document = Document(
-                    page_content=segment.content,
-                    metadata={
-                        "doc_id": segment.index_node_id,
-                        "doc_hash": segment.index_node_hash,
-                        "document_id": segment.document_id,
-                        "dataset_id": segment.dataset_id,
-                    }
-                )
-
-                documents.append(document)
+        # the original index is already deleted when an interrupted rebuild is resumed
+        if not redis_client.exists(checkpoint_key):
+            self.delete()
 
         origin_index_struct = self.dataset.index_struct[:]
         self.dataset.index_struct = None
 
-        if documents:
-            try:
-                self.create(documents)
-            except Exception as e:
-                self.dataset.index_struct = origin_index_struct
-                raise e
+        try:
+            indexed = self._add_dataset_segments(dataset, checkpoint_key, create=True)
+        except Exception as e:
+            self.dataset.index_struct = origin_index_struct
+            raise e
 
+        if indexed:
             dataset.index_struct = json.dumps(self.to_index_struct())
 
         db.session.commit()
+        redis_client.delete(checkpoint_key)
 
         self.dataset = dataset
         logging.info(f"Dataset {dataset.id} recreate successfully.")
@@ -189,46 +185,26 @@ class BaseVectorIndex(BaseIndex):
     def create_qdrant_dataset(self, dataset: Dataset):
         logging.info(f"create_qdrant_dataset {dataset.id}")
 
-        try:
+        checkpoint_key = self._get_rebuild_checkpoint_key(dataset, 'create_qdrant')
+        if not redis_client.exists(checkpoint_key):
             self.delete()
-        except Exception as e:
-            raise e
 
-        dataset_documents = db.session.query(DatasetDocument).filter(
-            DatasetDocument.dataset_id == dataset.id,
-            DatasetDocument.indexing_status == 'completed',
-            DatasetDocument.enabled == True,
-            DatasetDocument.archived == False,
-        ).all()
-
-        documents = []
-        for dataset_document in dataset_documents:
-            segments = db.session.query(DocumentSegment).filter(
-                DocumentSegment.document_id == dataset_document.id,
-                DocumentSegment.status == 'completed',
-                DocumentSegment.enabled == True
-            ).all()
+        self._add_dataset_segments(dataset, checkpoint_key, create=True)
+        redis_client.delete(checkpoint_key)
 
-            for segment in segments:
-                document = Document(
-                    page_content=segment.content,
-                    metadata={
-                        "doc_id": segment.index_node_id,
-                        "doc_hash": segment.index_node_hash,
-                        "document_id": segment.document_id,
-                        "dataset_id": segment.dataset_id,
-                    }
-                )
+        logging.info(f"Dataset {dataset.id} recreate successfully.")
 
-                documents.append(document)
+    def create_from_segments(self, dataset: Dataset):
+        """
+        Create the index from the enabled segments of the dataset.
+        """
+        logging.info(f"create index from segments {dataset.id}")
 
-        if documents:
-            try:
-                self.create(documents)
-            except Exception as e:
-                raise e
+        checkpoint_key = self._get_rebuild_checkpoint_key(dataset, 'create')
+        self._add_dataset_segments(dataset, checkpoint_key, create=True)
+        redis_client.delete(checkpoint_key)
 
-        logging.info(f"Dataset {dataset.id} recreate successfully.")
+        logging.info(f"Dataset {dataset.id} create successfully.")
 
     def update_qdrant_dataset(self, dataset: Dataset):
         logging.info(f"update_qdrant_dataset {dataset.id}")
@@ -257,39 +233,9 @@ class BaseVectorIndex(BaseIndex):
     def restore_dataset_in_one(self, dataset: Dataset, dataset_collection_binding: DatasetCollectionBinding):
         logging.info(f"restore dataset in_one,_dataset {dataset.id}")
 
-        dataset_documents = db.session.query(DatasetDocument).filter(
-            DatasetDocument.dataset_id == dataset.id,
-            DatasetDocument.indexing_status == 'completed',
-            DatasetDocument.enabled == True,
-            DatasetDocument.archived == False,
-        ).all()
-
-        documents = []
-        for dataset_document in dataset_documents:
-            segments = db.session.query(DocumentSegment).filter(
-                DocumentSegment.document_id == dataset_document.id,
-                DocumentSegment.status == 'completed',
-                DocumentSegment.enabled == True
-            ).all()
-
-            for segment in segments:
-                document = Document(
-                    page_content=segment.content,
-                    metadata={
-                        "doc_id": segment.index_node_id,
-                        "doc_hash": segment.index_node_hash,
-                        "document_id": segment.document_id,
-                        "dataset_id": segment.dataset_id,
-                    }
-                )
-
-                documents.append(document)
-
-        if documents:
-            try:
-                self.add_texts(documents)
-            except Exception as e:
-                raise e
+        checkpoint_key = self._get_rebuild_checkpoint_key(dataset, 'restore_in_one')
+        self._add_dataset_segments(dataset, checkpoint_key, create=False)
+        redis_client.delete(checkpoint_key)
 
         logging.info(f"Dataset {dataset.id} recreate successfully.")
 
@@ -303,3 +249,86 @@ class BaseVectorIndex(BaseIndex):
         db.session.commit()
 
         logging.info(f"Dataset {dataset.id} recreate successfully.")
+
+    def _add_dataset_segments(self, dataset: Dataset, checkpoint_key: str, create: bool) -> bool:
+        """
+        Add the enabled segments of the dataset to the index in batches of REBUILD_BATCH_SIZE.
+
+        Segments are read page by page in id order and the last added segment id is kept in redis,
+        so a rebuild that was interrupted continues after the last added batch.
+
+        :param dataset: dataset
+        :param checkpoint_key: redis key of the rebuild progress
+        :param create: create the index with the first batch
+        :return: whether the index contains any segment
+        """
+        last_segment_id = redis_client.get(checkpoint_key)
+        if last_segment_id is not None:
+            last_segment_id = last_segment_id.decode('utf-8')
+            # the index was created before the rebuild was interrupted
+            create = False
+            logging.info(f"Resume rebuilding index of dataset {dataset.id} after segment {last_segment_id}")
+
+        indexed = last_segment_id is not None
+        while True:
+            query = db.session.query(
+                DocumentSegment.id,
+                DocumentSegment.content,
+                DocumentSegment.index_node_id,
+                DocumentSegment.index_node_hash,
+                DocumentSegment.document_id,
+                DocumentSegment.dataset_id
+            ).join(
+                DatasetDocument, DatasetDocument.id == DocumentSegment.document_id
+            ).filter(
+                DocumentSegment.dataset_id == dataset.id,
+                DocumentSegment.status == 'completed',
+                DocumentSegment.enabled == True,
+                DatasetDocument.indexing_status == 'completed',
+                DatasetDocument.enabled == True,
+                DatasetDocument.archived == False,
+            )
+
+            if last_segment_id:
+                query = query.filter(DocumentSegment.id > last_segment_id)
+
+            segments = query.order_by(DocumentSegment.id.asc()).limit(REBUILD_BATCH_SIZE).all()
+            if not segments:
+                break
+
+            documents = [
+                Document(
+                    page_content=segment.content,
+                    metadata={
+                        "doc_id": segment.index_node_id,
+                        "doc_hash": segment.index_node_hash,
+                        "document_id": segment.document_id,
+                        "dataset_id": segment.dataset_id,
+                    }
+                )
+                for segment in segments
+            ]
+
+            if create:
+                self.create(documents)
+                create = False
+            else:
+                self.add_texts(documents)
+
+            indexed = True
+            last_segment_id = segments[-1].id
+            redis_client.setex(checkpoint_key, REBUILD_CHECKPOINT_EXPIRE, last_segment_id)
+
+        return indexed
+
+    def _get_rebuild_checkpoint_key(self, dataset: Dataset, operation: str) -> str:
+        # a rebuild is only resumed into the same index with the same embedding model,
+        # a fresh rebuild after the model or collection binding changed starts from scratch
+        index_identity = ':'.join([
+            self.get_type(),
+            dataset.embedding_model_provider or '',
+            dataset.embedding_model or '',
+            str(dataset.collection_binding_id or '')
+        ])
+        index_hash = hashlib.sha256(index_identity.encode('utf-8')).hexdigest()[:16]
+        return f"vector_index_rebuild:{operation}:{dataset.id}:{index_hash}"
@@ -10,6 +10,7 @@ from qdrant_client.http.models import HnswConfigDiff
 
 from core.index.base import BaseIndex
 from core.index.vector_index.base import BaseVectorIndex
+from core.vector_store.client_pool import VectorStoreClientPool
 from core.vector_store.qdrant_vector_store import QdrantVectorStore
 from extensions.ext_database import db
 from models.dataset import Dataset, DatasetCollectionBinding
@@ -108,9 +109,7 @@ class QdrantVectorIndex(BaseVectorIndex):
         if self._vector_store:
             return self._vector_store
         attributes = ['doc_id', 'dataset_id', 'document_id']
-        client = qdrant_client.QdrantClient(
-            **self._client_config.to_qdrant_params()
-        )
+        client = self._get_client()
 
         return QdrantVectorStore(
             client=client,
@@ -124,6 +123,18 @@ class QdrantVectorIndex(BaseVectorIndex):
     def _get_vector_store_class(self) -> type:
         return QdrantVectorStore
 
+    def _get_client(self) -> qdrant_client.QdrantClient:
+        params = self._client_config.to_qdrant_params()
+        if 'path' in params:
+            # local storage is read and written by its own client
+            return qdrant_client.QdrantClient(**params)
+
+        # remote clients are shared in the process to keep their connections alive
+        return VectorStoreClientPool.get_client(
+            ('qdrant', params['url'], params['api_key'], params['timeout']),
+            lambda: qdrant_client.QdrantClient(**params)
+        )
+
     def delete_by_document_id(self, document_id: str):
 
         vector_store = self._get_vector_store()
@@ -215,15 +226,11 @@ class QdrantVectorIndex(BaseVectorIndex):
         vector_store = cast(self._get_vector_store_class(), vector_store)
 
         from qdrant_client.http import models
-        return vector_store.similarity_search_by_bm25(models.Filter(
+        return vector_store.similarity_search_by_bm25(query, models.Filter(
             must=[
                 models.FieldCondition(
                     key="group_id",
                     match=models.MatchValue(value=self.dataset.id),
-                ),
-                models.FieldCondition(
-                    key="page_content",
-                    match=models.MatchText(text=query),
                 )
             ],
         ), kwargs.get('top_k', 2))
@@ -9,6 +9,7 @@ from pydantic import BaseModel, root_validator
 
 from core.index.base import BaseIndex
 from core.index.vector_index.base import BaseVectorIndex
+from core.vector_store.client_pool import VectorStoreClientPool
 from core.vector_store.weaviate_vector_store import WeaviateVectorStore
 from models.dataset import Dataset
 
@@ -33,6 +34,13 @@ class WeaviateVectorIndex(BaseVectorIndex):
         self._attributes = attributes
 
     def _init_client(self, config: WeaviateConfig) -> weaviate.Client:
+        # clients are shared in the process to keep their connections alive
+        return VectorStoreClientPool.get_client(
+            ('weaviate', config.endpoint, config.api_key, config.batch_size),
+            lambda: self._create_client(config)
+        )
+
+    def _create_client(self, config: WeaviateConfig) -> weaviate.Client:
         auth_config = weaviate.auth.AuthApiKey(api_key=config.api_key)
 
         weaviate.connect.connection.has_grpc = False
@@ -5,22 +5,27 @@ import re
 import threading
 import time
 import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, cast
 
 from flask import Flask, current_app
 from flask_login import current_user
 from langchain.schema import Document
 from langchain.text_splitter import TextSplitter
+from sqlalchemy import func
 from sqlalchemy.orm.exc import ObjectDeletedError
 
 from core.data_loader.file_extractor import FileExtractor
 from core.data_loader.loader.notion import NotionLoader
 from core.docstore.dataset_docstore import DatasetDocumentStore
+from core.embedding.cached_embedding import CacheEmbedding
 from core.errors.error import ProviderTokenNotInitError
 from core.generator.llm_generator import LLMGenerator
 from core.index.index import IndexBuilder
 from core.model_manager import ModelInstance, ModelManager
 from core.model_runtime.entities.model_entities import ModelType, PriceType
+from core.model_runtime.errors.invoke import InvokeRateLimitError
 from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.splitter.fixed_text_splitter import EnhanceRecursiveCharacterTextSplitter, FixedRecursiveCharacterTextSplitter
@@ -42,71 +47,23 @@ class IndexingRunner:
 
     def run(self, dataset_documents: list[DatasetDocument]):
         """Run the indexing process."""
-        for dataset_document in dataset_documents:
-            try:
-                # get dataset
-                dataset = Dataset.query.filter_by(
-                    id=dataset_document.dataset_id
-                ).first()
-
-                if not dataset:
-                    raise ValueError("no dataset found")
-
-                # get the process rule
-                processing_rule = db.session.query(DatasetProcessRule). \
-                    filter(DatasetProcessRule.id == dataset_document.dataset_process_rule_id). \
-                    first()
-
-                # load file
-                text_docs = self._load_data(dataset_document, processing_rule.mode == 'automatic')
-
-                # get embedding model instance
-                embedding_model_instance = None
-                if dataset.indexing_technique == 'high_quality':
-                    if dataset.embedding_model_provider:
-                        embedding_model_instance = self.model_manager.get_model_instance(
-                            tenant_id=dataset.tenant_id,
-                            provider=dataset.embedding_model_provider,
-                            model_type=ModelType.TEXT_EMBEDDING,
-                            model=dataset.embedding_model
-                        )
-                    else:
-                        embedding_model_instance = self.model_manager.get_default_model_instance(
-                            tenant_id=dataset.tenant_id,
-                            model_type=ModelType.TEXT_EMBEDDING,
-                        )
-
-                # get splitter
-                splitter = self._get_splitter(processing_rule, embedding_model_instance)
+        def step(dataset: Dataset, dataset_document: DatasetDocument, processing_rule: DatasetProcessRule,
+                 text_docs: list[Document], splitter: TextSplitter):
+            # split to documents
+            documents = self._step_split(
+                text_docs=text_docs,
+                splitter=splitter,
+                dataset=dataset,
+                dataset_document=dataset_document,
+                processing_rule=processing_rule
+            )
+            self._build_index(
+                dataset=dataset,
+                dataset_document=dataset_document,
+                documents=documents
+            )
 
-                # split to documents
-                documents = self._step_split(
-                    text_docs=text_docs,
-                    splitter=splitter,
-                    dataset=dataset,
-                    dataset_document=dataset_document,
-                    processing_rule=processing_rule
-                )
-                self._build_index(
-                    dataset=dataset,
-                    dataset_document=dataset_document,
-                    documents=documents
-                )
-            except DocumentIsPausedException:
-                raise DocumentIsPausedException('Document paused, document id: {}'.format(dataset_document.id))
-            except ProviderTokenNotInitError as e:
-                dataset_document.indexing_status = 'error'
-                dataset_document.error = str(e.description)
-                dataset_document.stopped_at = datetime.datetime.utcnow()
-                db.session.commit()
-            except ObjectDeletedError:
-                logging.warning('Document deleted, document id: {}'.format(dataset_document.id))
-            except Exception as e:
-                logging.exception("consume document failed")
-                dataset_document.indexing_status = 'error'
-                dataset_document.error = str(e)
-                dataset_document.stopped_at = datetime.datetime.utcnow()
-                db.session.commit()
+        self._run_documents(dataset_documents, step)
 
     def run_in_splitting_status(self, dataset_document: DatasetDocument):
         """Run the indexing process when the index_status is splitting."""
@@ -238,6 +195,110 @@ class IndexingRunner:
             dataset_document.stopped_at = datetime.datetime.utcnow()
             db.session.commit()
 
+    def run_incremental(self, dataset_documents: list[DatasetDocument]):
+        """
+        Re-index documents whose content changed, only chunks whose hash is not already indexed are embedded.
+
+        Segments of unchanged chunks keep their ids, hit counts and index entries, segments of removed chunks
+        are deleted from the indexes.
+        """
+        def step(dataset: Dataset, dataset_document: DatasetDocument, processing_rule: DatasetProcessRule,
+                 text_docs: list[Document], splitter: TextSplitter):
+            # split to documents
+            documents = self._split_to_documents(
+                text_docs=text_docs,
+                splitter=splitter,
+                processing_rule=processing_rule,
+                tenant_id=dataset.tenant_id,
+                document_form=dataset_document.doc_form,
+                document_language=dataset_document.doc_language
+            )
+
+            # diff the chunks against the indexed segments and save the new ones
+            new_documents = self._step_update_segments(
+                documents=documents,
+                dataset=dataset,
+                dataset_document=dataset_document
+            )
+
+            self._build_index(
+                dataset=dataset,
+                dataset_document=dataset_document,
+                documents=new_documents
+            )
+
+            # tokens of the whole document, not only of the re-indexed chunks
+            if dataset.indexing_technique == 'high_quality':
+                tokens = db.session.query(func.sum(DocumentSegment.tokens)).filter(
+                    DocumentSegment.document_id == dataset_document.id
+                ).scalar()
+                DatasetDocument.query.filter_by(id=dataset_document.id).update({
+                    DatasetDocument.tokens: tokens or 0
+                })
+                db.session.commit()
+
+        self._run_documents(dataset_documents, step)
+
+    def _run_documents(self, dataset_documents: list[DatasetDocument],
+                       step: Callable[[Dataset, DatasetDocument, DatasetProcessRule, list[Document], TextSplitter], None]):
+        """
+        Load and index each document with `step`, which is called with the dataset, the document,
+        its process rule, the loaded text docs and the splitter, errors are saved on the document.
+        """
+        for dataset_document in dataset_documents:
+            try:
+                # get dataset
+                dataset = Dataset.query.filter_by(
+                    id=dataset_document.dataset_id
+                ).first()
+
+                if not dataset:
+                    raise ValueError("no dataset found")
+
+                # get the process rule
+                processing_rule = db.session.query(DatasetProcessRule). \
+                    filter(DatasetProcessRule.id == dataset_document.dataset_process_rule_id). \
+                    first()
+
+                # load file
+                text_docs = self._load_data(dataset_document, processing_rule.mode == 'automatic')
+
+                # get embedding model instance
+                embedding_model_instance = None
+                if dataset.indexing_technique == 'high_quality':
+                    if dataset.embedding_model_provider:
+                        embedding_model_instance = self.model_manager.get_model_instance(
+                            tenant_id=dataset.tenant_id,
+                            provider=dataset.embedding_model_provider,
+                            model_type=ModelType.TEXT_EMBEDDING,
+                            model=dataset.embedding_model
+                        )
+                    else:
+                        embedding_model_instance = self.model_manager.get_default_model_instance(
+                            tenant_id=dataset.tenant_id,
+                            model_type=ModelType.TEXT_EMBEDDING,
+                        )
+
+                # get splitter
+                splitter = self._get_splitter(processing_rule, embedding_model_instance)
+
+                step(dataset, dataset_document, processing_rule, text_docs, splitter)
+            except DocumentIsPausedException:
+                raise DocumentIsPausedException('Document paused, document id: {}'.format(dataset_document.id))
+            except ProviderTokenNotInitError as e:
+                dataset_document.indexing_status = 'error'
+                dataset_document.error = str(e.description)
+                dataset_document.stopped_at = datetime.datetime.utcnow()
+                db.session.commit()
+            except ObjectDeletedError:
+                logging.warning('Document deleted, document id: {}'.format(dataset_document.id))
+            except Exception as e:
+                logging.exception("consume document failed")
+                dataset_document.indexing_status = 'error'
+                dataset_document.error = str(e)
+                dataset_document.stopped_at = datetime.datetime.utcnow()
+                db.session.commit()
+
     def file_indexing_estimate(self, tenant_id: str, file_details: list[UploadFile], tmp_processing_rule: dict,
                                doc_form: str = None, doc_language: str = 'English', dataset_id: str = None,
                                indexing_technique: str = 'economy') -> dict:
@@ -624,6 +685,100 @@ class IndexingRunner:
 
         return documents
 
+    def _step_update_segments(self, documents: list[Document], dataset: Dataset,
+                              dataset_document: DatasetDocument) -> list[Document]:
+        """
+        Match the split documents with the existing document segments by content hash, delete the segments and
+        index entries of removed chunks, save the new chunks to document segments and return them for indexing.
+        """
+        # indexed segments by hash, a document may contain the same chunk more than once
+        existing_segments = {}
+        if dataset_document.doc_form != 'qa_model':
+            # question and answer pairs are generated again by the llm, no segment can be reused
+            segments = db.session.query(DocumentSegment).filter(
+                DocumentSegment.document_id == dataset_document.id,
+                DocumentSegment.status == 'completed'
+            ).order_by(DocumentSegment.position.asc()).all()
+            for segment in segments:
+                existing_segments.setdefault(segment.index_node_hash, []).append(segment)
+
+        new_documents = []
+        for document in documents:
+            matched_segments = existing_segments.get(document.metadata['doc_hash'])
+            if matched_segments:
+                document.metadata['doc_id'] = matched_segments.pop(0).index_node_id
+            else:
+                new_documents.append(document)
+
+        kept_index_node_ids = {document.metadata['doc_id'] for document in documents}
+        segments = db.session.query(DocumentSegment.id, DocumentSegment.index_node_id).filter(
+            DocumentSegment.document_id == dataset_document.id
+        ).all()
+        removed_segments = [(segment_id, index_node_id) for segment_id, index_node_id in segments
+                            if index_node_id not in kept_index_node_ids]
+
+        # delete removed chunks from the indexes and the document segments
+        if removed_segments:
+            index_node_ids = [index_node_id for _, index_node_id in removed_segments]
+
+            vector_index = IndexBuilder.get_index(dataset, 'high_quality')
+            if vector_index:
+                vector_index.delete_by_ids(index_node_ids)
+
+            keyword_table_index = IndexBuilder.get_index(dataset, 'economy')
+            keyword_table_index.delete_by_ids(index_node_ids)
+
+            segment_ids = [segment_id for segment_id, _ in removed_segments]
+            for i in range(0, len(segment_ids), 1000):
+                db.session.query(DocumentSegment).filter(
+                    DocumentSegment.id.in_(segment_ids[i:i + 1000])
+                ).delete(synchronize_session=False)
+            db.session.commit()
+
+        # save new chunks to document segments
+        doc_store = DatasetDocumentStore(
+            dataset=dataset,
+            user_id=dataset_document.created_by,
+            document_id=dataset_document.id
+        )
+        doc_store.add_documents(new_documents)
+
+        # order the kept and the new segments as the chunks in the document
+        positions = {document.metadata['doc_id']: position for position, document in enumerate(documents, start=1)}
+        segments = db.session.query(DocumentSegment.id, DocumentSegment.index_node_id).filter(
+            DocumentSegment.document_id == dataset_document.id
+        ).all()
+        db.session.bulk_update_mappings(DocumentSegment, [
+            {'id': segment_id, 'position': positions[index_node_id]}
+            for segment_id, index_node_id in segments if index_node_id in positions
+        ])
+        db.session.commit()
+
+        # update document status to indexing
+        cur_time = datetime.datetime.utcnow()
+        self._update_document_index_status(
+            document_id=dataset_document.id,
+            after_indexing_status="indexing",
+            extra_update_params={
+                DatasetDocument.cleaning_completed_at: cur_time,
+                DatasetDocument.splitting_completed_at: cur_time,
+            }
+        )
+
+        # update new segments status to indexing
+        new_index_node_ids = [document.metadata['doc_id'] for document in new_documents]
+        for i in range(0, len(new_index_node_ids), 1000):
+            DocumentSegment.query.filter(
+                DocumentSegment.document_id == dataset_document.id,
+                DocumentSegment.index_node_id.in_(new_index_node_ids[i:i + 1000])
+            ).update({
+                DocumentSegment.status: "indexing",
+                DocumentSegment.indexing_at: datetime.datetime.utcnow()
+            }, synchronize_session=False)
+        db.session.commit()
+
+        return new_documents
+
     def _split_to_documents(self, text_docs: list[Document], splitter: TextSplitter,
                             processing_rule: DatasetProcessRule, tenant_id: str,
                             document_form: str, document_language: str) -> list[Document]:
@@ -795,39 +950,67 @@ class IndexingRunner:
             embedding_model_type_instance = embedding_model_instance.model_type_instance
             embedding_model_type_instance = cast(TextEmbeddingModel, embedding_model_type_instance)
 
-        for i in range(0, len(documents), chunk_size):
-            # check document is paused
-            self._check_document_paused_status(dataset_document.id)
-            chunk_documents = documents[i:i + chunk_size]
-            if dataset.indexing_technique == 'high_quality' or embedding_model_type_instance:
-                tokens += sum(
-                    embedding_model_type_instance.get_num_tokens(
-                        embedding_model_instance.model,
-                        embedding_model_instance.credentials,
-                        [document.page_content]
+        # embed the next chunks in the background while the current one is written to the indexes
+        embedding_workers = current_app.config['INDEXING_EMBEDDING_WORKERS'] \
+            if dataset.indexing_technique == 'high_quality' and embedding_model_instance else 0
+        embedding_executor = ThreadPoolExecutor(max_workers=embedding_workers) if embedding_workers > 0 else None
+        embedding_futures = {}
+
+        try:
+            for i in range(0, len(documents), chunk_size):
+                # check document is paused
+                self._check_document_paused_status(dataset_document.id)
+                chunk_documents = documents[i:i + chunk_size]
+
+                if embedding_executor:
+                    for j in range(i, min(i + (embedding_workers + 1) * chunk_size, len(documents)), chunk_size):
+                        if j not in embedding_futures:
+                            embedding_futures[j] = embedding_executor.submit(
+                                self._prefetch_embeddings,
+                                flask_app=current_app._get_current_object(),
+                                document_id=dataset_document.id,
+                                embedding_model_instance=embedding_model_instance,
+                                documents=documents[j:j + chunk_size]
+                            )
+
+                    # wait for the chunk embeddings, on failure they are computed again by the vector index
+                    try:
+                        embedding_futures.pop(i).result()
+                    except Exception:
+                        logging.exception('Failed to prefetch embeddings of document {}'.format(dataset_document.id))
+
+                if dataset.indexing_technique == 'high_quality' or embedding_model_type_instance:
+                    tokens += sum(
+                        embedding_model_type_instance.get_num_tokens(
+                            embedding_model_instance.model,
+                            embedding_model_instance.credentials,
+                            [document.page_content]
+                        )
+                        for document in chunk_documents
                     )
-                    for document in chunk_documents
-                )
 
-            # save vector index
-            if vector_index:
-                vector_index.add_texts(chunk_documents)
+                # save vector index
+                if vector_index:
+                    vector_index.add_texts(chunk_documents)
 
-            # save keyword index
-            keyword_table_index.add_texts(chunk_documents)
+                # save keyword index
+                keyword_table_index.add_texts(chunk_documents)
 
-            document_ids = [document.metadata['doc_id'] for document in chunk_documents]
-            db.session.query(DocumentSegment).filter(
-                DocumentSegment.document_id == dataset_document.id,
-                DocumentSegment.index_node_id.in_(document_ids),
-                DocumentSegment.status == "indexing"
-            ).update({
-                DocumentSegment.status: "completed",
-                DocumentSegment.enabled: True,
-                DocumentSegment.completed_at: datetime.datetime.utcnow()
-            })
+                document_ids = [document.metadata['doc_id'] for document in chunk_documents]
+                db.session.query(DocumentSegment).filter(
+                    DocumentSegment.document_id == dataset_document.id,
+                    DocumentSegment.index_node_id.in_(document_ids),
+                    DocumentSegment.status == "indexing"
+                ).update({
+                    DocumentSegment.status: "completed",
+                    DocumentSegment.enabled: True,
+                    DocumentSegment.completed_at: datetime.datetime.utcnow()
+                })
 
-            db.session.commit()
+                db.session.commit()
+        finally:
+            if embedding_executor:
+                embedding_executor.shutdown(wait=True, cancel_futures=True)
 
         indexing_end_at = time.perf_counter()
 
@@ -842,6 +1025,27 @@ class IndexingRunner:
             }
         )
 
+    def _prefetch_embeddings(self, flask_app: Flask, document_id: str, embedding_model_instance: ModelInstance,
+                             documents: list[Document]) -> None:
+        """
+        Embed documents into the embedding cache, so the vector index reads them back instead of calling the model.
+        """
+        with flask_app.app_context():
+            embeddings = CacheEmbedding(embedding_model_instance)
+            texts = [document.page_content for document in documents]
+            max_retries = 3
+            for retry in range(max_retries + 1):
+                # check document is paused
+                self._check_document_paused_status(document_id)
+                try:
+                    embeddings.embed_documents(texts)
+                    return
+                except InvokeRateLimitError:
+                    if retry == max_retries:
+                        raise
+                    # back off before retrying when the provider limits the request rate
+                    time.sleep(2 ** retry)
+
     def _check_document_paused_status(self, document_id: str):
         indexing_cache_key = 'document_{}_is_paused'.format(document_id)
         result = redis_client.get(indexing_cache_key)
@@ -1,3 +1,5 @@
+import logging
+
 from core.file.message_file_parser import MessageFileParser
 from core.model_manager import ModelInstance
 from core.model_runtime.entities.message_entities import (
@@ -10,6 +12,7 @@ from core.model_runtime.entities.message_entities import (
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.model_providers import model_provider_factory
 from extensions.ext_database import db
+from extensions.ext_redis import redis_client
 from models.model import Conversation, Message
 
 
@@ -40,6 +43,7 @@ class TokenBufferMemory:
         )
 
         prompt_messages = []
+        prompt_message_ids = []
         for message in messages:
             files = message.message_files
             if files:
@@ -56,31 +60,70 @@ class TokenBufferMemory:
                 prompt_messages.append(UserPromptMessage(content=message.query))
 
             prompt_messages.append(AssistantPromptMessage(content=message.answer))
+            prompt_message_ids.extend([f'{message.id}:user', f'{message.id}:assistant'])
 
         if not prompt_messages:
             return []
 
         # prune the chat message if it exceeds the max token limit
+        message_tokens = self._get_prompt_message_tokens(prompt_messages, prompt_message_ids)
+        curr_message_tokens = sum(message_tokens)
+
+        while curr_message_tokens > max_token_limit and prompt_messages:
+            prompt_messages.pop(0)
+            curr_message_tokens -= message_tokens.pop(0)
+
+        return prompt_messages
+
+    def _get_prompt_message_tokens(self, prompt_messages: list[PromptMessage],
+                                   prompt_message_ids: list[str]) -> list[int]:
+        """
+        Get number of tokens of each prompt message, counted once and cached per conversation.
+        :param prompt_messages: prompt messages
+        :param prompt_message_ids: cache field of each prompt message
+        :return: number of tokens of each prompt message
+        """
         provider_instance = model_provider_factory.get_provider_instance(self.model_instance.provider)
         model_type_instance = provider_instance.get_model_instance(ModelType.LLM)
 
-        curr_message_tokens = model_type_instance.get_num_tokens(
-            self.model_instance.model,
-            self.model_instance.credentials,
-            prompt_messages
+        cache_key = 'conversation_message_tokens:{}:{}:{}'.format(
+            self.conversation.id,
+            self.model_instance.provider,
+            self.model_instance.model
         )
 
-        if curr_message_tokens > max_token_limit:
-            pruned_memory = []
-            while curr_message_tokens > max_token_limit and prompt_messages:
-                pruned_memory.append(prompt_messages.pop(0))
-                curr_message_tokens = model_type_instance.get_num_tokens(
-                    self.model_instance.model,
-                    self.model_instance.credentials,
-                    prompt_messages
-                )
+        try:
+            cached_tokens = redis_client.hmget(cache_key, prompt_message_ids)
+        except Exception:
+            logging.exception('Failed to get message tokens from redis')
+            cached_tokens = [None] * len(prompt_message_ids)
+
+        message_tokens = []
+        new_message_tokens = {}
+        for prompt_message, prompt_message_id, cached_token in zip(prompt_messages, prompt_message_ids,
+                                                                   cached_tokens):
+            if cached_token is not None:
+                message_tokens.append(int(cached_token))
+                continue
 
-        return prompt_messages
+            tokens = model_type_instance.get_num_tokens(
+                self.model_instance.model,
+                self.model_instance.credentials,
+                [prompt_message]
+            )
+            message_tokens.append(tokens)
+            new_message_tokens[prompt_message_id] = tokens
+
+        if new_message_tokens:
+            try:
+                pipeline = redis_client.pipeline()
+                pipeline.hset(cache_key, mapping=new_message_tokens)
+                pipeline.expire(cache_key, 86400)
+                pipeline.execute()
+            except Exception:
+                logging.exception('Failed to set message tokens to redis')
+
+        return message_tokens
 
     def get_history_prompt_text(self, human_prefix: str = "Human",
                                 ai_prefix: str = "Assistant",
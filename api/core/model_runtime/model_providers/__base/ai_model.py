@@ -26,6 +26,7 @@ class AIModel(ABC):
     """
     model_type: ModelType
     model_schemas: list[AIModelEntity] = None
+    model_schema_map: dict[str, AIModelEntity] = None
     started_at: float = 0
 
     @abstractmethod
@@ -121,7 +122,7 @@ class AIModel(ABC):
 
         :return:
         """
-        if self.model_schemas:
+        if self.model_schemas is not None:
             return self.model_schemas
 
         model_schemas = []
@@ -209,7 +210,8 @@ class AIModel(ABC):
         if position_map:
             model_schemas.sort(key=lambda x: position_map.get(x.model, 999))
 
-        # cache model schemas
+        # cache model schemas, indexed by model name
+        self.model_schema_map = {model_schema.model: model_schema for model_schema in model_schemas}
         self.model_schemas = model_schemas
 
         return model_schemas
@@ -223,11 +225,11 @@ class AIModel(ABC):
         :return: model schema
         """
         # get predefined models (predefined_models)
-        models = self.predefined_models()
+        self.predefined_models()
 
-        model_map = {model.model: model for model in models}
-        if model in model_map:
-            return model_map[model]
+        model_schema = self.model_schema_map.get(model)
+        if model_schema:
+            return model_schema
 
         if credentials:
             model_schema = self.get_customizable_model_schema_from_credentials(model, credentials)
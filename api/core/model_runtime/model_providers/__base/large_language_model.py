@@ -18,6 +18,7 @@ from core.model_runtime.entities.model_entities import (
     PriceType,
 )
 from core.model_runtime.model_providers.__base.ai_model import AIModel
+from core.model_runtime.utils.helper import split_text_into_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -230,14 +231,14 @@ class LargeLanguageModel(AIModel):
         :param result: llm result
         :return: stream
         """
-        index = 0
-
         tool_calls = result.message.tool_calls
 
-        for word in result.message.content:
+        # the result is complete, it is replayed in word sized chunks without delay
+        chunks = split_text_into_chunks(result.message.content)
+        for index, chunk in enumerate(chunks):
             assistant_prompt_message = AssistantPromptMessage(
-                content=word,
-                tool_calls=tool_calls if index == (len(result.message.content) - 1) else []
+                content=chunk,
+                tool_calls=tool_calls if index == (len(chunks) - 1) else []
             )
 
             yield LLMResultChunk(
@@ -250,9 +251,6 @@ class LargeLanguageModel(AIModel):
                 )
             )
 
-            index += 1
-            time.sleep(0.01)
-
     def get_parameter_rules(self, model: str, credentials: dict) -> list[ParameterRule]:
         """
         Get parameter rules
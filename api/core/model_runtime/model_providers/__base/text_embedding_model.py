@@ -1,9 +1,14 @@
+import os
+import random
 import time
 from abc import abstractmethod
-from typing import Optional
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
 
 from core.model_runtime.entities.model_entities import ModelPropertyKey, ModelType
 from core.model_runtime.entities.text_embedding_entities import TextEmbeddingResult
+from core.model_runtime.errors.invoke import InvokeRateLimitError
 from core.model_runtime.model_providers.__base.ai_model import AIModel
 
 
@@ -13,6 +18,12 @@ class TextEmbeddingModel(AIModel):
     """
     model_type: ModelType = ModelType.TEXT_EMBEDDING
 
+    # maximum embedding requests of one invoke in flight, and retries of a rate limited request
+    max_concurrent_requests: int = int(os.environ.get('EMBEDDING_MAX_CONCURRENT_REQUESTS', '4'))
+    rate_limit_max_retries: int = int(os.environ.get('EMBEDDING_RATE_LIMIT_MAX_RETRIES', '5'))
+    rate_limit_backoff_base: float = 1
+    rate_limit_backoff_max: float = 30
+
     def invoke(self, model: str, credentials: dict,
                texts: list[str], user: Optional[str] = None) \
             -> TextEmbeddingResult:
@@ -88,3 +99,45 @@ class TextEmbeddingModel(AIModel):
             return model_schema.model_properties[ModelPropertyKey.MAX_CHUNKS]
 
         return 1
+
+    def _invoke_batches(self, invoke_batch: Callable[[Any], Any], batches: list[Any]) -> list[Any]:
+        """
+        Invoke the embedding requests of batches concurrently, at most max_concurrent_requests are in flight.
+        Rate limited requests are retried with exponential backoff.
+
+        :param invoke_batch: function which sends the request of one batch
+        :param batches: batches
+        :return: results in the order of batches
+        """
+        if len(batches) <= 1 or self.max_concurrent_requests <= 1:
+            return [self._invoke_batch_with_backoff(invoke_batch, batch) for batch in batches]
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(batches)))
+        try:
+            futures = [executor.submit(self._invoke_batch_with_backoff, invoke_batch, batch) for batch in batches]
+            return [future.result() for future in futures]
+        finally:
+            # batches which did not start are dropped if one batch failed
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _invoke_batch_with_backoff(self, invoke_batch: Callable[[Any], Any], batch: Any) -> Any:
+        """
+        Invoke the embedding request of a batch, retry it if it is rate limited.
+
+        :param invoke_batch: function which sends the request of one batch
+        :param batch: batch
+        :return: result
+        """
+        attempt = 0
+        while True:
+            try:
+                return invoke_batch(batch)
+            except Exception as e:
+                if attempt >= self.rate_limit_max_retries \
+                        or not isinstance(self._transform_invoke_error(e), InvokeRateLimitError):
+                    raise
+
+            # full jitter, concurrent requests do not retry at the same time
+            backoff = min(self.rate_limit_backoff_base * 2 ** attempt, self.rate_limit_backoff_max)
+            time.sleep(random.uniform(0, backoff))
+            attempt += 1
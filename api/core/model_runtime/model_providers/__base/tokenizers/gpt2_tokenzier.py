@@ -1,26 +1,58 @@
+import json
+from collections import OrderedDict
+from hashlib import blake2b
 from os.path import abspath, dirname, join
 from threading import Lock
 from typing import Any
 
+import tiktoken
 from transformers import GPT2Tokenizer as TransformerGPT2Tokenizer
 
 _tokenizer = None
 _lock = Lock()
 
+_fast_tokenizer = None
+_fast_lock = Lock()
+
+# text hash -> number of tokens
+_num_tokens_cache = OrderedDict()
+_num_tokens_cache_lock = Lock()
+_NUM_TOKENS_CACHE_SIZE = 4096
+
+# regex of the original gpt2 pre-tokenizer
+_GPT2_PAT_STR = r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+"""
+_GPT2_SPECIAL_TOKENS = ['<|endoftext|>']
+
+
 class GPT2Tokenizer:
     @staticmethod
     def _get_num_tokens_by_gpt2(text: str) -> int:
         """
             use gpt2 tokenizer to get num tokens
         """
-        _tokenizer = GPT2Tokenizer.get_encoder()
-        tokens = _tokenizer.encode(text, verbose=False)
+        _tokenizer = GPT2Tokenizer.get_fast_encoder()
+        tokens = _tokenizer.encode(text, allowed_special='all')
         return len(tokens)
-    
+
     @staticmethod
     def get_num_tokens(text: str) -> int:
-        return GPT2Tokenizer._get_num_tokens_by_gpt2(text)
-    
+        key = blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+        with _num_tokens_cache_lock:
+            num_tokens = _num_tokens_cache.get(key)
+            if num_tokens is not None:
+                _num_tokens_cache.move_to_end(key)
+                return num_tokens
+
+        # tokenize outside the lock, the fast encoder is safe to share between threads
+        num_tokens = GPT2Tokenizer._get_num_tokens_by_gpt2(text)
+
+        with _num_tokens_cache_lock:
+            _num_tokens_cache[key] = num_tokens
+            if len(_num_tokens_cache) > _NUM_TOKENS_CACHE_SIZE:
+                _num_tokens_cache.popitem(last=False)
+
+        return num_tokens
+
     @staticmethod
     def get_encoder() -> Any:
         global _tokenizer, _lock
@@ -30,4 +62,54 @@ class GPT2Tokenizer:
                 gpt2_tokenizer_path = join(dirname(base_path), 'gpt2')
                 _tokenizer = TransformerGPT2Tokenizer.from_pretrained(gpt2_tokenizer_path)
 
-            return _tokenizer
\ No newline at end of file
+            return _tokenizer
+
+    @staticmethod
+    def get_fast_encoder() -> tiktoken.Encoding:
+        """
+            tiktoken BPE encoder built from the bundled gpt2 vocab, it produces the same tokens as `get_encoder`
+        """
+        global _fast_tokenizer
+        if _fast_tokenizer is not None:
+            return _fast_tokenizer
+
+        with _fast_lock:
+            if _fast_tokenizer is None:
+                base_path = abspath(__file__)
+                vocab_path = join(dirname(base_path), 'gpt2', 'vocab.json')
+                with open(vocab_path, encoding='utf-8') as f:
+                    vocab = json.load(f)
+
+                byte_decoder = _gpt2_byte_decoder()
+                mergeable_ranks = {
+                    bytes(byte_decoder[c] for c in token): rank
+                    for token, rank in vocab.items() if token not in _GPT2_SPECIAL_TOKENS
+                }
+                special_tokens = {token: vocab[token] for token in _GPT2_SPECIAL_TOKENS}
+
+                _fast_tokenizer = tiktoken.Encoding(
+                    name='gpt2',
+                    pat_str=_GPT2_PAT_STR,
+                    mergeable_ranks=mergeable_ranks,
+                    special_tokens=special_tokens
+                )
+
+            return _fast_tokenizer
+
+
+def _gpt2_byte_decoder() -> dict[str, int]:
+    """
+        map the printable unicode characters used in the gpt2 vocab back to bytes
+    """
+    printable_bytes = list(range(ord('!'), ord('~') + 1)) \
+        + list(range(ord('¡'), ord('¬') + 1)) \
+        + list(range(ord('®'), ord('ÿ') + 1))
+
+    byte_decoder = {chr(b): b for b in printable_bytes}
+    n = 0
+    for b in range(2 ** 8):
+        if b not in printable_bytes:
+            byte_decoder[chr(2 ** 8 + n)] = b
+            n += 1
+
+    return byte_decoder
@@ -24,6 +24,7 @@ from core.model_runtime.errors.invoke import (
 )
 from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 
 class AnthropicLargeLanguageModel(LargeLanguageModel):
@@ -108,7 +109,7 @@ class AnthropicLargeLanguageModel(LargeLanguageModel):
         # transform credentials to kwargs for model instance
         credentials_kwargs = self._to_credential_kwargs(credentials)
 
-        client = Anthropic(**credentials_kwargs)
+        client = ModelClientCache.get_client(Anthropic, **credentials_kwargs)
 
         extra_model_kwargs = {}
         if stop:
@@ -27,6 +27,7 @@ from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
 from core.model_runtime.model_providers.azure_openai._common import _CommonAzureOpenAI
 from core.model_runtime.model_providers.azure_openai._constant import LLM_BASE_MODELS, AzureBaseModel
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 logger = logging.getLogger(__name__)
 
@@ -125,7 +126,7 @@ class AzureOpenAILargeLanguageModel(_CommonAzureOpenAI, LargeLanguageModel):
                   prompt_messages: list[PromptMessage], model_parameters: dict, stop: Optional[list[str]] = None,
                   stream: bool = True, user: Optional[str] = None) -> Union[LLMResult, Generator]:
 
-        client = AzureOpenAI(**self._to_credential_kwargs(credentials))
+        client = ModelClientCache.get_client(AzureOpenAI, **self._to_credential_kwargs(credentials))
 
         extra_model_kwargs = {}
 
@@ -243,7 +244,7 @@ class AzureOpenAILargeLanguageModel(_CommonAzureOpenAI, LargeLanguageModel):
                        tools: Optional[list[PromptMessageTool]] = None, stop: Optional[list[str]] = None,
                        stream: bool = True, user: Optional[str] = None) -> Union[LLMResult, Generator]:
 
-        client = AzureOpenAI(**self._to_credential_kwargs(credentials))
+        client = ModelClientCache.get_client(AzureOpenAI, **self._to_credential_kwargs(credentials))
 
         response_format = model_parameters.get("response_format")
         if response_format:
@@ -13,6 +13,7 @@ from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.model_runtime.model_providers.azure_openai._common import _CommonAzureOpenAI
 from core.model_runtime.model_providers.azure_openai._constant import EMBEDDING_BASE_MODELS, AzureBaseModel
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 
 class AzureOpenAITextEmbeddingModel(_CommonAzureOpenAI, TextEmbeddingModel):
@@ -22,7 +23,7 @@ class AzureOpenAITextEmbeddingModel(_CommonAzureOpenAI, TextEmbeddingModel):
             -> TextEmbeddingResult:
         base_model_name = credentials['base_model_name']
         credentials_kwargs = self._to_credential_kwargs(credentials)
-        client = AzureOpenAI(**credentials_kwargs)
+        client = ModelClientCache.get_client(AzureOpenAI, **credentials_kwargs)
 
         extra_model_kwargs = {}
         if user:
@@ -43,25 +44,25 @@ class AzureOpenAITextEmbeddingModel(_CommonAzureOpenAI, TextEmbeddingModel):
         except KeyError:
             enc = tiktoken.get_encoding("cl100k_base")
 
-        for i, text in enumerate(texts):
-            token = enc.encode(
-                text
-            )
+        # tokenize the texts in tiktoken's threads
+        for i, token in enumerate(enc.encode_batch(texts)):
             for j in range(0, len(token), context_size):
                 tokens += [token[j: j + context_size]]
                 indices += [i]
 
-        batched_embeddings = []
-        _iter = range(0, len(tokens), max_chunks)
-
-        for i in _iter:
-            embeddings_batch, embedding_used_tokens = self._embedding_invoke(
+        # call embedding model, batches are sent concurrently
+        batch_results = self._invoke_batches(
+            lambda batch: self._embedding_invoke(
                 model=model,
                 client=client,
-                texts=tokens[i: i + max_chunks],
+                texts=batch,
                 extra_model_kwargs=extra_model_kwargs
-            )
+            ),
+            [tokens[i: i + max_chunks] for i in range(0, len(tokens), max_chunks)]
+        )
 
+        batched_embeddings = []
+        for embeddings_batch, embedding_used_tokens in batch_results:
             used_tokens += embedding_used_tokens
             batched_embeddings += embeddings_batch
 
@@ -157,8 +158,8 @@ class AzureOpenAITextEmbeddingModel(_CommonAzureOpenAI, TextEmbeddingModel):
         )
 
         if 'encoding_format' in extra_model_kwargs and extra_model_kwargs['encoding_format'] == 'base64':
-            # decode base64 embedding
-            return ([list(np.frombuffer(base64.b64decode(data.embedding), dtype="float32")) for data in response.data],
+            # decode base64 embedding into numpy arrays, they are averaged and normalized as arrays
+            return ([np.frombuffer(base64.b64decode(data.embedding), dtype="float32") for data in response.data],
                     response.usage.total_tokens)
 
         return [data.embedding for data in response.data], response.usage.total_tokens
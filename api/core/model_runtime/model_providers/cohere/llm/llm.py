@@ -28,6 +28,7 @@ from core.model_runtime.errors.invoke import (
 )
 from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 logger = logging.getLogger(__name__)
 
@@ -154,7 +155,7 @@ class CohereLargeLanguageModel(LargeLanguageModel):
         :return: full response or stream response chunk generator result
         """
         # initialize client
-        client = cohere.Client(credentials.get('api_key'))
+        client = ModelClientCache.get_client(cohere.Client, api_key=credentials.get('api_key'))
 
         if stop:
             model_parameters['end_sequences'] = stop
@@ -280,7 +281,7 @@ class CohereLargeLanguageModel(LargeLanguageModel):
         :return: full response or stream response chunk generator result
         """
         # initialize client
-        client = cohere.Client(credentials.get('api_key'))
+        client = ModelClientCache.get_client(cohere.Client, api_key=credentials.get('api_key'))
 
         if user:
             model_parameters['user_name'] = user
@@ -487,7 +488,7 @@ class CohereLargeLanguageModel(LargeLanguageModel):
         :return: number of tokens
         """
         # initialize client
-        client = cohere.Client(credentials.get('api_key'))
+        client = ModelClientCache.get_client(cohere.Client, api_key=credentials.get('api_key'))
 
         response = client.tokenize(
             text=text,
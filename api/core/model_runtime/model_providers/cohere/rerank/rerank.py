@@ -13,6 +13,7 @@ from core.model_runtime.errors.invoke import (
 )
 from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.rerank_model import RerankModel
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 
 class CohereRerankModel(RerankModel):
@@ -43,7 +44,7 @@ class CohereRerankModel(RerankModel):
             )
 
         # initialize client
-        client = cohere.Client(credentials.get('api_key'))
+        client = ModelClientCache.get_client(cohere.Client, api_key=credentials.get('api_key'))
         results = client.rerank(
             query=query,
             documents=docs,
@@ -17,6 +17,7 @@ from core.model_runtime.errors.invoke import (
 )
 from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 
 class CohereTextEmbeddingModel(TextEmbeddingModel):
@@ -45,28 +46,33 @@ class CohereTextEmbeddingModel(TextEmbeddingModel):
         indices = []
         used_tokens = 0
 
-        for i, text in enumerate(texts):
-            tokenize_response = self._tokenize(
+        # tokenize requests are sent concurrently as well
+        tokenize_responses = self._invoke_batches(
+            lambda text: self._tokenize(
                 model=model,
                 credentials=credentials,
                 text=text
-            )
+            ),
+            texts
+        )
 
+        for i, tokenize_response in enumerate(tokenize_responses):
             for j in range(0, tokenize_response.length, context_size):
                 tokens += [tokenize_response.token_strings[j: j + context_size]]
                 indices += [i]
 
-        batched_embeddings = []
-        _iter = range(0, len(tokens), max_chunks)
-
-        for i in _iter:
-            # call embedding model
-            embeddings_batch, embedding_used_tokens = self._embedding_invoke(
+        # call embedding model, batches are sent concurrently
+        batch_results = self._invoke_batches(
+            lambda batch: self._embedding_invoke(
                 model=model,
                 credentials=credentials,
-                texts=["".join(token) for token in tokens[i: i + max_chunks]]
-            )
+                texts=["".join(token) for token in batch]
+            ),
+            [tokens[i: i + max_chunks] for i in range(0, len(tokens), max_chunks)]
+        )
 
+        batched_embeddings = []
+        for embeddings_batch, embedding_used_tokens in batch_results:
             used_tokens += embedding_used_tokens
             batched_embeddings += embeddings_batch
 
@@ -141,7 +147,7 @@ class CohereTextEmbeddingModel(TextEmbeddingModel):
             return Tokens([], [], {})
 
         # initialize client
-        client = cohere.Client(credentials.get('api_key'))
+        client = ModelClientCache.get_client(cohere.Client, api_key=credentials.get('api_key'))
 
         response = client.tokenize(
             text=text,
@@ -178,7 +184,7 @@ class CohereTextEmbeddingModel(TextEmbeddingModel):
         :return: embeddings and used tokens
         """
         # initialize client
-        client = cohere.Client(credentials.get('api_key'))
+        client = ModelClientCache.get_client(cohere.Client, api_key=credentials.get('api_key'))
 
         # call embedding model
         response = client.embed(
@@ -1,6 +1,7 @@
 import importlib
 import logging
 import os
+import threading
 from collections import OrderedDict
 from typing import Optional
 
@@ -28,7 +29,10 @@ class ModelProviderExtension(BaseModel):
 
 
 class ModelProviderFactory:
+    # provider catalog, built once per process and shared by all factory instances
     model_provider_extensions: dict[str, ModelProviderExtension] = None
+    provider_entities: list[ProviderEntity] = None
+    _lock = threading.Lock()
 
     def __init__(self) -> None:
         # for cache in memory
@@ -39,25 +43,35 @@ class ModelProviderFactory:
         Get all providers
         :return: list of providers
         """
+        if ModelProviderFactory.provider_entities is not None:
+            return ModelProviderFactory.provider_entities
+
         # scan all providers
         model_provider_extensions = self._get_model_provider_map()
 
-        # traverse all model_provider_extensions
-        providers = []
-        for name, model_provider_extension in model_provider_extensions.items():
-            # get model_provider instance
-            model_provider_instance = model_provider_extension.provider_instance
+        with ModelProviderFactory._lock:
+            if ModelProviderFactory.provider_entities is not None:
+                return ModelProviderFactory.provider_entities
 
-            # get provider schema
-            provider_schema = model_provider_instance.get_provider_schema()
+            # traverse all model_provider_extensions
+            providers = []
+            for name, model_provider_extension in model_provider_extensions.items():
+                # get model_provider instance
+                model_provider_instance = model_provider_extension.provider_instance
 
-            for model_type in provider_schema.supported_model_types:
-                # get predefined models for given model type
-                models = model_provider_instance.models(model_type)
-                if models:
-                    provider_schema.models.extend(models)
+                # get provider schema
+                provider_schema = model_provider_instance.get_provider_schema()
 
-            providers.append(provider_schema)
+                models = []
+                for model_type in provider_schema.supported_model_types:
+                    # get predefined models for given model type
+                    models.extend(model_provider_instance.models(model_type))
+
+                provider_schema.models = models
+
+                providers.append(provider_schema)
+
+            ModelProviderFactory.provider_entities = providers
 
         # return providers
         return providers
@@ -171,7 +185,7 @@ class ModelProviderFactory:
                 all_model_type_models.extend(models)
 
             simple_provider_schema = provider_schema.to_simple_provider()
-            simple_provider_schema.models.extend(all_model_type_models)
+            simple_provider_schema.models = all_model_type_models
 
             providers.append(simple_provider_schema)
 
@@ -197,8 +211,18 @@ class ModelProviderFactory:
         return model_provider_instance
 
     def _get_model_provider_map(self) -> dict[str, ModelProviderExtension]:
-        if self.model_provider_extensions:
-            return self.model_provider_extensions
+        if ModelProviderFactory.model_provider_extensions:
+            return ModelProviderFactory.model_provider_extensions
+
+        with ModelProviderFactory._lock:
+            if ModelProviderFactory.model_provider_extensions:
+                return ModelProviderFactory.model_provider_extensions
+
+            ModelProviderFactory.model_provider_extensions = self._scan_model_providers()
+
+        return ModelProviderFactory.model_provider_extensions
+
+    def _scan_model_providers(self) -> dict[str, ModelProviderExtension]:
 
         model_providers = {}
 
@@ -265,6 +289,4 @@ class ModelProviderFactory:
         sorted_items = sorted(model_providers.items(), key=lambda x: (x[1].position is None, x[1].position))
         sorted_extensions = OrderedDict(sorted_items)
 
-        self.model_provider_extensions = sorted_extensions
-
         return sorted_extensions
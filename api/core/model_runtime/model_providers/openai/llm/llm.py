@@ -25,6 +25,7 @@ from core.model_runtime.entities.model_entities import AIModelEntity, FetchFrom,
 from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.large_language_model import LargeLanguageModel
 from core.model_runtime.model_providers.openai._common import _CommonOpenAI
+from core.model_runtime.utils.client_cache import ModelClientCache
 
 logger = logging.getLogger(__name__)
 
@@ -173,7 +174,7 @@ class OpenAILargeLanguageModel(_CommonOpenAI, LargeLanguageModel):
 
         # transform credentials to kwargs for model instance
         credentials_kwargs = self._to_credential_kwargs(credentials)
-        client = OpenAI(**credentials_kwargs)
+        client = ModelClientCache.get_client(OpenAI, **credentials_kwargs)
 
         # get all remote models
         remote_models = client.models.list()
@@ -234,7 +235,7 @@ class OpenAILargeLanguageModel(_CommonOpenAI, LargeLanguageModel):
         credentials_kwargs = self._to_credential_kwargs(credentials)
 
         # init model client
-        client = OpenAI(**credentials_kwargs)
+        client = ModelClientCache.get_client(OpenAI, **credentials_kwargs)
 
         extra_model_kwargs = {}
 
@@ -386,7 +387,7 @@ class OpenAILargeLanguageModel(_CommonOpenAI, LargeLanguageModel):
         credentials_kwargs = self._to_credential_kwargs(credentials)
 
         # init model client
-        client = OpenAI(**credentials_kwargs)
+        client = ModelClientCache.get_client(OpenAI, **credentials_kwargs)
 
         response_format = model_parameters.get("response_format")
         if response_format:
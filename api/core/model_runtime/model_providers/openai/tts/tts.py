@@ -11,6 +11,7 @@ from core.model_runtime.errors.invoke import InvokeBadRequestError
 from core.model_runtime.errors.validate import CredentialsValidateFailedError
 from core.model_runtime.model_providers.__base.tts_model import TTSModel
 from core.model_runtime.model_providers.openai._common import _CommonOpenAI
+from core.model_runtime.utils.client_cache import ModelClientCache
 from extensions.ext_storage import storage
 
 
@@ -126,7 +127,7 @@ class OpenAIText2SpeechModel(_CommonOpenAI, TTSModel):
         tts_file_id = self._get_file_name(content_text)
         file_path = f'generate_files/audio/{tenant_id}/{tts_file_id}.{audio_type}'
         try:
-            client = OpenAI(**credentials_kwargs)
+            client = ModelClientCache.get_client(OpenAI, **credentials_kwargs)
             sentences = list(self._split_text_into_sentences(text=content_text, limit=word_limit))
             for sentence in sentences:
                 response = client.audio.speech.create(model=model, voice=voice, input=sentence.strip())
@@ -148,7 +149,7 @@ class OpenAIText2SpeechModel(_CommonOpenAI, TTSModel):
         """
         # transform credentials to kwargs for model instance
         credentials_kwargs = self._to_credential_kwargs(credentials)
-        client = OpenAI(**credentials_kwargs)
+        client = ModelClientCache.get_client(OpenAI, **credentials_kwargs)
         response = client.audio.speech.create(model=model, voice=voice, input=sentence.strip())
         if isinstance(response.read(), bytes):
             return response.read()
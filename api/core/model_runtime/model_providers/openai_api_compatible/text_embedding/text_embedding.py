@@ -83,13 +83,10 @@ class OAICompatEmbeddingModel(_CommonOAI_API_Compat, TextEmbeddingModel):
                 inputs.append(text)
             indices += [i]
 
-        batched_embeddings = []
-        _iter = range(0, len(inputs), max_chunks)
-
-        for i in _iter:
+        def invoke_batch(batch: list[str]) -> tuple[list[list[float]], int]:
             # Prepare the payload for the request
             payload = {
-                'input': inputs[i: i + max_chunks],
+                'input': batch,
                 'model': model,
                 **extra_model_kwargs
             }
@@ -102,13 +99,24 @@ class OAICompatEmbeddingModel(_CommonOAI_API_Compat, TextEmbeddingModel):
                 timeout=(10, 300)
             )
 
+            if response.status_code == 429:
+                # mapped to InvokeRateLimitError, the batch is retried with backoff
+                raise requests.exceptions.RetryError(f'Rate limited: {response.text}', response=response)
+
             response.raise_for_status()  # Raise an exception for HTTP errors
             response_data = response.json()
 
             # Extract embeddings and used tokens from the response
-            embeddings_batch = [data['embedding'] for data in response_data['data']]
-            embedding_used_tokens = response_data['usage']['total_tokens']
+            return [data['embedding'] for data in response_data['data']], response_data['usage']['total_tokens']
 
+        # batches are sent concurrently
+        batch_results = self._invoke_batches(
+            invoke_batch,
+            [inputs[i: i + max_chunks] for i in range(0, len(inputs), max_chunks)]
+        )
+
+        batched_embeddings = []
+        for embeddings_batch, embedding_used_tokens in batch_results:
             used_tokens += embedding_used_tokens
             batched_embeddings += embeddings_batch
 
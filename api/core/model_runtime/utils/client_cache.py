@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any
+
+
+class ModelClientCache:
+    """
+    Process-wide cache of provider SDK clients, keyed by client class and a hash of the client kwargs
+    (credentials, base url, timeouts).
+
+    Reusing a client reuses its HTTP connection pool, so requests with the same credentials
+    skip the connection and TLS setup. The least recently used clients are evicted.
+    The lock is patched by gevent, the cache is shared by threads and greenlets.
+    """
+    _max_size = 64
+    _clients: OrderedDict[str, Any] = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, client_class: type, **kwargs: Any) -> Any:
+        """
+        Get the cached client, the client is created with kwargs on first use.
+
+        :param client_class: SDK client class
+        :param kwargs: client kwargs
+        :return:
+        """
+        key = cls._get_key(client_class, kwargs)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is not None:
+                cls._clients.move_to_end(key)
+                return client
+
+        # create outside the lock, a client created concurrently with the same key is dropped
+        client = client_class(**kwargs)
+
+        with cls._lock:
+            cached_client = cls._clients.get(key)
+            if cached_client is not None:
+                cls._clients.move_to_end(key)
+                return cached_client
+
+            cls._clients[key] = client
+            while len(cls._clients) > cls._max_size:
+                cls._clients.popitem(last=False)
+
+        return client
+
+    @staticmethod
+    def _get_key(client_class: type, kwargs: dict) -> str:
+        key_data = repr((client_class.__module__, client_class.__qualname__, sorted(kwargs.items())))
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
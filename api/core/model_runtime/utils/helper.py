@@ -1,9 +1,36 @@
+import re
+
 import pydantic
 from pydantic import BaseModel
 
+_WORD_PATTERN = re.compile(r'\S+\s*|\s+')
+_SENTENCE_PATTERN = re.compile(r'.+?(?:[.!?。！？\n]+\s*|$)', re.S)
+
 
 def dump_model(model: BaseModel) -> dict:
     if hasattr(pydantic, 'model_dump'):
         return pydantic.model_dump(model)
     else:
         return model.dict()
+
+
+def split_text_into_chunks(text: str, mode: str = 'word', max_chunk_size: int = 128) -> list[str]:
+    """
+    Split a complete text into chunks for replaying it as a stream.
+
+    :param text: text
+    :param mode: word, sentence or character
+    :param max_chunk_size: maximum characters of a chunk, long words without spaces are split
+    :return: chunks, joined they are the text
+    """
+    if mode == 'character':
+        return list(text)
+
+    pattern = _SENTENCE_PATTERN if mode == 'sentence' else _WORD_PATTERN
+    chunks = []
+    for match in pattern.finditer(text):
+        piece = match.group()
+        for i in range(0, len(piece), max_chunk_size):
+            chunks.append(piece[i:i + max_chunk_size])
+
+    return chunks
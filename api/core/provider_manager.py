@@ -16,6 +16,7 @@ from core.entities.provider_entities import (
 )
 from core.helper import encrypter
 from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.entities.provider_entities import (
     CredentialFormSchema,
@@ -80,6 +81,13 @@ class ProviderManager:
         :param tenant_id:
         :return:
         """
+        provider_configurations_cache = ProviderConfigurationsCache(tenant_id=tenant_id)
+        cached_provider_configurations = provider_configurations_cache.get()
+        if cached_provider_configurations:
+            return cached_provider_configurations
+
+        cache_generation = provider_configurations_cache.get_generation()
+
         # Get all provider records of the workspace
         provider_name_to_provider_records_dict = self._get_all_providers(tenant_id)
 
@@ -178,6 +186,8 @@ class ProviderManager:
 
             provider_configurations[provider_name] = provider_configuration
 
+        provider_configurations_cache.set(provider_configurations, cache_generation)
+
         # Return the encapsulated object
         return provider_configurations
 
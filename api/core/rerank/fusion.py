@@ -0,0 +1,66 @@
+import heapq
+from typing import Optional
+
+from langchain.schema import Document
+
+
+class FusionRunner:
+    def __init__(self, k: int = 60) -> None:
+        """
+        Merge ranked result lists locally with reciprocal rank fusion, no rerank model is needed.
+
+        :param k: rank constant, larger values flatten the difference between top and lower ranks
+        """
+        self.k = k
+
+    def run(self, ranked_documents: list[list[Document]], top_n: Optional[int] = None) -> list[Document]:
+        """
+        Run reciprocal rank fusion
+        :param ranked_documents: result lists, each ordered from the most to the least relevant document
+        :param top_n: top n
+        :return: documents ordered by fused score, the score is normalized to [0, 1]
+        """
+        scores = {}
+        unique_documents = {}
+        for documents in ranked_documents:
+            rank = 0
+            list_doc_ids = set()
+            for document in documents:
+                doc_id = document.metadata['doc_id']
+                if doc_id in list_doc_ids:
+                    continue
+
+                list_doc_ids.add(doc_id)
+                rank += 1
+                scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (self.k + rank)
+                if doc_id not in unique_documents:
+                    unique_documents[doc_id] = document
+
+        if not scores:
+            return []
+
+        # a document ranked first in every non-empty list scores 1
+        max_score = sum(1 for documents in ranked_documents if documents) / (self.k + 1)
+
+        if top_n is not None:
+            doc_ids = heapq.nlargest(top_n, scores, key=scores.get)
+        else:
+            doc_ids = sorted(scores, key=scores.get, reverse=True)
+
+        fusion_documents = []
+        for doc_id in doc_ids:
+            document = unique_documents[doc_id]
+            # format document
+            fusion_document = Document(
+                page_content=document.page_content,
+                metadata={
+                    "doc_id": doc_id,
+                    "doc_hash": document.metadata['doc_hash'],
+                    "document_id": document.metadata['document_id'],
+                    "dataset_id": document.metadata['dataset_id'],
+                    'score': scores[doc_id] / max_score
+                }
+            )
+            fusion_documents.append(fusion_document)
+
+        return fusion_documents
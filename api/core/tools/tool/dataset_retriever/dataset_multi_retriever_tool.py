@@ -8,10 +8,10 @@ from pydantic import BaseModel, Field
 from core.callback_handler.index_tool_callback_handler import DatasetIndexToolCallbackHandler
 from core.embedding.cached_embedding import CacheEmbedding
 from core.errors.error import LLMBadRequestError, ProviderTokenNotInitError
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.keyword_table_index.keyword_table_index import KeywordTableConfig, KeywordTableIndex
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
-from core.rerank.rerank import RerankRunner
 from extensions.ext_database import db
 from models.dataset import Dataset, Document, DocumentSegment
 from services.retrieval_service import RetrievalService
@@ -41,8 +41,8 @@ class DatasetMultiRetrieverTool(BaseTool):
     dataset_ids: list[str]
     top_k: int = 2
     score_threshold: Optional[float] = None
-    reranking_provider_name: str
-    reranking_model_name: str
+    reranking_provider_name: Optional[str] = None
+    reranking_model_name: Optional[str] = None
     return_resource: bool
     retriever_from: str
     hit_callbacks: list[DatasetIndexToolCallbackHandler] = []
@@ -57,32 +57,61 @@ class DatasetMultiRetrieverTool(BaseTool):
         )
 
     def _run(self, query: str) -> str:
+        if any(hit_callback.cancelled for hit_callback in self.hit_callbacks):
+            return ''
+
+        retrieval_cache = DatasetRetrievalCache(self.dataset_ids, {
+            'tool': 'multiple',
+            'top_k': self.top_k,
+            'score_threshold': self.score_threshold,
+            'reranking_provider_name': self.reranking_provider_name,
+            'reranking_model_name': self.reranking_model_name,
+            'return_resource': self.return_resource,
+            'retriever_from': self.retriever_from
+        }, query)
+        cached_retrieval = retrieval_cache.get()
+        if cached_retrieval:
+            # replay the callbacks, query logs, hit counts and retriever resources are recorded as on a retrieval
+            for hit_callback in self.hit_callbacks:
+                for dataset_id in self.dataset_ids:
+                    hit_callback.on_query(query, dataset_id)
+                hit_callback.on_tool_end(cached_retrieval.documents)
+                if cached_retrieval.resources is not None:
+                    hit_callback.return_retriever_resource_info(cached_retrieval.resources)
+
+            return cached_retrieval.result
+
         threads = []
-        all_documents = []
+        ranked_documents = []
         for dataset_id in self.dataset_ids:
             retrieval_thread = threading.Thread(target=self._retriever, kwargs={
                 'flask_app': current_app._get_current_object(),
                 'dataset_id': dataset_id,
                 'query': query,
-                'all_documents': all_documents,
+                'ranked_documents': ranked_documents,
                 'hit_callbacks': self.hit_callbacks
             })
             threads.append(retrieval_thread)
             retrieval_thread.start()
         for thread in threads:
             thread.join()
-        # do rerank for searched documents
-        model_manager = ModelManager()
-        rerank_model_instance = model_manager.get_model_instance(
+
+        if any(hit_callback.cancelled for hit_callback in self.hit_callbacks):
+            return ''
+
+        # do rerank for searched documents, or fuse them when no rerank model is set
+        all_documents = RetrievalService.hybrid_merge(
             tenant_id=self.tenant_id,
-            provider=self.reranking_provider_name,
-            model_type=ModelType.RERANK,
-            model=self.reranking_model_name
+            query=query,
+            ranked_documents=ranked_documents,
+            reranking_model={
+                'reranking_provider_name': self.reranking_provider_name,
+                'reranking_model_name': self.reranking_model_name
+            },
+            score_threshold=self.score_threshold,
+            top_n=self.top_k
         )
 
-        rerank_runner = RerankRunner(rerank_model_instance)
-        all_documents = rerank_runner.run(query, all_documents, self.score_threshold, self.top_k)
-
         for hit_callback in self.hit_callbacks:
             hit_callback.on_tool_end(all_documents)
 
@@ -92,6 +121,7 @@ class DatasetMultiRetrieverTool(BaseTool):
                 document_score_list[item.metadata['doc_id']] = item.metadata['score']
 
         document_context_list = []
+        context_list = None
         index_node_ids = [document.metadata['doc_id'] for document in all_documents]
         segments = DocumentSegment.query.filter(
             DocumentSegment.dataset_id.in_(self.dataset_ids),
@@ -150,12 +180,14 @@ class DatasetMultiRetrieverTool(BaseTool):
                 for hit_callback in self.hit_callbacks:
                     hit_callback.return_retriever_resource_info(context_list)
 
-            return str("\n".join(document_context_list))
+            result = str("\n".join(document_context_list))
+            retrieval_cache.set(all_documents, result, context_list)
+            return result
 
     async def _arun(self, tool_input: str) -> str:
         raise NotImplementedError()
 
-    def _retriever(self, flask_app: Flask, dataset_id: str, query: str, all_documents: list,
+    def _retriever(self, flask_app: Flask, dataset_id: str, query: str, ranked_documents: list,
                    hit_callbacks: list[DatasetIndexToolCallbackHandler]):
         with flask_app.app_context():
             dataset = db.session.query(Dataset).filter(
@@ -183,7 +215,7 @@ class DatasetMultiRetrieverTool(BaseTool):
 
                 documents = kw_table_index.search(query, search_kwargs={'k': self.top_k})
                 if documents:
-                    all_documents.extend(documents)
+                    ranked_documents.append(documents)
             else:
 
                 try:
@@ -202,6 +234,7 @@ class DatasetMultiRetrieverTool(BaseTool):
                 embeddings = CacheEmbedding(embedding_model)
 
                 documents = []
+                full_text_documents = []
                 threads = []
                 if self.top_k > 0:
                     # retrieval_model source with semantic
@@ -238,7 +271,7 @@ class DatasetMultiRetrieverTool(BaseTool):
                                                                       'reranking_model': retrieval_model[
                                                                           'reranking_model'] if retrieval_model[
                                                                           'reranking_enable'] else None,
-                                                                      'all_documents': documents
+                                                                      'all_documents': full_text_documents
                                                                   })
                         threads.append(full_text_index_thread)
                         full_text_index_thread.start()
@@ -246,4 +279,6 @@ class DatasetMultiRetrieverTool(BaseTool):
                     for thread in threads:
                         thread.join()
 
-                    all_documents.extend(documents)
\ No newline at end of file
+                    # keep the result lists apart, each one is ranked on its own
+                    ranked_documents.append(documents)
+                    ranked_documents.append(full_text_documents)
\ No newline at end of file
@@ -7,11 +7,11 @@ from pydantic import BaseModel, Field
 
 from core.callback_handler.index_tool_callback_handler import DatasetIndexToolCallbackHandler
 from core.embedding.cached_embedding import CacheEmbedding
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.keyword_table_index.keyword_table_index import KeywordTableConfig, KeywordTableIndex
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.errors.invoke import InvokeAuthorizationError
-from core.rerank.rerank import RerankRunner
 from extensions.ext_database import db
 from models.dataset import Dataset, Document, DocumentSegment
 from services.retrieval_service import RetrievalService
@@ -70,6 +70,9 @@ class DatasetRetrieverTool(BaseTool):
         if not dataset:
             return ''
 
+        if any(hit_callback.cancelled for hit_callback in self.hit_callbacks):
+            return ''
+
         for hit_callback in self.hit_callbacks:
             hit_callback.on_query(query, dataset.id)
 
@@ -87,6 +90,23 @@ class DatasetRetrieverTool(BaseTool):
             documents = kw_table_index.search(query, search_kwargs={'k': self.top_k})
             return str("\n".join([document.page_content for document in documents]))
         else:
+            retrieval_cache = DatasetRetrievalCache([dataset.id], {
+                'tool': 'single',
+                'retrieval_model': retrieval_model,
+                'top_k': self.top_k,
+                'return_resource': self.return_resource,
+                'retriever_from': self.retriever_from
+            }, query)
+            cached_retrieval = retrieval_cache.get()
+            if cached_retrieval:
+                # replay the callbacks, hit counts and retriever resources are recorded as on a retrieval
+                for hit_callback in self.hit_callbacks:
+                    hit_callback.on_tool_end(cached_retrieval.documents)
+                    if cached_retrieval.resources is not None:
+                        hit_callback.return_retriever_resource_info(cached_retrieval.resources)
+
+                return cached_retrieval.result
+
             # get embedding model instance
             try:
                 model_manager = ModelManager()
@@ -102,6 +122,7 @@ class DatasetRetrieverTool(BaseTool):
             embeddings = CacheEmbedding(embedding_model)
 
             documents = []
+            full_text_documents = []
             threads = []
             if self.top_k > 0:
                 # retrieval source with semantic
@@ -135,7 +156,7 @@ class DatasetRetrieverTool(BaseTool):
                         'top_k': self.top_k,
                         'reranking_model': retrieval_model['reranking_model'] if retrieval_model[
                             'reranking_enable'] else None,
-                        'all_documents': documents
+                        'all_documents': full_text_documents
                     })
                     threads.append(full_text_index_thread)
                     full_text_index_thread.start()
@@ -143,28 +164,23 @@ class DatasetRetrieverTool(BaseTool):
                 for thread in threads:
                     thread.join()
 
-                # hybrid search: rerank after all documents have been searched
+                # hybrid search: merge after all documents have been searched
                 if retrieval_model['search_method'] == 'hybrid_search':
-                    # get rerank model instance
                     try:
-                        model_manager = ModelManager()
-                        rerank_model_instance = model_manager.get_model_instance(
+                        documents = RetrievalService.hybrid_merge(
                             tenant_id=dataset.tenant_id,
-                            provider=retrieval_model['reranking_model']['reranking_provider_name'],
-                            model_type=ModelType.RERANK,
-                            model=retrieval_model['reranking_model']['reranking_model_name']
+                            query=query,
+                            ranked_documents=[documents, full_text_documents],
+                            reranking_model=retrieval_model['reranking_model'] if retrieval_model[
+                                'reranking_enable'] else None,
+                            score_threshold=retrieval_model['score_threshold'] if retrieval_model[
+                                'score_threshold_enabled'] else None,
+                            top_n=self.top_k
                         )
                     except InvokeAuthorizationError:
                         return ''
-
-                    rerank_runner = RerankRunner(rerank_model_instance)
-                    documents = rerank_runner.run(
-                        query=query,
-                        documents=documents,
-                        score_threshold=retrieval_model['score_threshold'] if retrieval_model[
-                            'score_threshold_enabled'] else None,
-                        top_n=self.top_k
-                    )
+                else:
+                    documents.extend(full_text_documents)
             else:
                 documents = []
 
@@ -176,6 +192,7 @@ class DatasetRetrieverTool(BaseTool):
                     if 'score' in item.metadata and item.metadata['score']:
                         document_score_list[item.metadata['doc_id']] = item.metadata['score']
             document_context_list = []
+            context_list = None
             index_node_ids = [document.metadata['doc_id'] for document in documents]
             segments = DocumentSegment.query.filter(DocumentSegment.dataset_id == self.dataset_id,
                                                     DocumentSegment.completed_at.isnot(None),
@@ -231,7 +248,9 @@ class DatasetRetrieverTool(BaseTool):
                     for hit_callback in self.hit_callbacks:
                         hit_callback.return_retriever_resource_info(context_list)
 
-            return str("\n".join(document_context_list))
+            result = str("\n".join(document_context_list))
+            retrieval_cache.set(documents, result, context_list)
+            return result
 
     async def _arun(self, tool_input: str) -> str:
         raise NotImplementedError()
\ No newline at end of file
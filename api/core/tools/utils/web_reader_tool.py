@@ -9,7 +9,6 @@ import unicodedata
 from contextlib import contextmanager
 from typing import Any
 
-import requests
 from bs4 import BeautifulSoup, CData, Comment, NavigableString
 from langchain.chains import RefineDocumentsChain
 from langchain.chains.summarize import refine_prompts
@@ -24,6 +23,7 @@ from core.chain.llm_chain import LLMChain
 from core.data_loader import file_extractor
 from core.data_loader.file_extractor import FileExtractor
 from core.entities.application_entities import ModelConfigEntity
+from core.helper.http_client import get_requests_session
 
 FULL_TEMPLATE = """
 TITLE: {title}
@@ -151,7 +151,7 @@ def get_url(url: str, user_agent: str = None) -> str:
     
     supported_content_types = file_extractor.SUPPORT_URL_CONTENT_TYPES + ["text/html"]
 
-    head_response = requests.head(url, headers=headers, allow_redirects=True, timeout=(5, 10))
+    head_response = get_requests_session().head(url, headers=headers, allow_redirects=True, timeout=(5, 10))
 
     if head_response.status_code != 200:
         return "URL returned status code {}.".format(head_response.status_code)
@@ -164,7 +164,7 @@ def get_url(url: str, user_agent: str = None) -> str:
     if main_content_type in file_extractor.SUPPORT_URL_CONTENT_TYPES:
         return FileExtractor.load_from_url(url, return_text=True)
 
-    response = requests.get(url, headers=headers, allow_redirects=True, timeout=(5, 30))
+    response = get_requests_session().get(url, headers=headers, allow_redirects=True, timeout=(5, 30))
     a = extract_using_readabilipy(response.text)
 
     if not a['plain_text'] or not a['plain_text'].strip():
@@ -0,0 +1,35 @@
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+class VectorStoreClientPool:
+    """
+    Process-wide vector store clients, one per endpoint and credentials.
+
+    The clients keep their HTTP connections alive between requests, they are shared by all threads
+    (and greenlets, the lock is patched by gevent) of the process.
+    """
+    _clients: dict[tuple, Any] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, key: tuple, factory: Callable[[], Any]) -> Any:
+        """
+        Get the client of the key, the client is created by factory on first use.
+
+        :param key: vector store type, endpoint and credentials
+        :param factory: function creating the client
+        :return:
+        """
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = factory()
+                cls._clients[key] = client
+
+        return client
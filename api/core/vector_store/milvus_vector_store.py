@@ -20,6 +20,14 @@ class MilvusVectorStore(Milvus):
 
         return len(result) > 0
 
+    def get_vectors_by_ids(self, uuids: list[str]) -> dict[str, list[float]]:
+        result = self.col.query(
+            expr=f'metadata["doc_id"] in {uuids}',
+            output_fields=[self._metadata_field, self._vector_field]
+        )
+
+        return {item[self._metadata_field]["doc_id"]: list(item[self._vector_field]) for item in result}
+
     def get_ids_by_document_id(self, document_id: str):
         result = self.col.query(
             expr=f'metadata["document_id"] == "{document_id}"',
@@ -41,6 +41,26 @@ class QdrantVectorStore(Qdrant):
 
         return len(response) > 0
 
+    def get_vectors_by_ids(self, uuids: list[str]) -> dict[str, list[float]]:
+        self._reload_if_needed()
+
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=uuids,
+            with_payload=False,
+            with_vectors=True
+        )
+
+        vectors = {}
+        for record in records:
+            vector = record.vector
+            if isinstance(vector, dict):
+                vector = vector.get(self.vector_name)
+            if vector:
+                vectors[str(record.id)] = vector
+
+        return vectors
+
     def delete(self):
         self._reload_if_needed()
 
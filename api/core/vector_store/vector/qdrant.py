@@ -3,8 +3,14 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import heapq
+import math
+import re
+import threading
+import time
 import uuid
 import warnings
+from collections import Counter, OrderedDict
 from collections.abc import Callable, Generator, Iterable, Sequence
 from itertools import islice
 from operator import itemgetter
@@ -30,6 +36,42 @@ class QdrantException(Exception):
     """Base class for all the Qdrant related exceptions"""
 
 
+# token length limits of the full text payload index
+MIN_TOKEN_LEN = 2
+MAX_TOKEN_LEN = 20
+
+# (collection, filter, term) -> (cached_at, count), point counts for bm25 statistics,
+# they only need to be approximately current
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+COUNT_CACHE_SIZE = 4096
+COUNT_CACHE_TTL = 60
+
+
+def _tokenize_text(text: str) -> list[str]:
+    """Split text into lowercase words with the token length limits of the full text payload index."""
+    return [token for token in re.findall(r'\w+', text.lower()) if MIN_TOKEN_LEN <= len(token) <= MAX_TOKEN_LEN]
+
+
+def _tokenize_query(text: str) -> list[str]:
+    """
+    Split query into unique lowercase terms. Words longer than the index limit, e.g. unspaced CJK text,
+    are kept whole, they are matched by the index's own tokenizer.
+    """
+    return list(dict.fromkeys(token for token in re.findall(r'\w+', text.lower()) if MIN_TOKEN_LEN <= len(token)))
+
+
+def _term_frequency(term: str, content: str, token_counts: Counter) -> float:
+    """Frequency of a query term in lowercase content, the tokens of the content are counted in token_counts."""
+    term_frequency = token_counts.get(term) or content.count(term)
+    if term_frequency or len(term) <= MAX_TOKEN_LEN:
+        return term_frequency
+
+    # a long term is a phrase the index tokenizer splits, its character bigrams in the content count partially
+    bigrams = {term[i:i + 2] for i in range(len(term) - 1)}
+    return sum(1 for bigram in bigrams if bigram in content) / len(bigrams)
+
+
 def sync_call_fallback(method: Callable) -> Callable:
     """
     Decorator to call the synchronous method of the class if the async method is not
@@ -598,7 +640,7 @@ class Qdrant(VectorStore):
             limit=k,
             offset=offset,
             with_payload=True,
-            with_vectors=True,
+            with_vectors=False,
             score_threshold=score_threshold,
             consistency=consistency,
             **kwargs,
@@ -615,36 +657,161 @@ class Qdrant(VectorStore):
 
     def similarity_search_by_bm25(
         self,
+        query: str,
         filter: Optional[MetadataFilter] = None,
-        k: int = 4
+        k: int = 4,
+        **kwargs: Any,
     ) -> list[Document]:
         """Return docs most similar by bm25.
 
         Args:
-            embedding: Embedding vector to look up documents similar to.
+            query: Text to look up documents similar to.
+            filter: Filter by metadata. Defaults to None.
             k: Number of Documents to return. Defaults to 4.
+        Returns:
+            List of documents most similar to the query text, the bm25 score is set as `score` metadata.
+        """
+        results = self.similarity_search_with_score_by_bm25(query, filter, k, **kwargs)
+        for document, score in results:
+            document.metadata['score'] = score
+
+        return [document for document, _ in results]
+
+    def similarity_search_with_score_by_bm25(
+        self,
+        query: str,
+        filter: Optional[MetadataFilter] = None,
+        k: int = 4,
+        fetch_k: int = 100,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> list[tuple[Document, float]]:
+        """Return docs most similar by bm25 and the score of each.
+
+        Candidates are matched by the full text payload index, points containing every
+        query term first, then points containing any of them, and are ranked locally.
+        Document frequencies are approximate counts of the payload index cached for
+        COUNT_CACHE_TTL seconds, the average document length is taken over the candidates.
+        Query words longer than the index token limit are matched as phrases by the index
+        tokenizer. Vectors are never fetched.
+
+        Args:
+            query: Text to look up documents similar to.
             filter: Filter by metadata. Defaults to None.
-            search_params: Additional search params
+            k: Number of Documents to return. Defaults to 4.
+            fetch_k: Number of candidates to rank. Defaults to 100.
+            k1: Term frequency saturation. Defaults to 1.5.
+            b: Document length normalization. Defaults to 0.75.
         Returns:
-            List of documents most similar to the query text and distance for each.
+            List of documents most similar to the query text and score for each.
         """
-        response = self.client.scroll(
+        from qdrant_client.http import models as rest
+
+        terms = _tokenize_query(query)
+        if not terms:
+            return []
+
+        term_conditions = [
+            rest.FieldCondition(key=self.content_payload_key, match=rest.MatchText(text=term))
+            for term in terms
+        ]
+
+        def with_filter(condition: rest.Filter) -> rest.Filter:
+            if filter is None:
+                return condition
+            return rest.Filter(must=[filter, condition])
+
+        candidate_filters = [rest.Filter(must=term_conditions)]
+        if len(terms) > 1:
+            candidate_filters.append(rest.Filter(should=term_conditions))
+
+        candidates = {}
+        for candidate_filter in candidate_filters:
+            if len(candidates) >= fetch_k:
+                break
+
+            points, _ = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=with_filter(candidate_filter),
+                limit=fetch_k,
+                with_payload=True,
+                with_vectors=False
+            )
+            for point in points:
+                if len(candidates) >= fetch_k:
+                    break
+                candidates.setdefault(point.id, point)
+
+        if not candidates:
+            return []
+
+        # corpus statistics from the payload index, approximate and cached for a while
+        total_count = self._count_points(filter, None, filter)
+        document_frequencies = [
+            self._count_points(filter, term, with_filter(rest.Filter(must=[term_condition])))
+            for term, term_condition in zip(terms, term_conditions)
+        ]
+        # approximate counts are not consistent with each other
+        total_count = max([total_count, *document_frequencies])
+
+        candidate_tokens = {}
+        for point_id, point in candidates.items():
+            content = point.payload.get(self.content_payload_key) or ''
+            candidate_tokens[point_id] = (content.lower(), _tokenize_text(content))
+
+        avg_length = sum(len(tokens) for _, tokens in candidate_tokens.values()) / len(candidate_tokens) or 1
+
+        scores = {}
+        for point_id, (content, tokens) in candidate_tokens.items():
+            token_counts = Counter(tokens)
+            length = len(tokens)
+            score = 0.0
+            for term, document_frequency in zip(terms, document_frequencies):
+                # terms the word tokenizer does not split out, e.g. in CJK text, are counted as substrings
+                term_frequency = _term_frequency(term, content, token_counts)
+                if not term_frequency:
+                    continue
+
+                idf = math.log(1 + (total_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                score += idf * term_frequency * (k1 + 1) / (
+                    term_frequency + k1 * (1 - b + b * length / avg_length)
+                )
+            scores[point_id] = score
+
+        top_ids = heapq.nlargest(k, scores, key=scores.get)
+        return [
+            (
+                self._document_from_scored_point(
+                    candidates[point_id], self.content_payload_key, self.metadata_payload_key
+                ),
+                scores[point_id],
+            )
+            for point_id in top_ids
+        ]
+
+    def _count_points(self, filter: Optional[MetadataFilter], term: Optional[str],
+                      count_filter: Optional[MetadataFilter]) -> int:
+        """Count the points of the collection matching filter, and term if it is not None."""
+        key = (self.collection_name, repr(filter), term)
+        with _count_cache_lock:
+            cached = _count_cache.get(key)
+            if cached and time.monotonic() - cached[0] < COUNT_CACHE_TTL:
+                _count_cache.move_to_end(key)
+                return cached[1]
+
+        count = self.client.count(
             collection_name=self.collection_name,
-            scroll_filter=filter,
-            limit=k,
-            with_payload=True,
-            with_vectors=True
+            count_filter=count_filter,
+            exact=False
+        ).count
 
-        )
-        results = response[0]
-        documents = []
-        for result in results:
-            if result:
-                documents.append(self._document_from_scored_point(
-                        result, self.content_payload_key, self.metadata_payload_key
-                    ))
-
-        return documents
+        with _count_cache_lock:
+            _count_cache[key] = (time.monotonic(), count)
+            _count_cache.move_to_end(key)
+            while len(_count_cache) > COUNT_CACHE_SIZE:
+                _count_cache.popitem(last=False)
+
+        return count
 
     @sync_call_fallback
     async def asimilarity_search_with_score_by_vector(
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import datetime
+import threading
+import weakref
 from collections.abc import Callable, Iterable
 from typing import Any, Optional
 from uuid import uuid4
@@ -26,6 +28,21 @@ def _default_schema(index_name: str) -> dict:
     }
 
 
+_batch_locks = weakref.WeakKeyDictionary()
+_batch_locks_lock = threading.Lock()
+
+
+def _get_batch_lock(client: Any) -> threading.Lock:
+    """The batch of a client is shared state, imports through a shared client must not interleave."""
+    with _batch_locks_lock:
+        lock = _batch_locks.get(client)
+        if lock is None:
+            lock = threading.Lock()
+            _batch_locks[client] = lock
+
+        return lock
+
+
 def _create_weaviate_client(**kwargs: Any) -> Any:
     client = kwargs.get("client")
     if client is not None:
@@ -145,7 +162,7 @@ class Weaviate(VectorStore):
                 texts = list(texts)
             embeddings = self._embedding.embed_documents(texts)
 
-        with self._client.batch as batch:
+        with _get_batch_lock(self._client), self._client.batch as batch:
             for i, text in enumerate(texts):
                 data_properties = {self._text_key: text}
                 if metadatas is not None:
@@ -381,14 +398,14 @@ class Weaviate(VectorStore):
             result = (
                 query_obj.with_near_vector(vector)
                 .with_limit(k)
-                .with_additional(["vector", "distance"])
+                .with_additional(["distance"])
                 .do()
             )
         else:
             result = (
                 query_obj.with_near_text(content)
                 .with_limit(k)
-                .with_additional(["vector", "distance"])
+                .with_additional(["distance"])
                 .do()
             )
 
@@ -446,7 +463,7 @@ class Weaviate(VectorStore):
         if not client.schema.contains(schema):
             client.schema.create_class(schema)
 
-        with client.batch as batch:
+        with _get_batch_lock(client), client.batch as batch:
             for i, text in enumerate(texts):
                 data_properties = {
                     text_key: text,
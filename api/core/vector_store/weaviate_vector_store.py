@@ -34,5 +34,22 @@ class WeaviateVectorStore(Weaviate):
 
         return True
 
+    def get_vectors_by_ids(self, uuids: list[str]) -> dict[str, list[float]]:
+        operands = [{
+            "path": ["doc_id"],
+            "operator": "Equal",
+            "valueText": uuid,
+        } for uuid in uuids]
+
+        result = self._client.query.get(self._index_name, ["doc_id"]).with_additional(["vector"]).with_where(
+            operands[0] if len(operands) == 1 else {"operator": "Or", "operands": operands}
+        ).with_limit(len(uuids)).do()
+
+        if "errors" in result:
+            raise ValueError(f"Error during query: {result['errors']}")
+
+        entries = result["data"]["Get"][self._index_name]
+        return {entry["doc_id"]: entry["_additional"]["vector"] for entry in entries}
+
     def delete(self):
         self._client.schema.delete_class(self._index_name)
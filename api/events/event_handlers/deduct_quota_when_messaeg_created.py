@@ -1,5 +1,6 @@
 from core.entities.application_entities import ApplicationGenerateEntity
 from core.entities.provider_entities import QuotaUnit
+from core.helper.provider_configurations_cache import ProviderConfigurationsCache
 from events.message_event import message_was_created
 from extensions.ext_database import db
 from models.provider import Provider, ProviderType
@@ -42,11 +43,22 @@ def handle(sender, **kwargs):
             used_quota = 1
 
     if used_quota is not None:
-        db.session.query(Provider).filter(
+        provider_filters = [
             Provider.tenant_id == application_generate_entity.tenant_id,
             Provider.provider_name == model_config.provider,
             Provider.provider_type == ProviderType.SYSTEM.value,
-            Provider.quota_type == system_configuration.current_quota_type.value,
+            Provider.quota_type == system_configuration.current_quota_type.value
+        ]
+        updated_count = db.session.query(Provider).filter(
+            *provider_filters,
             Provider.quota_limit > Provider.quota_used
         ).update({'quota_used': Provider.quota_used + used_quota})
         db.session.commit()
+
+        # cached configurations only need to be refreshed when the quota is exhausted by this message,
+        # the used quota of a quota which is not exceeded does not change their behaviour
+        if updated_count and db.session.query(Provider.id).filter(
+            *provider_filters,
+            Provider.quota_limit <= Provider.quota_used
+        ).first():
+            ProviderConfigurationsCache(tenant_id=application_generate_entity.tenant_id).delete()
@@ -1,4 +1,7 @@
 import hashlib
+import threading
+import time
+from collections import OrderedDict
 
 from Crypto.Cipher import AES
 from Crypto.PublicKey import RSA
@@ -8,6 +11,13 @@ import libs.gmpy2_pkcs10aep_cipher as gmpy2_pkcs10aep_cipher
 from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
 
+# tenant_id -> (cached_at, key_version, rsa_key, cipher_rsa), imported private keys ready to decrypt,
+# an entry is only used while the key version in redis is unchanged, it is bumped when a key pair is reset
+_decoding_cache = OrderedDict()
+_decoding_cache_lock = threading.Lock()
+DECODING_CACHE_SIZE = 256
+DECODING_CACHE_TTL = 600
+
 
 def generate_key_pair(tenant_id):
     private_key = RSA.generate(2048)
@@ -20,6 +30,8 @@ def generate_key_pair(tenant_id):
 
     storage.save(filepath, pem_private)
 
+    clear_decrypt_decoding(tenant_id)
+
     return pem_public.decode()
 
 
@@ -46,9 +58,16 @@ def encrypt(text, public_key):
 
 
 def get_decrypt_decoding(tenant_id):
+    key_version = redis_client.get(_get_privkey_version_cache_key(tenant_id))
+    with _decoding_cache_lock:
+        cached = _decoding_cache.get(tenant_id)
+        if cached and time.monotonic() - cached[0] < DECODING_CACHE_TTL and cached[1] == key_version:
+            _decoding_cache.move_to_end(tenant_id)
+            return cached[2], cached[3]
+
     filepath = "privkeys/{tenant_id}".format(tenant_id=tenant_id) + "/private.pem"
 
-    cache_key = 'tenant_privkey:{hash}'.format(hash=hashlib.sha3_256(filepath.encode()).hexdigest())
+    cache_key = _get_privkey_cache_key(filepath)
     private_key = redis_client.get(cache_key)
     if not private_key:
         try:
@@ -61,17 +80,36 @@ def get_decrypt_decoding(tenant_id):
     rsa_key = RSA.import_key(private_key)
     cipher_rsa = gmpy2_pkcs10aep_cipher.new(rsa_key)
 
+    with _decoding_cache_lock:
+        _decoding_cache[tenant_id] = (time.monotonic(), key_version, rsa_key, cipher_rsa)
+        _decoding_cache.move_to_end(tenant_id)
+        while len(_decoding_cache) > DECODING_CACHE_SIZE:
+            _decoding_cache.popitem(last=False)
+
     return rsa_key, cipher_rsa
 
 
+def clear_decrypt_decoding(tenant_id):
+    filepath = "privkeys/{tenant_id}".format(tenant_id=tenant_id) + "/private.pem"
+    redis_client.delete(_get_privkey_cache_key(filepath))
+    # the keys cached by other processes are reloaded on their next use
+    redis_client.incr(_get_privkey_version_cache_key(tenant_id))
+
+    with _decoding_cache_lock:
+        _decoding_cache.pop(tenant_id, None)
+
+
+def _get_privkey_cache_key(filepath):
+    return 'tenant_privkey:{hash}'.format(hash=hashlib.sha3_256(filepath.encode()).hexdigest())
+
+
+def _get_privkey_version_cache_key(tenant_id):
+    return 'tenant_privkey_version:{tenant_id}'.format(tenant_id=tenant_id)
+
+
 def decrypt_token_with_decoding(encrypted_text, rsa_key, cipher_rsa):
     if encrypted_text.startswith(prefix_hybrid):
-        encrypted_text = encrypted_text[len(prefix_hybrid):]
-
-        enc_aes_key = encrypted_text[:rsa_key.size_in_bytes()]
-        nonce = encrypted_text[rsa_key.size_in_bytes():rsa_key.size_in_bytes() + 16]
-        tag = encrypted_text[rsa_key.size_in_bytes() + 16:rsa_key.size_in_bytes() + 32]
-        ciphertext = encrypted_text[rsa_key.size_in_bytes() + 32:]
+        enc_aes_key, nonce, tag, ciphertext = _split_hybrid_encrypted_text(encrypted_text, rsa_key)
 
         aes_key = cipher_rsa.decrypt(enc_aes_key)
 
@@ -83,6 +121,24 @@ def decrypt_token_with_decoding(encrypted_text, rsa_key, cipher_rsa):
     return decrypted_text.decode()
 
 
+def batch_decrypt_token_with_decoding(encrypted_texts, rsa_key, cipher_rsa):
+    """
+    Decrypt tokens of one tenant with a private key which is loaded once.
+    """
+    return [decrypt_token_with_decoding(encrypted_text, rsa_key, cipher_rsa) for encrypted_text in encrypted_texts]
+
+
+def _split_hybrid_encrypted_text(encrypted_text, rsa_key):
+    encrypted_text = encrypted_text[len(prefix_hybrid):]
+
+    enc_aes_key = encrypted_text[:rsa_key.size_in_bytes()]
+    nonce = encrypted_text[rsa_key.size_in_bytes():rsa_key.size_in_bytes() + 16]
+    tag = encrypted_text[rsa_key.size_in_bytes() + 16:rsa_key.size_in_bytes() + 32]
+    ciphertext = encrypted_text[rsa_key.size_in_bytes() + 32:]
+
+    return enc_aes_key, nonce, tag, ciphertext
+
+
 def decrypt(encrypted_text, tenant_id):
     rsa_key, cipher_rsa = get_decrypt_decoding(tenant_id)
 
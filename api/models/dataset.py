@@ -1,7 +1,7 @@
 import json
-import pickle
 from json import JSONDecodeError
 
+import numpy as np
 from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
@@ -427,6 +427,9 @@ class DatasetKeywordTable(db.Model):
     id = db.Column(UUID, primary_key=True, server_default=db.text('uuid_generate_v4()'))
     dataset_id = db.Column(UUID, nullable=False, unique=True)
     keyword_table = db.Column(db.Text, nullable=False)
+    storage_type = db.Column(db.String(255), nullable=False, server_default=db.text("'json'::character varying"))
+    node_count = db.Column(db.Integer, nullable=False, server_default=db.text('0'))
+    total_node_length = db.Column(db.BigInteger, nullable=False, server_default=db.text('0'))
 
     @property
     def keyword_table_dict(self):
@@ -444,11 +447,27 @@ class DatasetKeywordTable(db.Model):
         return json.loads(self.keyword_table, cls=SetDecoder) if self.keyword_table else None
 
 
+class DatasetKeyword(db.Model):
+    __tablename__ = 'dataset_keywords'
+    __table_args__ = (
+        db.PrimaryKeyConstraint('id', name='dataset_keyword_pkey'),
+        db.UniqueConstraint('dataset_id', 'keyword', 'index_node_id', name='dataset_keyword_unique_idx'),
+        db.Index('dataset_keyword_node_idx', 'dataset_id', 'index_node_id'),
+    )
+
+    id = db.Column(UUID, primary_key=True, server_default=db.text('uuid_generate_v4()'))
+    dataset_id = db.Column(UUID, nullable=False)
+    keyword = db.Column(db.String(255), nullable=False)
+    index_node_id = db.Column(db.String(255), nullable=False)
+    term_frequency = db.Column(db.Integer, nullable=False, server_default=db.text('1'))
+    node_length = db.Column(db.Integer, nullable=False, server_default=db.text('0'))
+
+
 class Embedding(db.Model):
     __tablename__ = 'embeddings'
     __table_args__ = (
         db.PrimaryKeyConstraint('id', name='embedding_pkey'),
-        db.UniqueConstraint('model_name', 'hash', name='embedding_hash_idx')
+        db.UniqueConstraint('model_name', 'hash', 'provider_name', name='embedding_hash_idx')
     )
 
     id = db.Column(UUID, primary_key=True, server_default=db.text('uuid_generate_v4()'))
@@ -457,12 +476,13 @@ class Embedding(db.Model):
     hash = db.Column(db.String(64), nullable=False)
     embedding = db.Column(db.LargeBinary, nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, server_default=db.text('CURRENT_TIMESTAMP(0)'))
+    provider_name = db.Column(db.String(40), nullable=False, server_default=db.text("''::character varying"))
 
     def set_embedding(self, embedding_data: list[float]):
-        self.embedding = pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL)
+        self.embedding = np.asarray(embedding_data, dtype=np.float32).tobytes()
 
     def get_embedding(self) -> list[float]:
-        return pickle.loads(self.embedding)
+        return np.frombuffer(self.embedding, dtype=np.float32).tolist()
 
 
 class DatasetCollectionBinding(db.Model):
@@ -1,7 +1,6 @@
 import os
 
-import requests
-
+from core.helper.http_client import get_requests_session
 from extensions.ext_database import db
 from models.account import TenantAccountJoin
 
@@ -61,7 +60,7 @@ class BillingService:
         }
 
         url = f"{cls.base_url}{endpoint}"
-        response = requests.request(method, url, json=json, params=params, headers=headers)
+        response = get_requests_session().request(method, url, json=json, params=params, headers=headers)
 
         return response.json()
 
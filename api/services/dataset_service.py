@@ -11,6 +11,7 @@ from flask_login import current_user
 from sqlalchemy import func
 
 from core.errors.error import LLMBadRequestError, ProviderTokenNotInitError
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.index import IndexBuilder
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
@@ -190,6 +191,8 @@ class DatasetService:
         dataset.query.filter_by(id=dataset_id).update(filtered_data)
 
         db.session.commit()
+        # retrieval settings and the dataset name in retriever resources may have changed
+        DatasetRetrievalCache.invalidate(dataset_id)
         if action:
             deal_dataset_vector_index_task.delay(dataset_id, action)
         return dataset
@@ -1056,6 +1059,8 @@ class SegmentService:
             segment_document.status = 'error'
             segment_document.error = str(e)
             db.session.commit()
+        # the segment is indexed here, not by an indexing task
+        DatasetRetrievalCache.invalidate(dataset.id)
         segment = db.session.query(DocumentSegment).filter(DocumentSegment.id == segment_document.id).first()
         return segment
 
@@ -1124,6 +1129,7 @@ class SegmentService:
                 segment_document.status = 'error'
                 segment_document.error = str(e)
         db.session.commit()
+        DatasetRetrievalCache.invalidate(dataset.id)
         return segment_data_list
 
     @classmethod
@@ -1191,6 +1197,8 @@ class SegmentService:
             segment.status = 'error'
             segment.error = str(e)
             db.session.commit()
+        # the content, answer, keywords or enabled state in cached results may have changed
+        DatasetRetrievalCache.invalidate(dataset.id)
         segment = db.session.query(DocumentSegment).filter(DocumentSegment.id == segment.id).first()
         return segment
 
@@ -1208,6 +1216,7 @@ class SegmentService:
             delete_segment_from_index_task.delay(segment.id, segment.index_node_id, dataset.id, document.id)
         db.session.delete(segment)
         db.session.commit()
+        DatasetRetrievalCache.invalidate(dataset.id)
 
 
 class DatasetCollectionBindingService:
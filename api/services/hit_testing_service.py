@@ -9,9 +9,9 @@ from langchain.schema import Document
 from sklearn.manifold import TSNE
 
 from core.embedding.cached_embedding import CacheEmbedding
+from core.index.vector_index.vector_index import VectorIndex
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
-from core.rerank.rerank import RerankRunner
 from extensions.ext_database import db
 from models.account import Account
 from models.dataset import Dataset, DatasetQuery, DocumentSegment
@@ -58,6 +58,7 @@ class HitTestingService:
         embeddings = CacheEmbedding(embedding_model)
 
         all_documents = []
+        full_text_documents = []
         threads = []
 
         # retrieval_model source with semantic
@@ -87,7 +88,7 @@ class HitTestingService:
                 'score_threshold': retrieval_model['score_threshold'] if retrieval_model['score_threshold_enabled'] else None,
                 'top_k': retrieval_model['top_k'],
                 'reranking_model': retrieval_model['reranking_model'] if retrieval_model['reranking_enable'] else None,
-                'all_documents': all_documents
+                'all_documents': full_text_documents
             })
             threads.append(full_text_index_thread)
             full_text_index_thread.start()
@@ -96,22 +97,17 @@ class HitTestingService:
             thread.join()
 
         if retrieval_model['search_method'] == 'hybrid_search':
-            model_manager = ModelManager()
-            rerank_model_instance = model_manager.get_model_instance(
+            all_documents = RetrievalService.hybrid_merge(
                 tenant_id=dataset.tenant_id,
-                provider=retrieval_model['reranking_model']['reranking_provider_name'],
-                model_type=ModelType.RERANK,
-                model=retrieval_model['reranking_model']['reranking_model_name']
-            )
-
-            rerank_runner = RerankRunner(rerank_model_instance)
-            all_documents = rerank_runner.run(
                 query=query,
-                documents=all_documents,
+                ranked_documents=[all_documents, full_text_documents],
+                reranking_model=retrieval_model['reranking_model'] if retrieval_model['reranking_enable'] else None,
                 score_threshold=retrieval_model['score_threshold'] if retrieval_model['score_threshold_enabled'] else None,
                 top_n=retrieval_model['top_k'],
                 user=f"account-{account.id}"
             )
+        else:
+            all_documents.extend(full_text_documents)
 
         end = time.perf_counter()
         logging.debug(f"Hit testing retrieve in {end - start:0.4f} seconds")
@@ -131,42 +127,37 @@ class HitTestingService:
 
     @classmethod
     def compact_retrieve_response(cls, dataset: Dataset, embeddings: Embeddings, query: str, documents: list[Document]):
+        index_node_ids = [document.metadata['doc_id'] for document in documents]
+        segments = db.session.query(DocumentSegment).filter(
+            DocumentSegment.dataset_id == dataset.id,
+            DocumentSegment.enabled == True,
+            DocumentSegment.status == 'completed',
+            DocumentSegment.index_node_id.in_(index_node_ids)
+        ).all() if index_node_ids else []
+        segment_map = {segment.index_node_id: segment for segment in segments}
+
+        documents = [document for document in documents if document.metadata['doc_id'] in segment_map]
+
         text_embeddings = [
             embeddings.embed_query(query)
         ]
 
-        text_embeddings.extend(embeddings.embed_documents([document.page_content for document in documents]))
+        text_embeddings.extend(cls.get_document_embeddings(dataset, embeddings, documents))
 
         tsne_position_data = cls.get_tsne_positions_from_embeddings(text_embeddings)
 
         query_position = tsne_position_data.pop(0)
 
-        i = 0
         records = []
-        for document in documents:
-            index_node_id = document.metadata['doc_id']
-
-            segment = db.session.query(DocumentSegment).filter(
-                DocumentSegment.dataset_id == dataset.id,
-                DocumentSegment.enabled == True,
-                DocumentSegment.status == 'completed',
-                DocumentSegment.index_node_id == index_node_id
-            ).first()
-
-            if not segment:
-                i += 1
-                continue
-
+        for i, document in enumerate(documents):
             record = {
-                "segment": segment,
+                "segment": segment_map[document.metadata['doc_id']],
                 "score": document.metadata.get('score', None),
                 "tsne_position": tsne_position_data[i]
             }
 
             records.append(record)
 
-            i += 1
-
         return {
             "query": {
                 "content": query,
@@ -175,6 +166,32 @@ class HitTestingService:
             "records": records
         }
 
+    @classmethod
+    def get_document_embeddings(cls, dataset: Dataset, embeddings: Embeddings, documents: list[Document]) -> list:
+        """
+        Get the embeddings of documents, the vectors stored in the index are used and
+        only documents without a stored vector are embedded again.
+        """
+        index_node_ids = [document.metadata['doc_id'] for document in documents]
+        try:
+            vector_index = VectorIndex(
+                dataset=dataset,
+                config=current_app.config,
+                embeddings=embeddings
+            )
+            stored_vectors = vector_index.get_vectors_by_ids(index_node_ids)
+        except Exception:
+            logging.exception("Failed to get stored vectors of hit testing results")
+            stored_vectors = {}
+
+        missing_documents = [document for document in documents if document.metadata['doc_id'] not in stored_vectors]
+        if missing_documents:
+            missing_vectors = embeddings.embed_documents([document.page_content for document in missing_documents])
+            for document, vector in zip(missing_documents, missing_vectors):
+                stored_vectors[document.metadata['doc_id']] = vector
+
+        return [stored_vectors[index_node_id] for index_node_id in index_node_ids]
+
     @classmethod
     def get_tsne_positions_from_embeddings(cls, embeddings: list):
         embedding_length = len(embeddings)
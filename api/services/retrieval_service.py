@@ -2,11 +2,13 @@ from typing import Optional
 
 from flask import Flask, current_app
 from langchain.embeddings.base import Embeddings
+from langchain.schema import Document
 
 from core.index.vector_index.vector_index import VectorIndex
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.errors.invoke import InvokeAuthorizationError
+from core.rerank.fusion import FusionRunner
 from core.rerank.rerank import RerankRunner
 from extensions.ext_database import db
 from models.dataset import Dataset
@@ -117,3 +119,42 @@ class RetrievalService:
                     ))
                 else:
                     all_documents.extend(documents)
+
+    @classmethod
+    def hybrid_merge(cls, tenant_id: str, query: str, ranked_documents: list[list[Document]],
+                     reranking_model: Optional[dict], score_threshold: Optional[float], top_n: int,
+                     user: Optional[str] = None) -> list[Document]:
+        """
+        Merge the result lists of hybrid search, with the rerank model when one is enabled,
+        otherwise with local reciprocal rank fusion.
+
+        :param tenant_id: tenant id
+        :param query: search query
+        :param ranked_documents: result lists, each ordered by relevance
+        :param reranking_model: rerank model config, None to fuse without rerank model
+        :param score_threshold: score threshold of the rerank model
+        :param top_n: top n
+        :param user: unique user id if needed
+        :return:
+        """
+        if reranking_model and reranking_model.get('reranking_model_name'):
+            model_manager = ModelManager()
+            rerank_model_instance = model_manager.get_model_instance(
+                tenant_id=tenant_id,
+                provider=reranking_model['reranking_provider_name'],
+                model_type=ModelType.RERANK,
+                model=reranking_model['reranking_model_name']
+            )
+
+            rerank_runner = RerankRunner(rerank_model_instance)
+            return rerank_runner.run(
+                query=query,
+                documents=[document for documents in ranked_documents for document in documents],
+                score_threshold=score_threshold,
+                top_n=top_n,
+                user=user
+            )
+
+        # the single searches already applied the score threshold
+        fusion_runner = FusionRunner()
+        return fusion_runner.run(ranked_documents, top_n=top_n)
@@ -8,6 +8,7 @@ import click
 from celery import shared_task
 from sqlalchemy import func
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.indexing_runner import IndexingRunner
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
@@ -103,3 +104,5 @@ def batch_create_segment_to_index_task(job_id: str, content: list, dataset_id: s
     except Exception as e:
         logging.exception("Segments batch created index failed:{}".format(str(e)))
         redis_client.setex(indexing_cache_key, 600, 'error')
+    finally:
+        DatasetRetrievalCache.invalidate(dataset_id)
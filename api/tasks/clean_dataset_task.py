@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.index import IndexBuilder
 from extensions.ext_database import db
 from models.dataset import (
@@ -76,3 +77,5 @@ def clean_dataset_task(dataset_id: str, tenant_id: str, indexing_technique: str,
             click.style('Cleaned dataset when dataset deleted: {} latency: {}'.format(dataset_id, end_at - start_at), fg='green'))
     except Exception:
         logging.exception("Cleaned dataset when dataset deleted failed")
+    finally:
+        DatasetRetrievalCache.invalidate(dataset_id)
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.index import IndexBuilder
 from extensions.ext_database import db
 from models.dataset import Dataset, DocumentSegment
@@ -52,3 +53,5 @@ def clean_document_task(document_id: str, dataset_id: str):
                 click.style('Cleaned document when document deleted: {} latency: {}'.format(document_id, end_at - start_at), fg='green'))
     except Exception:
         logging.exception("Cleaned document when document deleted failed")
+    finally:
+        DatasetRetrievalCache.invalidate(dataset_id)
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.index import IndexBuilder
 from extensions.ext_database import db
 from models.dataset import Dataset, Document, DocumentSegment
@@ -56,3 +57,5 @@ def clean_notion_document_task(document_ids: list[str], dataset_id: str):
                         fg='green'))
     except Exception:
         logging.exception("Cleaned document when import form notion document deleted  failed")
+    finally:
+        DatasetRetrievalCache.invalidate(dataset_id)
@@ -8,6 +8,7 @@ from celery import shared_task
 from langchain.schema import Document
 from werkzeug.exceptions import NotFound
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.index import IndexBuilder
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
@@ -100,3 +101,4 @@ def create_segment_to_index_task(segment_id: str, keywords: Optional[list[str]]
         db.session.commit()
     finally:
         redis_client.delete(indexing_cache_key)
+        DatasetRetrievalCache.invalidate(segment.dataset_id)
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.index.index import IndexBuilder
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
@@ -55,3 +56,4 @@ def delete_segment_from_index_task(segment_id: str, index_node_id: str, dataset_
         logging.exception("delete segment from index failed")
     finally:
         redis_client.delete(indexing_cache_key)
+        DatasetRetrievalCache.invalidate(dataset_id)
@@ -7,10 +7,10 @@ from celery import shared_task
 from werkzeug.exceptions import NotFound
 
 from core.data_loader.loader.notion import NotionLoader
-from core.index.index import IndexBuilder
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.indexing_runner import DocumentIsPausedException, IndexingRunner
 from extensions.ext_database import db
-from models.dataset import Dataset, Document, DocumentSegment
+from models.dataset import Document
 from models.source import DataSourceBinding
 
 
@@ -69,41 +69,15 @@ def document_indexing_sync_task(dataset_id: str, document_id: str):
             document.processing_started_at = datetime.datetime.utcnow()
             db.session.commit()
 
-            # delete all document segment and index
-            try:
-                dataset = db.session.query(Dataset).filter(Dataset.id == dataset_id).first()
-                if not dataset:
-                    raise Exception('Dataset not found')
-
-                vector_index = IndexBuilder.get_index(dataset, 'high_quality')
-                kw_index = IndexBuilder.get_index(dataset, 'economy')
-
-                segments = db.session.query(DocumentSegment).filter(DocumentSegment.document_id == document_id).all()
-                index_node_ids = [segment.index_node_id for segment in segments]
-
-                # delete from vector index
-                if vector_index:
-                    vector_index.delete_by_document_id(document_id)
-
-                # delete from keyword index
-                if index_node_ids:
-                    kw_index.delete_by_ids(index_node_ids)
-
-                for segment in segments:
-                    db.session.delete(segment)
-
-                end_at = time.perf_counter()
-                logging.info(
-                    click.style('Cleaned document when document update data source or process rule: {} latency: {}'.format(document_id, end_at - start_at), fg='green'))
-            except Exception:
-                logging.exception("Cleaned document when document update data source or process rule failed")
-
             try:
+                # re-index only the chunks that changed
                 indexing_runner = IndexingRunner()
-                indexing_runner.run([document])
+                indexing_runner.run_incremental([document])
                 end_at = time.perf_counter()
                 logging.info(click.style('update document: {} latency: {}'.format(document.id, end_at - start_at), fg='green'))
             except DocumentIsPausedException as ex:
                 logging.info(click.style(str(ex), fg='yellow'))
             except Exception:
                 pass
+            finally:
+                DatasetRetrievalCache.invalidate(dataset_id)
@@ -5,6 +5,7 @@ import time
 import click
 from celery import shared_task
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.indexing_runner import DocumentIsPausedException, IndexingRunner
 from extensions.ext_database import db
 from models.dataset import Document
@@ -45,3 +46,5 @@ def document_indexing_task(dataset_id: str, document_ids: list):
         logging.info(click.style(str(ex), fg='yellow'))
     except Exception:
         pass
+    finally:
+        DatasetRetrievalCache.invalidate(dataset_id)
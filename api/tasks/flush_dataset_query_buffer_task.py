@@ -0,0 +1,24 @@
+import logging
+import time
+
+import click
+from celery import shared_task
+
+from core.helper.dataset_query_buffer import DatasetQueryBuffer
+
+
+@shared_task(queue='dataset')
+def flush_dataset_query_buffer_task():
+    """
+    Async write buffered dataset query logs and segment hit counts
+
+    Usage: flush_dataset_query_buffer_task.apply_async(countdown=interval)
+    """
+    start_at = time.perf_counter()
+
+    try:
+        DatasetQueryBuffer.flush()
+        end_at = time.perf_counter()
+        logging.info(click.style('Flushed dataset query buffer latency: {}'.format(end_at - start_at), fg='green'))
+    except Exception:
+        logging.exception("flush dataset query buffer failed")
@@ -5,6 +5,7 @@ import click
 from celery import shared_task
 from werkzeug.exceptions import NotFound
 
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
 from core.indexing_runner import DocumentIsPausedException, IndexingRunner
 from extensions.ext_database import db
 from models.dataset import Document
@@ -44,3 +45,5 @@ def recover_document_indexing_task(dataset_id: str, document_id: str):
         logging.info(click.style(str(ex), fg='yellow'))
     except Exception:
         pass
+    finally:
+        DatasetRetrievalCache.invalidate(dataset_id)
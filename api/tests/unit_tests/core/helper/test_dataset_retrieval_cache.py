@@ -0,0 +1,59 @@
+import pytest
+from flask import Flask
+from langchain.schema import Document
+
+from core.helper import dataset_retrieval_cache
+from core.helper.dataset_retrieval_cache import DatasetRetrievalCache
+from tests.unit_tests.fake_redis import FakeRedis
+
+RETRIEVAL_CONFIG = {'tool': 'single', 'top_k': 2}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(dataset_retrieval_cache, 'redis_client', FakeRedis())
+    app = Flask(__name__)
+    app.config['DATASET_RETRIEVAL_CACHE_TTL'] = 600
+    with app.app_context():
+        yield app
+
+
+def _cache_retrieval(dataset_ids: list[str], query: str) -> None:
+    retrieval_cache = DatasetRetrievalCache(dataset_ids, RETRIEVAL_CONFIG, query)
+    assert retrieval_cache.get() is None
+    retrieval_cache.set([Document(page_content='content', metadata={'doc_id': '1'})], 'content', None)
+
+
+def test_cached_retrieval_is_returned(app):
+    _cache_retrieval(['dataset'], 'what is  dify')
+
+    cached_retrieval = DatasetRetrievalCache(['dataset'], RETRIEVAL_CONFIG, 'what is dify ').get()
+
+    assert cached_retrieval.result == 'content'
+    assert cached_retrieval.documents[0].metadata == {'doc_id': '1'}
+    assert cached_retrieval.resources is None
+
+
+def test_invalidate_drops_results_of_dataset(app):
+    _cache_retrieval(['dataset', 'other'], 'query')
+    _cache_retrieval(['other'], 'query')
+
+    DatasetRetrievalCache.invalidate('dataset')
+
+    assert DatasetRetrievalCache(['other', 'dataset'], RETRIEVAL_CONFIG, 'query').get() is None
+    assert DatasetRetrievalCache(['other'], RETRIEVAL_CONFIG, 'query').get() is not None
+
+
+def test_retrieval_config_is_part_of_key(app):
+    _cache_retrieval(['dataset'], 'query')
+
+    assert DatasetRetrievalCache(['dataset'], {**RETRIEVAL_CONFIG, 'top_k': 4}, 'query').get() is None
+
+
+def test_disabled_by_ttl(app):
+    app.config['DATASET_RETRIEVAL_CACHE_TTL'] = 0
+    retrieval_cache = DatasetRetrievalCache(['dataset'], RETRIEVAL_CONFIG, 'query')
+
+    assert retrieval_cache.get() is None
+    retrieval_cache.set([], 'content', None)
+    assert DatasetRetrievalCache(['dataset'], RETRIEVAL_CONFIG, 'query').get() is None
@@ -0,0 +1,73 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+
+from core.helper import provider_configurations_cache
+from core.helper.provider_configurations_cache import INVALIDATION_CHANNEL, ProviderConfigurationsCache
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.channels = []
+
+    def subscribe(self, channel):
+        self.channels.append(channel)
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.pubsub_instance = FakePubSub()
+
+    def pubsub(self):
+        return self.pubsub_instance
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(provider_configurations_cache, 'redis_client', fake_redis)
+    monkeypatch.setattr(ProviderConfigurationsCache, '_cache', OrderedDict())
+    monkeypatch.setattr(ProviderConfigurationsCache, '_generations', {})
+    monkeypatch.setattr(ProviderConfigurationsCache, '_lock', threading.Lock())
+    monkeypatch.setattr(ProviderConfigurationsCache, '_listener', None)
+    monkeypatch.setattr(ProviderConfigurationsCache, '_listener_ready', threading.Event())
+    monkeypatch.setattr(ProviderConfigurationsCache, '_subscribe_timeout', 0.1)
+    return fake_redis
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 2
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_cache_is_bypassed_until_subscription_is_confirmed(fake_redis):
+    assert ProviderConfigurationsCache._ensure_listener() is False
+    assert fake_redis.pubsub_instance.channels == [INVALIDATION_CHANNEL]
+
+    fake_redis.pubsub_instance.messages.put({'type': 'subscribe', 'data': 1})
+    _wait_for(ProviderConfigurationsCache._listener_ready.is_set)
+
+    assert ProviderConfigurationsCache._ensure_listener() is True
+
+
+def test_invalidation_message_evicts_tenant(fake_redis):
+    fake_redis.pubsub_instance.messages.put({'type': 'subscribe', 'data': 1})
+    assert ProviderConfigurationsCache._ensure_listener() is True
+
+    ProviderConfigurationsCache._cache['tenant'] = (time.monotonic(), object())
+    generation = ProviderConfigurationsCache('tenant').get_generation()
+
+    fake_redis.pubsub_instance.messages.put({'type': 'message', 'data': b'tenant'})
+    _wait_for(lambda: 'tenant' not in ProviderConfigurationsCache._cache)
+
+    assert ProviderConfigurationsCache('tenant').get_generation() == generation + 1
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from core.model_runtime.errors.invoke import InvokeError, InvokeRateLimitError
+from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
+
+
+class RateLimited(Exception):
+    pass
+
+
+class FakeTextEmbeddingModel(TextEmbeddingModel):
+    rate_limit_backoff_base = 0.001
+
+    def _invoke(self, model, credentials, texts, user=None):
+        raise NotImplementedError
+
+    def get_num_tokens(self, model, credentials, texts):
+        raise NotImplementedError
+
+    def validate_credentials(self, model, credentials):
+        raise NotImplementedError
+
+    @property
+    def _invoke_error_mapping(self):
+        return {InvokeRateLimitError: [RateLimited]}
+
+
+class FakeEmbeddingApi:
+    def __init__(self, rate_limited_batches: dict = None):
+        self.rate_limited_batches = dict(rate_limited_batches or {})
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def embed(self, batch: int) -> int:
+        with self._lock:
+            self.calls.append(batch)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            time.sleep(0.01)
+            with self._lock:
+                if self.rate_limited_batches.get(batch):
+                    self.rate_limited_batches[batch] -= 1
+                    raise RateLimited()
+
+            return batch * 10
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_results_keep_batch_order_and_concurrency_limit():
+    model = FakeTextEmbeddingModel()
+    model.max_concurrent_requests = 3
+    api = FakeEmbeddingApi()
+
+    assert model._invoke_batches(api.embed, list(range(10))) == [batch * 10 for batch in range(10)]
+    assert api.max_in_flight == 3
+
+
+def test_rate_limited_batches_are_retried():
+    model = FakeTextEmbeddingModel()
+    api = FakeEmbeddingApi(rate_limited_batches={2: 2})
+
+    assert model._invoke_batches(api.embed, [1, 2, 3]) == [10, 20, 30]
+    assert api.calls.count(2) == 3
+
+
+def test_retries_are_limited():
+    model = FakeTextEmbeddingModel()
+    model.rate_limit_max_retries = 1
+    api = FakeEmbeddingApi(rate_limited_batches={1: 5})
+
+    with pytest.raises(RateLimited):
+        model._invoke_batches(api.embed, [1, 2])
+    assert api.calls.count(1) == 2
+
+
+def test_other_errors_are_not_retried():
+    model = FakeTextEmbeddingModel()
+    calls = []
+
+    def embed(batch):
+        calls.append(batch)
+        raise ValueError('bad request')
+
+    with pytest.raises(ValueError):
+        model._invoke_batches(embed, [1])
+    assert calls == [1]
+    assert not isinstance(model._transform_invoke_error(ValueError()), InvokeRateLimitError)
+    assert isinstance(model._transform_invoke_error(ValueError()), InvokeError)
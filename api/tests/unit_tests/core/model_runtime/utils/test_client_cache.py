@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from core.model_runtime.utils.client_cache import ModelClientCache
+
+
+class FakeClient:
+    instances = 0
+
+    def __init__(self, api_key: str, base_url: str = None):
+        FakeClient.instances += 1
+        self.api_key = api_key
+        self.base_url = base_url
+
+
+class OtherFakeClient(FakeClient):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch):
+    monkeypatch.setattr(ModelClientCache, '_clients', ModelClientCache._clients.__class__())
+    FakeClient.instances = 0
+
+
+def test_same_kwargs_share_client():
+    client = ModelClientCache.get_client(FakeClient, api_key='key', base_url='https://a')
+
+    assert ModelClientCache.get_client(FakeClient, base_url='https://a', api_key='key') is client
+    assert FakeClient.instances == 1
+
+
+def test_different_kwargs_or_class_get_new_client():
+    client = ModelClientCache.get_client(FakeClient, api_key='key')
+
+    assert ModelClientCache.get_client(FakeClient, api_key='other key') is not client
+    assert ModelClientCache.get_client(OtherFakeClient, api_key='key') is not client
+    assert FakeClient.instances == 3
+
+
+def test_least_recently_used_client_is_evicted(monkeypatch):
+    monkeypatch.setattr(ModelClientCache, '_max_size', 2)
+    first = ModelClientCache.get_client(FakeClient, api_key='1')
+    second = ModelClientCache.get_client(FakeClient, api_key='2')
+
+    # the first client is used again, the second one is the least recently used
+    assert ModelClientCache.get_client(FakeClient, api_key='1') is first
+    ModelClientCache.get_client(FakeClient, api_key='3')
+
+    assert ModelClientCache.get_client(FakeClient, api_key='1') is first
+    assert ModelClientCache.get_client(FakeClient, api_key='2') is not second
+
+
+def test_concurrent_lookups_return_one_client():
+    clients = []
+    barrier = threading.Barrier(8)
+
+    def get_client():
+        barrier.wait()
+        clients.append(ModelClientCache.get_client(FakeClient, api_key='key'))
+
+    threads = [threading.Thread(target=get_client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in clients}) == 1
@@ -0,0 +1,31 @@
+import pytest
+
+from core.model_runtime.utils.helper import split_text_into_chunks
+
+TEXT = 'Hello world.  How are you?\nFine, thanks!'
+
+
+@pytest.mark.parametrize('mode', ['word', 'sentence', 'character'])
+def test_chunks_join_to_text(mode):
+    assert ''.join(split_text_into_chunks(TEXT, mode=mode)) == TEXT
+
+
+def test_word_chunks_keep_trailing_whitespace():
+    assert split_text_into_chunks('Hello world.  How', mode='word') == ['Hello ', 'world.  ', 'How']
+
+
+def test_sentence_chunks():
+    assert split_text_into_chunks(TEXT, mode='sentence') == ['Hello world.  ', 'How are you?\n', 'Fine, thanks!']
+
+
+def test_long_words_are_split():
+    text = '你' * 300
+
+    chunks = split_text_into_chunks(text, mode='word', max_chunk_size=128)
+
+    assert [len(chunk) for chunk in chunks] == [128, 128, 44]
+    assert ''.join(chunks) == text
+
+
+def test_empty_text():
+    assert split_text_into_chunks('') == []
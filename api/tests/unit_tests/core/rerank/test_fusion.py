@@ -0,0 +1,46 @@
+from langchain.schema import Document
+
+from core.rerank.fusion import FusionRunner
+
+
+def _document(doc_id: str) -> Document:
+    return Document(page_content=doc_id, metadata={
+        'doc_id': doc_id,
+        'doc_hash': f'{doc_id}-hash',
+        'document_id': 'document',
+        'dataset_id': 'dataset',
+    })
+
+
+def _ranked(*doc_ids: str) -> list[Document]:
+    return [_document(doc_id) for doc_id in doc_ids]
+
+
+def test_documents_in_both_lists_rank_first():
+    documents = FusionRunner().run([_ranked('a', 'b', 'c'), _ranked('c', 'd', 'a')])
+
+    assert [document.metadata['doc_id'] for document in documents] == ['a', 'c', 'b', 'd']
+
+
+def test_scores_are_normalized():
+    documents = FusionRunner().run([_ranked('a', 'b'), _ranked('a', 'c')])
+
+    assert documents[0].metadata['score'] == 1
+    assert all(0 < document.metadata['score'] < 1 for document in documents[1:])
+
+
+def test_duplicates_in_one_list_count_once():
+    documents = FusionRunner().run([_ranked('a', 'a', 'b')])
+
+    assert [document.metadata['doc_id'] for document in documents] == ['a', 'b']
+    assert documents[0].metadata['score'] == 1
+
+
+def test_top_n():
+    documents = FusionRunner().run([_ranked('a', 'b', 'c'), _ranked('b')], top_n=1)
+
+    assert [document.metadata['doc_id'] for document in documents] == ['b']
+
+
+def test_empty_lists():
+    assert FusionRunner().run([[], []]) == []
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.vector_store.vector import qdrant
+from core.vector_store.vector.qdrant import Qdrant
+
+
+class FakeQdrantClient:
+    """Returns every point for a scroll, the full text conditions are not evaluated."""
+
+    def __init__(self, contents: list[str]):
+        self.points = [
+            SimpleNamespace(id=str(i), payload={'page_content': content, 'metadata': {'doc_id': str(i)}})
+            for i, content in enumerate(contents)
+        ]
+        self.count_calls = 0
+
+    def scroll(self, collection_name, scroll_filter, limit, with_payload, with_vectors):
+        assert not with_vectors
+        return self.points[:limit], None
+
+    def count(self, collection_name, count_filter, exact):
+        self.count_calls += 1
+        return SimpleNamespace(count=len(self.points))
+
+
+def _get_vector_store(contents: list[str]) -> Qdrant:
+    vector_store = Qdrant.__new__(Qdrant)
+    vector_store.client = FakeQdrantClient(contents)
+    vector_store.collection_name = 'collection'
+    vector_store.content_payload_key = 'page_content'
+    vector_store.metadata_payload_key = 'metadata'
+    return vector_store
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache(monkeypatch):
+    monkeypatch.setattr(qdrant, '_count_cache', qdrant.OrderedDict())
+
+
+def test_ranks_by_term_frequency():
+    vector_store = _get_vector_store([
+        'apples are not oranges',
+        'apple pie with apple sauce and apple juice',
+        'bananas',
+    ])
+
+    results = vector_store.similarity_search_with_score_by_bm25('apple', k=3)
+
+    assert [document.metadata['doc_id'] for document, _ in results][0] == '1'
+    assert results[0][1] > results[-1][1]
+
+
+def test_long_unspaced_query_is_matched_as_phrase():
+    query = '人工智能技术在医疗健康领域的应用与发展前景分析'
+    assert len(query) > qdrant.MAX_TOKEN_LEN
+    vector_store = _get_vector_store([
+        '人工智能技术在医疗健康领域的应用与发展前景分析报告',
+        '医疗健康领域',
+        'unrelated',
+    ])
+
+    results = vector_store.similarity_search_with_score_by_bm25(query, k=3)
+
+    assert results
+    assert results[0][0].metadata['doc_id'] == '0'
+    scores = {document.metadata['doc_id']: score for document, score in results}
+    assert scores['0'] > scores['1'] > scores['2'] == 0
+
+
+def test_corpus_statistics_are_cached():
+    vector_store = _get_vector_store(['apple pie', 'orange juice'])
+
+    vector_store.similarity_search_with_score_by_bm25('apple juice')
+    count_calls = vector_store.client.count_calls
+    vector_store.similarity_search_with_score_by_bm25('apple juice')
+
+    assert count_calls == 3
+    assert vector_store.client.count_calls == count_calls
+
+
+def test_full_text_search_sets_scores():
+    vector_store = _get_vector_store([
+        'apple pie with apple sauce',
+        'apples and pears',
+        'bananas',
+    ])
+
+    documents = vector_store.similarity_search_by_bm25('apple', k=2)
+
+    assert [document.metadata['doc_id'] for document in documents] == ['0', '1']
+    assert documents[0].metadata['score'] > documents[1].metadata['score'] > 0
@@ -0,0 +1,44 @@
+class FakeRedis:
+    """
+    In-memory stand-in of the redis client for the commands used by caches, values are stored as bytes.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, name, value, ex=None, nx=False):
+        if nx and name in self.data:
+            return None
+
+        self.data[name] = self._encode(value)
+        return True
+
+    def setex(self, name, time, value):
+        self.data[name] = self._encode(value)
+        return True
+
+    def delete(self, *names):
+        return sum(1 for name in names if self.data.pop(name, None) is not None)
+
+    def incr(self, name, amount=1):
+        value = int(self.data.get(name, b'0')) + amount
+        self.data[name] = self._encode(value)
+        return value
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+
+        return str(value).encode('utf-8')
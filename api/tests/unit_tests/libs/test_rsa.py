@@ -0,0 +1,55 @@
+import pytest
+
+from libs import rsa
+from tests.unit_tests.fake_redis import FakeRedis
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files = {}
+
+    def save(self, filename, data):
+        self.files[filename] = data
+
+    def load(self, filename):
+        if filename not in self.files:
+            raise FileNotFoundError(filename)
+
+        return self.files[filename]
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    monkeypatch.setattr(rsa, 'redis_client', FakeRedis())
+    monkeypatch.setattr(rsa, 'storage', FakeStorage())
+    monkeypatch.setattr(rsa, '_decoding_cache', rsa.OrderedDict())
+
+
+def test_decrypt_uses_cached_key(fake_backends):
+    public_key = rsa.generate_key_pair('tenant')
+    token = rsa.encrypt('secret', public_key)
+
+    assert rsa.decrypt(token, 'tenant') == 'secret'
+    assert 'tenant' in rsa._decoding_cache
+    assert rsa.decrypt(token, 'tenant') == 'secret'
+
+
+def test_reset_key_pair_invalidates_keys_cached_by_other_processes(fake_backends):
+    rsa.generate_key_pair('tenant')
+    rsa.get_decrypt_decoding('tenant')
+    stale_entry = rsa._decoding_cache['tenant']
+
+    # another process resets the key pair, this process still holds the old key
+    public_key = rsa.generate_key_pair('tenant')
+    rsa._decoding_cache['tenant'] = stale_entry
+
+    token = rsa.encrypt('secret', public_key)
+    assert rsa.decrypt(token, 'tenant') == 'secret'
+
+
+def test_batch_decrypt(fake_backends):
+    public_key = rsa.generate_key_pair('tenant')
+    tokens = [rsa.encrypt(text, public_key) for text in ['a', 'b', 'a']]
+
+    rsa_key, cipher_rsa = rsa.get_decrypt_decoding('tenant')
+    assert rsa.batch_decrypt_token_with_decoding(tokens, rsa_key, cipher_rsa) == ['a', 'b', 'a']
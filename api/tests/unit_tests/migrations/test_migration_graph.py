@@ -0,0 +1,42 @@
+import os
+import re
+from collections import Counter
+
+VERSIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir,
+                                            'migrations', 'versions'))
+
+
+def _load_revisions() -> dict[str, tuple[str, ...]]:
+    revisions = {}
+    for file_name in sorted(os.listdir(VERSIONS_DIR)):
+        if not file_name.endswith('.py'):
+            continue
+
+        with open(os.path.join(VERSIONS_DIR, file_name)) as f:
+            content = f.read()
+
+        revision = re.search(r"^revision = '(\w+)'", content, re.M).group(1)
+        down_revision = re.search(r"^down_revision = (.+)$", content, re.M).group(1)
+        assert revision not in revisions, f'duplicated revision {revision} in {file_name}'
+        assert file_name.startswith(revision), f'{file_name} does not match revision {revision}'
+        revisions[revision] = tuple(re.findall(r"'(\w+)'", down_revision))
+
+    return revisions
+
+
+def test_revisions_have_single_head():
+    revisions = _load_revisions()
+    down_revisions = Counter(down_revision for down in revisions.values() for down_revision in down)
+
+    heads = [revision for revision in revisions if revision not in down_revisions]
+    assert len(heads) == 1
+
+    for down_revision in down_revisions:
+        assert down_revision in revisions
+
+
+def test_keyword_migrations_follow_embeddings_provider_name():
+    revisions = _load_revisions()
+
+    assert revisions['9b5da2413cbb'] == ('a8d7385a7b66',)
+    assert revisions['c3de432c017c'] == ('9b5da2413cbb',)